@@ -0,0 +1,11 @@
+"""ASGI config for VO2max Report (async views: series, comparisons, report)."""
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+application = get_asgi_application()
+
+# Compile report templates once per worker, before the first request
+from core.reports.generator import precompile_templates  # noqa: E402
+
+precompile_templates()
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',      # pg_trgm lookups (client search)
     # Local apps
     'core',
 ]
@@ -87,3 +88,13 @@ STATIC_URL = 'static/'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Versioned result cache (core/services/result_cache.py): in-process LRU
+# size and optional shared Django cache alias (e.g. a FileBasedCache)
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', '256'))
+RESULT_CACHE_ALIAS = os.environ.get('RESULT_CACHE_ALIAS') or None
+
+# Thread pools of async views (core/views/offload.py): ORM reads and
+# CPU-heavy steps (PDF layout, downsampling). Default CPU pool: cpu_count
+ASYNC_DB_WORKERS = int(os.environ.get('ASYNC_DB_WORKERS', '8'))
+ASYNC_CPU_WORKERS = int(os.environ.get('ASYNC_CPU_WORKERS', '0')) or None
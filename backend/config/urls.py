@@ -1,7 +1,11 @@
 """URL configuration for VO2max Report."""
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from core import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/', include('core.urls')),
+    path('dashboard/', views.dashboard, name='dashboard'),
 ]
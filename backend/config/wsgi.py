@@ -4,3 +4,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_wsgi_application()
+
+# Compile report templates once per worker, before the first request
+from core.reports.generator import precompile_templates  # noqa: E402
+
+precompile_templates()
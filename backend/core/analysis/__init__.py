@@ -0,0 +1,17 @@
+"""
+VO2max Report - Analysis Package
+
+Pure computational building blocks shared by services and reports
+(no Django or database access):
+- TDigest: Mergeable quantile sketch for population norms
+- fill_derived_channels: Vectorized VO2/kg, RER, Ve/VO2, Ve/VCO2, O2 pulse
+- downsample: Shape-preserving series reduction (LTTB, min/max buckets)
+"""
+from core.analysis.tdigest import TDigest
+from core.analysis.derived import fill_derived_channels, items_to_columns
+from core.analysis.downsample import downsample, downsample_indices
+
+__all__ = [
+    'TDigest', 'fill_derived_channels', 'items_to_columns',
+    'downsample', 'downsample_indices',
+]
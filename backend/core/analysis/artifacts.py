@@ -0,0 +1,139 @@
+"""
+Artifact Detection - Vectorized Outlier Checks on Channel Arrays
+
+Finds single-breath artifacts (coughs, mask leaks, HR dropouts) in a
+measurement's series with whole-array operations:
+- range: value outside physiological limits
+- spike: robust z-score against rolling median/MAD exceeds MAD_Z_LIMIT
+- jump:  rate of change into AND out of a sample exceeds the channel
+         limit with opposite signs (isolated spike, not a real step)
+
+Each check of each channel sets one bit in a per-row code, so reasons
+are combined without Python loops over rows.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+"""
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Physiological limits per channel (min, max)
+PHYSIOLOGICAL_RANGES: Dict[str, Tuple[float, float]] = {
+    'hr': (30, 230),
+    'vo2_ml_min': (100, 7500),
+    'vco2_ml_min': (100, 8500),
+    've': (3, 300),
+    'rf': (4, 80),
+    'tv': (0.2, 6.0),
+    'r': (0.6, 1.6),
+}
+
+# Max plausible rate of change per second
+RATE_LIMITS: Dict[str, float] = {
+    'hr': 8.0,              # bpm/s
+    'vo2_ml_min': 300.0,    # mL/min per s
+    'vco2_ml_min': 300.0,
+    've': 15.0,             # L/min per s
+    'rf': 10.0,             # breaths/min per s
+}
+
+# Rolling window (samples, odd) and robust z-score limit
+MAD_WINDOW = 7
+MAD_Z_LIMIT = 5.0
+
+CHECKS = ('range', 'spike', 'jump')
+
+
+@dataclass
+class ArtifactResult:
+    """Verdicts for one measurement's series"""
+    mask: np.ndarray                                   # True = artifact
+    reasons: List[str] = field(default_factory=list)   # per row ('' if clean)
+
+    @property
+    def count(self) -> int:
+        """Number of rows flagged as artifacts."""
+        return int(self.mask.sum())
+
+
+def detect_artifacts(time_sec: np.ndarray, channels: Dict[str, np.ndarray]) -> ArtifactResult:
+    """
+    Run all checks over channel arrays.
+
+    Args:
+        time_sec: Sample times (sorted)
+        channels: {channel: float array, NaN = missing}
+
+    Returns:
+        ArtifactResult with mask and reason strings like "hr:jump,ve:spike"
+    """
+    n = len(time_sec)
+    codes = np.zeros(n, dtype=np.int64)
+    labels: List[str] = []
+
+    for name, values in channels.items():
+        values = np.asarray(values, dtype=np.float64)
+        present = ~np.isnan(values)
+        checks = {
+            'range': _out_of_range(name, values),
+            'spike': _mad_outliers(values),
+            'jump': _rate_spikes(name, time_sec, values),
+        }
+        for check in CHECKS:
+            flagged = checks[check] & present
+            codes |= flagged.astype(np.int64) << len(labels)
+            labels.append(f"{name}:{check}")
+
+    mask = codes != 0
+    reasons = [''] * n
+    for code in np.unique(codes[mask]):
+        text = ','.join(label for bit, label in enumerate(labels) if code >> bit & 1)
+        for index in np.flatnonzero(codes == code):
+            reasons[index] = text
+    return ArtifactResult(mask=mask, reasons=reasons)
+
+
+def _out_of_range(name: str, values: np.ndarray) -> np.ndarray:
+    """Values outside physiological limits."""
+    if name not in PHYSIOLOGICAL_RANGES:
+        return np.zeros(len(values), dtype=bool)
+    low, high = PHYSIOLOGICAL_RANGES[name]
+    with np.errstate(invalid='ignore'):
+        return (values < low) | (values > high)
+
+
+def _mad_outliers(values: np.ndarray, window: int = MAD_WINDOW, limit: float = MAD_Z_LIMIT) -> np.ndarray:
+    """Robust z-score against centered rolling median/MAD."""
+    n = len(values)
+    if n < window or np.isnan(values).all():
+        return np.zeros(n, dtype=bool)
+    half = window // 2
+    padded = np.pad(values, half, mode='edge')
+    windows = sliding_window_view(padded, window)
+    with warnings.catch_warnings():
+        # All-NaN windows (channel gaps) are expected
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = np.nanmedian(windows, axis=1)
+        mad = np.nanmedian(np.abs(windows - median[:, None]), axis=1) * 1.4826
+        z = np.abs(values - median) / mad
+        return (mad > 0) & (z > limit)
+
+
+def _rate_spikes(name: str, time_sec: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Isolated spikes: steep change into and back out of a sample."""
+    n = len(values)
+    result = np.zeros(n, dtype=bool)
+    if name not in RATE_LIMITS or n < 3:
+        return result
+    dt = np.diff(time_sec)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.diff(values) / np.where(dt > 0, dt, np.nan)
+        limit = RATE_LIMITS[name]
+        rate_in, rate_out = rate[:-1], rate[1:]
+        spike = (np.abs(rate_in) > limit) & (np.abs(rate_out) > limit) & (rate_in * rate_out < 0)
+    result[1:-1] = spike
+    return result
@@ -0,0 +1,110 @@
+"""
+Derived Channels - Vectorized Gap Filling at Import
+
+Different sources fill different fields: JSON has VO2, VCO2 and RER but
+no VO2/kg or Ve/VO2, OMNIA CSV has VO2/kg and Ve/VO2 but no VCO2.
+This stage computes the missing channels from the available ones as
+whole-array NumPy operations, so reads never recompute them:
+
+    vo2_ml_min    = vo2_ml_kg_min * weight
+    vo2_ml_kg_min = vo2_ml_min / weight
+    vco2_ml_min   = r * vo2_ml_min
+    r             = vco2_ml_min / vo2_ml_min
+    ve_vo2        = ve * 1000 / vo2_ml_min
+    ve_vco2       = ve * 1000 / vco2_ml_min
+    o2_pulse      = vo2_ml_min / hr          (mL/beat)
+
+Measured values are never overwritten; only missing (NaN) cells are
+filled, row by row.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+Columns = Dict[str, np.ndarray]
+
+
+def items_to_columns(items: Sequence, fields: Iterable[str]) -> Columns:
+    """
+    Transpose row objects (e.g. ParsedItem) into float64 columns.
+
+    None becomes NaN. Missing attributes produce all-NaN columns.
+
+    Args:
+        items: Row objects
+        fields: Attribute names to extract
+
+    Returns:
+        {field: np.ndarray}
+    """
+    return {
+        name: np.array([getattr(item, name, None) for item in items], dtype=np.float64)
+        for name in fields
+    }
+
+
+def column_to_list(values: np.ndarray, as_int: bool = False) -> List:
+    """
+    Convert column back to Python values for the ORM (NaN -> None).
+
+    Args:
+        values: Float column
+        as_int: Round to Python int (HR, HRV)
+    """
+    missing = np.isnan(values)
+    result = np.empty(len(values), dtype=object)
+    present = values[~missing]
+    result[~missing] = (np.rint(present).astype(np.int64) if as_int else present).tolist()
+    return result.tolist()
+
+
+def fill_derived_channels(columns: Columns, weight: Optional[float] = None) -> Set[str]:
+    """
+    Fill missing derived channels in place.
+
+    Args:
+        columns: Parsed series columns (float64, NaN = missing);
+                 absent channels are created
+        weight: Body weight in kg (needed for VO2 <-> VO2/kg)
+
+    Returns:
+        Names of channels where at least one value was filled
+    """
+    length = len(next(iter(columns.values()))) if columns else 0
+    for name in ('vo2_ml_min', 'vo2_ml_kg_min', 'vco2_ml_min', 'r', 've',
+                 'hr', 've_vo2', 've_vco2', 'o2_pulse'):
+        if name not in columns:
+            columns[name] = np.full(length, np.nan)
+
+    filled: Set[str] = set()
+
+    def fill(name: str, computed: np.ndarray) -> None:
+        target = columns[name]
+        gaps = np.isnan(target) & np.isfinite(computed)
+        if gaps.any():
+            target[gaps] = computed[gaps]
+            filled.add(name)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if weight:
+            fill('vo2_ml_min', columns['vo2_ml_kg_min'] * weight)
+            fill('vo2_ml_kg_min', columns['vo2_ml_min'] / weight)
+
+        vo2 = _positive(columns['vo2_ml_min'])
+        fill('vco2_ml_min', columns['r'] * vo2)
+        fill('r', columns['vco2_ml_min'] / vo2)
+
+        vco2 = _positive(columns['vco2_ml_min'])
+        fill('ve_vo2', columns['ve'] * 1000.0 / vo2)
+        fill('ve_vco2', columns['ve'] * 1000.0 / vco2)
+        fill('o2_pulse', vo2 / _positive(columns['hr']))
+
+    return filled
+
+
+def _positive(values: np.ndarray) -> np.ndarray:
+    """Denominator guard: non-positive values become NaN."""
+    return np.where(values > 0, values, np.nan)
@@ -0,0 +1,113 @@
+"""
+Downsampling - Shape-Preserving Reduction of Long Series
+
+Breath-by-breath series have thousands of points, while a chart or a
+dashboard needs a few hundred. Two algorithms keep the visual shape:
+- lttb: Largest-Triangle-Three-Buckets (Steinarsson, 2013) - keeps the
+  points that form the largest triangles with their neighbours
+- minmax: per bucket, the minimum and maximum in time order - keeps
+  every peak and trough exactly (good for spikes and envelopes)
+
+Both return indices into the input, so any other channel sampled at the
+same times can be reduced consistently. NaN points are skipped.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+"""
+from typing import Tuple
+
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    target: int,
+    method: str = 'lttb'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to about target points.
+
+    Args:
+        x: Sorted x values (e.g. time_sec)
+        y: Values, NaN = missing
+        target: Desired number of points
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        (x, y) of the kept points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    index = downsample_indices(x, y, target, method)
+    return x[index], y[index]
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, target: int, method: str = 'lttb') -> np.ndarray:
+    """
+    Indices of points kept by downsample(), ascending.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    if len(valid) <= max(target, 2):
+        return valid
+    if method == 'minmax':
+        return valid[_minmax(y[valid], target)]
+    return valid[_lttb(x[valid], y[valid], target)]
+
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    """Bucket boundaries splitting n points into nearly equal parts."""
+    return np.linspace(0, n, buckets + 1).astype(np.int64)
+
+
+def _minmax(y: np.ndarray, target: int) -> np.ndarray:
+    """First min and first max index of each bucket (vectorized with reduceat)."""
+    n = len(y)
+    starts = np.unique(_bucket_edges(n, max(1, target // 2))[:-1])
+    bucket_of = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+
+    kept = [np.array([0, n - 1])]
+    for extreme in (np.minimum, np.maximum):
+        hits = np.flatnonzero(y == extreme.reduceat(y, starts)[bucket_of])
+        _, first = np.unique(bucket_of[hits], return_index=True)
+        kept.append(hits[first])
+    return np.unique(np.concatenate(kept))
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, target: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets; first and last points always kept,
+    so a target below 2 is raised to 2.
+    """
+    n = len(x)
+    target = max(int(target), 2)
+    if n <= target:
+        return np.arange(n)
+    edges = _bucket_edges(n - 2, target - 2) + 1
+    kept = np.empty(target, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    # Averages of every bucket (the "third point" of each triangle)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / sizes
+    avg_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / sizes
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    previous = 0
+    for bucket in range(target - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        area = np.abs(
+            (ax - avg_x[bucket]) * (y[start:end] - ay)
+            - (ax - x[start:end]) * (avg_y[bucket] - ay)
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
@@ -0,0 +1,181 @@
+"""
+Lactate Curves - Batched Polynomial Fitting
+
+Fits lactate-vs-power curves for many measurements at once and finds
+the classic markers:
+- Fixed concentrations: power at 2 mmol/L (≈ АэП) and 4 mmol/L (OBLA, ≈ АнП)
+- Dmax: point of the curve farthest from the line joining its ends
+  (Cheng et al., 1992); None unless the curve rises and is convex there
+
+All curves of a batch are padded into one (curves x points) matrix and
+solved with a single batched least-squares call; markers are found on
+a common dense grid, so cost does not grow with Python loops per curve.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Third-order polynomial is the standard lactate curve model
+DEFAULT_DEGREE = 3
+
+# Fixed concentrations reported by default (mmol/L)
+FIXED_CONCENTRATIONS = (2.0, 4.0)
+
+# Resolution of the marker search grid
+GRID_SIZE = 400
+
+# Minimum sag below the chord (mmol/L) for Dmax to be defined
+DMAX_MIN_DISTANCE = 0.05
+
+
+@dataclass
+class LactateCurveFit:
+    """Fitted lactate curve of one measurement"""
+    n_points: int
+    coefficients: List[float] = field(default_factory=list)  # highest power first, on scaled x
+    power_min: Optional[float] = None
+    power_max: Optional[float] = None
+    r2: Optional[float] = None
+    fixed_powers: Dict[float, Optional[float]] = field(default_factory=dict)  # mmol/L -> W
+    dmax_power: Optional[float] = None
+
+    @property
+    def is_valid(self) -> bool:
+        """True if enough points were available to fit."""
+        return bool(self.coefficients)
+
+
+def fit_lactate_curves(
+    curves: Sequence[Tuple[Sequence[float], Sequence[float]]],
+    degree: int = DEFAULT_DEGREE,
+    concentrations: Sequence[float] = FIXED_CONCENTRATIONS
+) -> List[LactateCurveFit]:
+    """
+    Fit many lactate curves in one vectorized batch.
+
+    Args:
+        curves: [(powers, lactates), ...] - one pair of sequences per measurement
+        degree: Polynomial degree
+        concentrations: Fixed concentrations to locate (mmol/L)
+
+    Returns:
+        LactateCurveFit per input curve (invalid if fewer than degree+1 points)
+    """
+    if not curves:
+        return []
+
+    batch = len(curves)
+    width = max(len(p) for p, _ in curves) or 1
+    powers = np.zeros((batch, width))
+    lactates = np.zeros((batch, width))
+    mask = np.zeros((batch, width), dtype=bool)
+    for i, (p, la) in enumerate(curves):
+        powers[i, :len(p)] = p
+        lactates[i, :len(la)] = la
+        mask[i, :len(p)] = True
+
+    n_points = mask.sum(axis=1)
+    valid = n_points > degree
+
+    # Scale power to 0..1 per curve for a well-conditioned Vandermonde
+    p_min = np.where(mask, powers, np.inf).min(axis=1)
+    p_max = np.where(mask, powers, -np.inf).max(axis=1)
+    span = np.where(p_max > p_min, p_max - p_min, 1.0)
+    valid &= p_max > p_min
+    x = np.where(mask, (powers - p_min[:, None]) / span[:, None], 0.0)
+
+    # Weighted normal equations, padding rows have zero weight
+    vander = x[..., None] ** np.arange(degree, -1, -1)          # (B, N, D+1)
+    weighted = vander * mask[..., None]
+    normal = np.einsum('bnk,bnl->bkl', weighted, weighted)
+    normal += np.eye(degree + 1) * 1e-9
+    rhs = np.einsum('bnk,bn->bk', weighted, lactates * mask)
+    coefficients = np.linalg.solve(normal, rhs[..., None])[..., 0]  # (B, D+1)
+
+    # Goodness of fit
+    predicted = np.einsum('bnk,bk->bn', vander, coefficients)
+    counts = np.maximum(n_points, 1)
+    mean = (lactates * mask).sum(axis=1) / counts
+    ss_res = (((lactates - predicted) * mask) ** 2).sum(axis=1)
+    ss_tot = (((lactates - mean[:, None]) * mask) ** 2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
+
+    # Evaluate all curves on a common scaled grid
+    grid = np.linspace(0.0, 1.0, GRID_SIZE)
+    curve = coefficients @ (grid[:, None] ** np.arange(degree, -1, -1)).T  # (B, G)
+
+    fixed = {c: _first_crossing(curve, grid, c) for c in concentrations}
+
+    # Dmax: max vertical distance below the chord between curve ends.
+    # Only defined for a rising curve that sags below its chord and is
+    # convex there; flat, falling or concave fits get None.
+    chord = curve[:, :1] + (curve[:, -1:] - curve[:, :1]) * grid
+    below = chord - curve
+    index = np.argmax(below, axis=1)
+    rows = np.arange(batch)
+    inner = np.clip(index, 1, GRID_SIZE - 2)
+    bend = curve[rows, inner - 1] - 2 * curve[rows, inner] + curve[rows, inner + 1]
+    convex = (
+        (curve[:, -1] > curve[:, 0])
+        & (below[rows, index] > DMAX_MIN_DISTANCE)
+        & (index > 0) & (index < GRID_SIZE - 1)
+        & (bend > 0)
+    )
+    dmax_scaled = np.where(convex, grid[index], np.nan)
+
+    results = []
+    for i in range(batch):
+        if not valid[i]:
+            results.append(LactateCurveFit(n_points=int(n_points[i])))
+            continue
+
+        def to_power(scaled: float) -> Optional[float]:
+            if np.isnan(scaled):
+                return None
+            return round(float(p_min[i] + scaled * span[i]), 1)
+
+        results.append(LactateCurveFit(
+            n_points=int(n_points[i]),
+            coefficients=[float(c) for c in coefficients[i]],
+            power_min=float(p_min[i]),
+            power_max=float(p_max[i]),
+            r2=None if np.isnan(r2[i]) else round(float(r2[i]), 4),
+            fixed_powers={c: to_power(fixed[c][i]) for c in concentrations},
+            dmax_power=to_power(dmax_scaled[i]),
+        ))
+    return results
+
+
+def evaluate_curve(fit: LactateCurveFit, powers: Sequence[float]) -> List[Optional[float]]:
+    """
+    Evaluate fitted curve at given powers (None outside fitted range).
+    """
+    if not fit.is_valid:
+        return [None] * len(powers)
+    p = np.asarray(powers, dtype=np.float64)
+    span = (fit.power_max - fit.power_min) or 1.0
+    values = np.polyval(fit.coefficients, (p - fit.power_min) / span)
+    inside = (p >= fit.power_min) & (p <= fit.power_max)
+    return [round(float(v), 2) if ok else None for v, ok in zip(values, inside)]
+
+
+def _first_crossing(curve: np.ndarray, grid: np.ndarray, level: float) -> np.ndarray:
+    """
+    Scaled x where each curve first rises through level (NaN if never,
+    or if the curve already starts above it).
+    """
+    above = curve >= level
+    index = np.argmax(above, axis=1)
+    found = above.any(axis=1) & (index > 0)
+    prev = np.maximum(index - 1, 0)
+    rows = np.arange(curve.shape[0])
+    y0, y1 = curve[rows, prev], curve[rows, index]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(y1 > y0, (level - y0) / (y1 - y0), 0.0)
+    x = grid[prev] + t * (grid[index] - grid[prev])
+    return np.where(found, x, np.nan)
@@ -0,0 +1,116 @@
+"""
+Name Search - Normalized Keys and Trigram Index
+
+Athlete names arrive in Cyrillic or Latin, surname-first or given-name-
+first, with ё/е and case variations. Every name is reduced to a search
+key: lower case, Latin transliteration (Russian GOST-like table), words
+separated by single spaces. Keys are compared with pg_trgm semantics:
+- trigrams of each word padded with two leading and one trailing space
+  (so word order does not matter)
+- similarity: shared / all trigrams of both keys
+- word_similarity: share of the query's trigrams found in the name
+  (partial input: "petr" finds "petrov ivan")
+
+TrigramIndex is the in-memory counterpart of a pg_trgm GIN index for
+databases without the extension.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (client search)
+    Service: core/services/client_search_service.py
+"""
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Tuple
+
+TRANSLIT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'iu',
+    'я': 'ia', 'і': 'i', 'ї': 'i', 'є': 'e', 'ґ': 'g',
+}
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def search_key(*parts: str) -> str:
+    """Search key of name parts ('Пётр', 'Иванов' -> 'petr ivanov')."""
+    text = ' '.join(p for p in parts if p).lower()
+    text = ''.join(TRANSLIT.get(ch, ch) for ch in text)
+    return ' '.join(_WORD.findall(text))
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """pg_trgm trigrams of a search key."""
+    grams = set()
+    for word in key.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: str, b: str) -> float:
+    """Trigram similarity of two keys (0..1, word order ignored)."""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    shared = len(ta & tb)
+    return shared / (len(ta) + len(tb) - shared)
+
+
+def word_similarity(query: str, key: str) -> float:
+    """Share of the query's trigrams present in the key (0..1)."""
+    tq = trigrams(query)
+    return len(tq & trigrams(key)) / len(tq) if tq else 0.0
+
+
+class TrigramIndex:
+    """
+    Inverted index trigram -> IDs, ranked like pg_trgm word_similarity.
+
+    Not thread-safe; callers serialize access.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+        self._grams: Dict[int, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, key_id: int, key: str) -> None:
+        """Index (or re-index) one key."""
+        self.remove(key_id)
+        grams = trigrams(key)
+        self._grams[key_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(key_id)
+
+    def remove(self, key_id: int) -> None:
+        grams = self._grams.pop(key_id, None)
+        for gram in grams or ():
+            self._postings[gram].remove(key_id)
+
+    def search(self, query: str, limit: int = 20, min_score: float = 0.3) -> List[Tuple[int, float]]:
+        """
+        Best matches of a query key.
+
+        Returns:
+            [(id, word_similarity)] best first; ties broken by full
+            similarity, then id
+        """
+        tq = trigrams(query)
+        if not tq:
+            return []
+        hits = Counter()
+        for gram in tq:
+            hits.update(self._postings.get(gram, ()))
+
+        needed = min_score * len(tq)
+        ranked = []
+        for key_id, shared in hits.items():
+            if shared >= needed:
+                full = shared / (len(tq) + len(self._grams[key_id]) - shared)
+                ranked.append((-shared, -full, key_id))
+        ranked.sort()
+        return [(key_id, -shared / len(tq)) for shared, _, key_id in ranked[:limit]]
@@ -0,0 +1,226 @@
+"""
+TDigest - Mergeable Quantile Sketch
+
+Compact approximation of a value distribution used for population norms
+(e.g. VO2max percentile inside a gender / age band / test type cohort).
+
+Key properties:
+- Constant size (~compression centroids) regardless of population size
+- Incremental: values can be added one at a time
+- Mergeable: digests of several cohorts combine into a digest of their union
+- Accurate at the tails, where athlete rankings are most interesting
+
+Implementation follows the "merging digest" variant with the k1 scale
+function (Dunning & Ertl, "Computing Extremely Accurate Quantiles Using
+t-Digests").
+
+DOCUMENTATION:
+    Spec: Research/16_normative_reference_values.md
+"""
+import math
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+class TDigest:
+    """
+    Streaming quantile sketch.
+
+    Usage:
+        digest = TDigest()
+        for value in values:
+            digest.add(value)
+        digest.quantile(0.5)     # median
+        digest.cdf(52.3)         # share of population <= 52.3
+    """
+
+    DEFAULT_COMPRESSION = 100.0
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        """
+        Initialize empty digest.
+
+        Args:
+            compression: Accuracy/size trade-off (max ~compression centroids)
+        """
+        self.compression = float(compression)
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[Tuple[float, float]] = []
+        self._buffer_limit = int(self.compression * 5)
+
+    def __len__(self) -> int:
+        """Return number of centroids after compression."""
+        self._flush()
+        return len(self._means)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add single value (optionally weighted) to the digest."""
+        if value is None or weight <= 0 or math.isnan(value):
+            return
+        value = float(value)
+        self._buffer.append((value, float(weight)))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add many unweighted values."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """
+        Merge another digest into this one (in place).
+
+        Returns:
+            self, to allow chaining
+        """
+        other._flush()
+        if not other.count:
+            return self
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    @classmethod
+    def merged(cls, digests: Iterable['TDigest']) -> 'TDigest':
+        """Return new digest holding the union of given digests."""
+        result = None
+        for digest in digests:
+            if result is None:
+                result = cls(digest.compression)
+            result.merge(digest)
+        return result or cls()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate value at quantile q (0..1).
+
+        Returns:
+            Estimated value or None for empty digest
+        """
+        points = self._cumulative_points()
+        if not points:
+            return None
+        target = min(max(q, 0.0), 1.0) * self.count
+        for (x0, c0), (x1, c1) in zip(points, points[1:]):
+            if target <= c1:
+                if c1 == c0:
+                    return x1
+                return x0 + (target - c0) / (c1 - c0) * (x1 - x0)
+        return self.max
+
+    def cdf(self, value: float) -> Optional[float]:
+        """
+        Estimate share of values <= value (0..1).
+
+        Returns:
+            Fraction of population or None for empty digest
+        """
+        points = self._cumulative_points()
+        if not points:
+            return None
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0 if self.max > self.min else 0.5
+        for (x0, c0), (x1, c1) in zip(points, points[1:]):
+            if value < x1:
+                if x1 == x0:
+                    return c1 / self.count
+                return (c0 + (value - x0) / (x1 - x0) * (c1 - c0)) / self.count
+        return 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible dict."""
+        self._flush()
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'centroids': [
+                [round(m, 6), w] for m, w in zip(self._means, self._weights)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'TDigest':
+        """Restore digest from to_dict() output."""
+        data = data or {}
+        digest = cls(data.get('compression', cls.DEFAULT_COMPRESSION))
+        centroids = data.get('centroids') or []
+        if centroids:
+            digest._means = [float(m) for m, _ in centroids]
+            digest._weights = [float(w) for _, w in centroids]
+            digest.count = float(data.get('count') or sum(digest._weights))
+            digest.min = float(data['min'])
+            digest.max = float(data['max'])
+        return digest
+
+    def _flush(self) -> None:
+        """Compress pending buffer if any."""
+        if self._buffer:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Merge buffered values and existing centroids into new centroids."""
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        if not points:
+            return
+
+        total = sum(w for _, w in points)
+        means, weights = [], []
+        cur_mean, cur_weight = points[0]
+        q0 = 0.0
+        q_limit = self._q_limit(q0)
+
+        for mean, weight in points[1:]:
+            q = q0 + (cur_weight + weight) / total
+            if q <= q_limit:
+                # Fold into current centroid (weighted mean update)
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                q0 += cur_weight / total
+                q_limit = self._q_limit(q0)
+                cur_mean, cur_weight = mean, weight
+
+        means.append(cur_mean)
+        weights.append(cur_weight)
+        self._means, self._weights = means, weights
+
+    def _q_limit(self, q: float) -> float:
+        """Upper quantile bound of a centroid starting at q (k1 scale)."""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+        k_next = (k + 1) * 2 * math.pi / self.compression
+        return (math.sin(min(k_next, math.pi / 2)) + 1) / 2
+
+    def _cumulative_points(self) -> List[Tuple[float, float]]:
+        """
+        Piecewise-linear CDF knots: (value, cumulative weight).
+
+        Each centroid is placed at the middle of its weight span,
+        anchored by the exact min and max.
+        """
+        self._flush()
+        if not self._means:
+            return []
+        points = [(self.min, 0.0)]
+        cumulative = 0.0
+        for mean, weight in zip(self._means, self._weights):
+            points.append((mean, cumulative + weight / 2))
+            cumulative += weight
+        points.append((self.max, cumulative))
+        return points
@@ -5,3 +5,7 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'VO2max Report Core'
+
+    def ready(self):
+        # Register change propagation receivers
+        from core import signals  # noqa: F401
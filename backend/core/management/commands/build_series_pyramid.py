@@ -0,0 +1,32 @@
+"""
+Build the pre-aggregated chart pyramid (SeriesLevel) of measurements.
+
+New imports and item edits keep it current (core/signals.py); run this
+once for measurements stored before the pyramid existed.
+
+Usage:
+    python manage.py build_series_pyramid              # all measurements
+    python manage.py build_series_pyramid 12 57        # selected
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.series_service import SeriesService
+
+
+class Command(BaseCommand):
+    help = 'Recreate min/max/mean chart levels (1 s ... 10 min) from measurement items'
+
+    def add_arguments(self, parser):
+        parser.add_argument('measurement_ids', nargs='*', type=int, help='Measurement IDs (default: all)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['measurement_ids']:
+            rows = SeriesService.build_pyramid(options['measurement_ids'])
+        else:
+            rows = SeriesService.rebuild_pyramid()
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {rows} series levels in {time.perf_counter() - started:.2f}s"
+        ))
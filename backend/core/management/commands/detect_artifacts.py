@@ -0,0 +1,52 @@
+"""
+Detect and exclude artifact rows (coughs, mask leaks, HR dropouts).
+
+Usage:
+    python manage.py detect_artifacts                      # whole archive
+    python manage.py detect_artifacts --jobs 8             # in parallel
+    python manage.py detect_artifacts -m 12 -m 15 --dry-run
+"""
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from core.models import Measurement
+from core.services.artifact_service import ArtifactService
+
+
+class Command(BaseCommand):
+    help = 'Run artifact detection and update MeasurementItem.use_in_report'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--measurement-id', '-m', type=int, action='append', dest='measurement_ids',
+            help='Measurement ID (repeatable, default: all)'
+        )
+        parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes')
+        parser.add_argument('--dry-run', action='store_true', help='Report only, no updates')
+
+    def handle(self, *args, **options):
+        ids = options['measurement_ids'] or list(
+            Measurement.objects.order_by('pk').values_list('pk', flat=True)
+        )
+        started = time.perf_counter()
+        summaries = ArtifactService.clean_archive(
+            ids, jobs=options['jobs'], apply=not options['dry_run']
+        )
+
+        reasons = Counter()
+        for s in summaries:
+            reasons.update(s['reasons'])
+            if s['excluded'] or s['restored'] or options['verbosity'] > 1:
+                self.stdout.write(
+                    f"  #{s['measurement_id']}: {s['rows']} rows, {s['flagged']} flagged, "
+                    f"{s['excluded']} excluded, {s['restored']} restored"
+                )
+
+        for reason, count in reasons.most_common():
+            self.stdout.write(f"  {reason}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {len(summaries)} measurements in {time.perf_counter() - started:.2f}s"
+            + (" (dry run)" if options['dry_run'] else "")
+        ))
@@ -0,0 +1,53 @@
+"""
+Export measurement series to one CSV or Parquet file, streamed.
+
+Usage:
+    python manage.py export_measurements cohort.csv --test-type CYCLING
+    python manage.py export_measurements client12.parquet --client 12 --all
+    python manage.py export_measurements tests.csv --ids 7 12 15
+    python manage.py export_measurements - --client 12 > client12.csv
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.export_service import FORMATS, ExportService
+
+
+class Command(BaseCommand):
+    help = 'Stream MeasurementItem rows of selected measurements to CSV or Parquet (one row group per test)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Output file ('-' = stdout, CSV only)")
+        parser.add_argument('--ids', nargs='+', type=int, default=None, help='Measurement IDs')
+        parser.add_argument('--client', type=int, default=None, help='Client ID')
+        parser.add_argument('--test-type', default=None, help='Test type, e.g. CYCLING')
+        parser.add_argument('--format', choices=FORMATS, default=None, help='Default: from the file extension')
+        parser.add_argument('--all', action='store_true', help='Include rows excluded from the report')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        fmt = options['format'] or ('parquet' if output.endswith('.parquet') else 'csv')
+        if output == '-' and fmt != 'csv':
+            raise CommandError('Parquet cannot be written to stdout')
+
+        started = time.perf_counter()
+        measurement_ids = ExportService.select(options['ids'], options['client'], options['test_type'])
+        if not measurement_ids:
+            raise CommandError('No measurements match the filters')
+
+        write = ExportService.write_parquet if fmt == 'parquet' else ExportService.write_csv
+        try:
+            if output == '-':
+                write(measurement_ids, sys.stdout.buffer, options['all'])
+                return
+            with open(output, 'wb') as f:
+                write(measurement_ids, f, options['all'])
+        except ImportError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(measurement_ids)} measurements to {output} "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
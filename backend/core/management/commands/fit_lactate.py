@@ -0,0 +1,38 @@
+"""
+Fit lactate curves for all measurements with lactate values.
+
+Only measurements whose lactate values changed since the stored fit are
+refitted, in vectorized batches.
+
+Usage:
+    python manage.py fit_lactate
+    python manage.py fit_lactate --force
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import MeasurementItem, Threshold
+from core.services.lactate_service import LactateService
+
+
+class Command(BaseCommand):
+    help = 'Fit (or refresh) cached lactate curves'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Refit even unchanged curves')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        ids = set(MeasurementItem.objects.filter(
+            lactat__isnull=False
+        ).values_list('measurement_id', flat=True).distinct())
+        ids |= set(Threshold.objects.filter(
+            lactate__isnull=False
+        ).values_list('measurement_id', flat=True).distinct())
+
+        count = LactateService.fit_all(sorted(ids), force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Lactate fits up to date for {count} measurements "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
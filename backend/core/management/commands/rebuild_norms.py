@@ -0,0 +1,26 @@
+"""
+Rebuild population percentile sketches from scratch.
+
+Usage:
+    python manage.py rebuild_norms
+
+Reads peaks from the trend store; run rebuild_trends first after bulk
+changes that bypassed signals.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.norms_service import NormsService
+
+
+class Command(BaseCommand):
+    help = 'Recreate cohort quantile sketches (norms) from all measurements'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        cells = NormsService.rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {cells} cohort cells in {elapsed:.2f}s"
+        ))
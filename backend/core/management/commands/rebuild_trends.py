@@ -0,0 +1,34 @@
+"""
+Rebuild the per-client longitudinal trend store from scratch.
+
+Usage:
+    python manage.py rebuild_trends
+    python manage.py rebuild_trends --norms   # then rebuild norms from it
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.norms_service import NormsService
+from core.services.trend_service import TrendService
+
+
+class Command(BaseCommand):
+    help = 'Recreate TrendPoint rows (peaks and threshold powers) for all measurements'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--norms', action='store_true',
+            help='Also rebuild cohort sketches (they are computed from trends)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = TrendService.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} trend rows in {time.perf_counter() - started:.2f}s"
+        ))
+
+        if options['norms']:
+            cells = NormsService.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {cells} cohort cells"))
@@ -0,0 +1,43 @@
+"""
+Regenerate stored reports whose source data changed.
+
+Usage:
+    python manage.py regenerate_reports                    # dirty reports once
+    python manage.py regenerate_reports --jobs 4 --limit 200
+    python manage.py regenerate_reports --watch --interval 30
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.generated_report_service import GeneratedReportService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild generated reports marked dirty by data changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes')
+        parser.add_argument('--limit', type=int, default=None, help='Max reports per run')
+        parser.add_argument('--watch', action='store_true', help='Keep polling for dirty reports')
+        parser.add_argument('--interval', type=float, default=30.0, help='Polling interval, seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            summaries = GeneratedReportService.regenerate_dirty(
+                workers=options['jobs'], limit=options['limit']
+            )
+
+            failed = [s for s in summaries if not s['ok']]
+            for s in failed:
+                self.stderr.write(f"  report #{s['report_id']}: {s['error']}")
+            if summaries or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Regenerated {len(summaries) - len(failed)}/{len(summaries)} reports "
+                    f"in {time.perf_counter() - started:.2f}s"
+                ))
+
+            if not options['watch']:
+                return
+            time.sleep(options['interval'])
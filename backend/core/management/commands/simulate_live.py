@@ -0,0 +1,76 @@
+"""
+Replay a dataMap JSON file against the live ingest API.
+
+Entries are sent as NDJSON batches at the pace of their time stamps
+(divided by --speed), so the dashboard sees a test "in progress".
+
+Usage:
+    python manage.py runserver                                  # other terminal
+    python manage.py simulate_live test.json                    # real time
+    python manage.py simulate_live test.json --speed 20 --interval 0.5
+"""
+import json
+import time
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Stream a recorded JSON test to /api/live/ at real-time or accelerated speed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='JSON file with setup and dataMap')
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+        parser.add_argument('--speed', type=float, default=1.0, help='Playback speed factor')
+        parser.add_argument('--interval', type=float, default=1.0, help='Wall seconds between batches')
+        parser.add_argument('--client-id', type=int, default=None, help='Existing client')
+
+    def handle(self, *args, **options):
+        with open(options['file'], encoding='utf-8') as f:
+            data = json.load(f)
+        entries = [e for e in data.get('dataMap', []) if self._valid(e)]
+        if not entries:
+            raise CommandError('No dataMap entries in file')
+        base = options['url'].rstrip('/')
+
+        started = self._post(f'{base}/api/live/', json.dumps({
+            'setup': data.get('setup', {}), 'client_id': options['client_id'],
+        }).encode(), 'application/json')
+        mid = started['measurement_id']
+        self.stdout.write(f"Live measurement #{mid}: {base}/api/live/{mid}/events/")
+
+        speed, interval = max(options['speed'], 1e-6), options['interval']
+        t0, clock = float(entries[0][0]), time.monotonic()
+        sent = 0
+        while sent < len(entries):
+            time.sleep(interval)
+            test_time = t0 + (time.monotonic() - clock) * speed
+            batch = []
+            while sent < len(entries) and float(entries[sent][0]) <= test_time:
+                batch.append(entries[sent])
+                sent += 1
+            if batch:
+                body = ''.join(json.dumps(e) + '\n' for e in batch).encode()
+                self._post(f'{base}/api/live/{mid}/samples/', body, 'application/x-ndjson')
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"  t={batch[-1][0]}s: {sent}/{len(entries)}")
+
+        finished = self._post(f'{base}/api/live/{mid}/finish/', b'', 'application/json')
+        self.stdout.write(self.style.SUCCESS(
+            f"Measurement #{mid}: {finished['items']} items in {time.monotonic() - clock:.1f}s"
+        ))
+
+    @staticmethod
+    def _valid(entry) -> bool:
+        """[time, {...}] with a numeric time."""
+        return (
+            isinstance(entry, list) and len(entry) == 2
+            and isinstance(entry[0], (int, float)) and isinstance(entry[1], dict)
+        )
+
+    @staticmethod
+    def _post(url: str, body: bytes, content_type: str) -> dict:
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
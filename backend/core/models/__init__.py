@@ -6,10 +6,23 @@ Models package exports for Django ORM:
 - Measurement: Test session
 - MeasurementItem: Time-series data point
 - Threshold: Manual/auto threshold values
+- CohortSketch: Population quantile sketches for norms
+- TrendPoint: Per-measurement summary for client history
+- LactateFit: Cached lactate curve fit
+- GeneratedReport: Stored report with dependencies for regeneration
+- SeriesLevel: Pre-aggregated series pyramid for charts
 """
 from core.models.client import Client
 from core.models.measurement import Measurement
 from core.models.measurement_item import MeasurementItem
 from core.models.threshold import Threshold
+from core.models.cohort_sketch import CohortSketch
+from core.models.trend_point import TrendPoint
+from core.models.lactate_fit import LactateFit
+from core.models.generated_report import GeneratedReport
+from core.models.series_level import SeriesLevel
 
-__all__ = ['Client', 'Measurement', 'MeasurementItem', 'Threshold']
+__all__ = [
+    'Client', 'Measurement', 'MeasurementItem', 'Threshold', 'CohortSketch',
+    'TrendPoint', 'LactateFit', 'GeneratedReport', 'SeriesLevel',
+]
@@ -10,6 +10,8 @@ DOCUMENTATION:
 """
 from django.db import models
 
+from core.analysis.names import search_key
+
 
 class Client(models.Model):
     """
@@ -44,6 +46,15 @@ class Client(models.Model):
         default='',
         verbose_name='Middle Name'
     )
+    # Normalized Latin key of the three name fields, kept by save()
+    # (client search: core/services/client_search_service.py)
+    search_name = models.CharField(
+        max_length=400,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Search Key'
+    )
     
     # Demographics
     gender = models.CharField(
@@ -82,6 +93,17 @@ class Client(models.Model):
         verbose_name = 'Client'
         verbose_name_plural = 'Clients'
         ordering = ['last_name', 'name']
+        indexes = [
+            # Keyset pages in ordering order, id breaks ties
+            models.Index(fields=['last_name', 'name', 'id']),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.search_name = search_key(self.last_name, self.name, self.second_name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'name', 'last_name', 'second_name'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
     
     def __str__(self) -> str:
         """Return full name for display."""
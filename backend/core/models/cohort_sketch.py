@@ -0,0 +1,72 @@
+"""
+CohortSketch Model - Persisted Population Norms
+
+Stores one mergeable quantile sketch (t-digest) per cohort cell:
+metric x gender x age band x test type. Used to rank an athlete against
+everyone in the database without scanning all measurements per report.
+
+DOCUMENTATION:
+    Spec: Research/16_normative_reference_values.md
+    Service: core/services/norms_service.py
+"""
+from django.db import models
+
+
+class CohortSketch(models.Model):
+    """
+    Quantile sketch for a single cohort cell.
+
+    The digest is maintained incrementally on import and rebuilt per
+    cell on edits (see NormsService). Cells merge freely, so coarser
+    cohorts (e.g. all ages) are answered by merging finer ones.
+    """
+
+    class Metric(models.TextChoices):
+        VO2MAX = 'VO2MAX', 'VO2max (mL/kg/min)'
+        HRMAX = 'HRMAX', 'HRmax (bpm)'
+        PEAK_POWER = 'PEAK_POWER', 'Peak Power (W)'
+
+    metric = models.CharField(
+        max_length=20,
+        choices=Metric.choices,
+        verbose_name='Metric'
+    )
+
+    # Cohort cell (empty age_band = unknown age)
+    gender = models.CharField(
+        max_length=1,
+        verbose_name='Gender'
+    )
+    age_band = models.CharField(
+        max_length=10,
+        blank=True,
+        default='',
+        verbose_name='Age Band'
+    )
+    test_type = models.CharField(
+        max_length=20,
+        verbose_name='Test Type'
+    )
+
+    # Serialized TDigest (see core.analysis.TDigest.to_dict)
+    digest = models.JSONField(
+        default=dict,
+        verbose_name='Digest'
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Measurements in Cell'
+    )
+
+    # Timestamps
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Cohort Sketch'
+        verbose_name_plural = 'Cohort Sketches'
+        unique_together = ['metric', 'gender', 'age_band', 'test_type']
+        ordering = ['metric', 'test_type', 'gender', 'age_band']
+
+    def __str__(self) -> str:
+        age = self.age_band or '?'
+        return f"{self.metric} {self.test_type} {self.gender} {age} (n={self.count})"
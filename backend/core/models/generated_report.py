@@ -0,0 +1,105 @@
+"""
+GeneratedReport Model - Stored Report with Dependencies
+
+Records every report written to disk together with what it was built
+from: the measurements (main and compared), the threshold types and
+client fields it shows, and whether it reads measurement items directly. Changes
+to exactly those inputs mark the report dirty; the regenerate_reports
+command rebuilds dirty reports in the background.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 2)
+    Service: core/services/generated_report_service.py
+"""
+from django.db import models
+
+
+class GeneratedReport(models.Model):
+    """
+    Report file produced for a measurement (optionally vs an earlier one).
+    """
+
+    measurement = models.ForeignKey(
+        'core.Measurement',
+        on_delete=models.CASCADE,
+        related_name='generated_reports',
+        verbose_name='Measurement'
+    )
+    compare_with = models.ForeignKey(
+        'core.Measurement',
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='+',
+        verbose_name='Compared Measurement'
+    )
+    template = models.CharField(
+        max_length=100,
+        default='default_report',
+        verbose_name='Template'
+    )
+    pdf = models.BooleanField(
+        default=True,
+        verbose_name='PDF'
+    )
+    output_path = models.CharField(
+        max_length=500,
+        verbose_name='Output Path'
+    )
+
+    # Dependencies
+    depends_on = models.ManyToManyField(
+        'core.Measurement',
+        related_name='dependent_reports',
+        verbose_name='Source Measurements'
+    )
+    threshold_types = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Threshold Types Used'
+    )
+    client_fields = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Client Fields Used'
+    )
+    uses_items = models.BooleanField(
+        default=True,
+        verbose_name='Reads Measurement Items'
+    )
+
+    # State
+    is_dirty = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name='Needs Regeneration'
+    )
+    dirty_reason = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        verbose_name='Dirty Reason'
+    )
+    dirtied_at = models.DateTimeField(null=True, blank=True)
+    generated_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        verbose_name = 'Generated Report'
+        verbose_name_plural = 'Generated Reports'
+        # Two partial constraints: NULLs are distinct in a plain unique index
+        constraints = [
+            models.UniqueConstraint(
+                fields=['measurement', 'compare_with', 'template', 'pdf'],
+                condition=models.Q(compare_with__isnull=False),
+                name='generated_report_unique_comparison',
+            ),
+            models.UniqueConstraint(
+                fields=['measurement', 'template', 'pdf'],
+                condition=models.Q(compare_with__isnull=True),
+                name='generated_report_unique_single',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        state = 'dirty' if self.is_dirty else 'fresh'
+        return f"{self.template} #{self.measurement_id} ({state})"
@@ -0,0 +1,71 @@
+"""
+LactateFit Model - Cached Lactate Curve Fit
+
+Persists the fitted lactate-vs-power curve of a measurement together with
+a hash of the stage values it was fitted from. Reports and comparisons
+reuse the stored fit until the underlying lactate values change.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+    Service: core/services/lactate_service.py
+"""
+from django.db import models
+
+
+class LactateFit(models.Model):
+    """
+    Fitted lactate curve and derived markers for one measurement.
+
+    Sources: MeasurementItem.lactat (stage values) and Threshold.lactate.
+    """
+
+    measurement = models.OneToOneField(
+        'core.Measurement',
+        on_delete=models.CASCADE,
+        related_name='lactate_fit',
+        verbose_name='Measurement'
+    )
+
+    # Hash of (power, lactate) points the fit was computed from
+    source_hash = models.CharField(
+        max_length=64,
+        verbose_name='Source Hash'
+    )
+    n_points = models.IntegerField(
+        default=0,
+        verbose_name='Points'
+    )
+
+    # Polynomial on power scaled to 0..1 over [power_min, power_max]
+    coefficients = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Coefficients'
+    )
+    power_min = models.FloatField(null=True, blank=True, verbose_name='Min Power (W)')
+    power_max = models.FloatField(null=True, blank=True, verbose_name='Max Power (W)')
+    r2 = models.FloatField(null=True, blank=True, verbose_name='R²')
+
+    # Markers
+    power_2mmol = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Power at 2 mmol/L (W)'
+    )
+    power_4mmol = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Power at 4 mmol/L (W)'
+    )
+    power_dmax = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Dmax Power (W)'
+    )
+
+    # Timestamps
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Lactate Fit'
+        verbose_name_plural = 'Lactate Fits'
+
+    def __str__(self) -> str:
+        return f"Lactate fit {self.measurement_id} (n={self.n_points})"
@@ -99,6 +99,17 @@ class Measurement(models.Model):
         verbose_name='Include in Report'
     )
     
+    # Change tracking (bumped by core.signals on any data change:
+    # items, thresholds, the measurement itself, its client)
+    data_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Data Version'
+    )
+    data_changed_at = models.DateTimeField(
+        null=True, blank=True,
+        verbose_name='Data Changed At'
+    )
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -20,6 +20,9 @@ Column mapping from C# MeasurementItemMap:
     RPM[rpm] -> rpm
     Ve/VO2 -> ve_vo2
     FeO2[%] -> feo2
+
+Derived at import when the source lacks them (core/analysis/derived.py):
+    vo2_ml_kg_min, vo2_ml_min, vco2_ml_min, r, ve_vo2, ve_vco2, o2_pulse
 """
 from django.db import models
 
@@ -114,6 +117,16 @@ class MeasurementItem(models.Model):
         verbose_name='Ve/VO2',
         help_text='Ventilatory equivalent for O2'
     )
+    ve_vco2 = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Ve/VCO2',
+        help_text='Ventilatory equivalent for CO2'
+    )
+    o2_pulse = models.FloatField(
+        null=True, blank=True,
+        verbose_name='O2 Pulse (mL/beat)',
+        help_text='VO2 per heart beat'
+    )
     feo2 = models.FloatField(
         null=True, blank=True,
         verbose_name='FeO2 (%)',
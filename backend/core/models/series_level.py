@@ -0,0 +1,62 @@
+"""
+SeriesLevel Model - Pre-Aggregated Series Pyramid
+
+Stores one channel of a measurement aggregated into fixed time buckets
+(1 s, 10 s, 60 s, 600 s). Zoomable charts read the coarsest level that
+still fills the chart width instead of scanning MeasurementItem rows, so
+chart latency does not grow with recording length.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 3, dashboard)
+    Service: core/services/series_service.py (build_pyramid)
+"""
+from django.db import models
+
+
+class SeriesLevel(models.Model):
+    """
+    Bucketed min / max / mean of one channel at one resolution.
+
+    Arrays are packed little-endian float32, one value per non-empty
+    bucket, NaN = no value in the bucket. The 'time_sec' row holds the
+    first (mins), last (maxs) and mean (means) time of each bucket and
+    the number of rows per bucket (counts). max_first (uint8 per
+    bucket, channel rows) is 1 where the maximum occurred before the
+    minimum, so min / max pairs can be drawn in time order.
+    """
+
+    measurement = models.ForeignKey(
+        'core.Measurement',
+        on_delete=models.CASCADE,
+        related_name='series_levels',
+        verbose_name='Measurement'
+    )
+    resolution = models.PositiveIntegerField(
+        verbose_name='Bucket (s)'
+    )
+    channel = models.CharField(
+        max_length=30,
+        verbose_name='Channel'
+    )
+
+    # Buckets and covered time range (level selection without the arrays)
+    buckets = models.IntegerField(default=0, verbose_name='Buckets')
+    start_sec = models.FloatField(null=True, blank=True, verbose_name='First Time (s)')
+    end_sec = models.FloatField(null=True, blank=True, verbose_name='Last Time (s)')
+
+    mins = models.BinaryField(default=b'', verbose_name='Minimums')
+    maxs = models.BinaryField(default=b'', verbose_name='Maximums')
+    means = models.BinaryField(default=b'', verbose_name='Means')
+    counts = models.BinaryField(default=b'', blank=True, verbose_name='Rows per Bucket')
+    max_first = models.BinaryField(default=b'', blank=True, verbose_name='Maximum Before Minimum')
+
+    # Timestamps
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Series Level'
+        verbose_name_plural = 'Series Levels'
+        unique_together = ['measurement', 'resolution', 'channel']
+
+    def __str__(self) -> str:
+        return f"{self.measurement_id} {self.channel} @{self.resolution}s (n={self.buckets})"
@@ -0,0 +1,108 @@
+"""
+TrendPoint Model - Materialized Longitudinal History
+
+One row per measurement with the values the client history view needs:
+test date, type, peak VO2, HRmax, peak power and threshold powers.
+Maintained by TrendService on import, item/threshold edits and
+use_in_report toggles, so a client's full history is a single indexed
+read instead of per-test aggregates over MeasurementItem.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 2)
+    Service: core/services/trend_service.py
+"""
+from django.db import models
+
+
+class TrendPoint(models.Model):
+    """
+    Per-measurement summary row for longitudinal trends.
+
+    Denormalized copies (client, date, test type, use_in_report) are
+    kept so the history query never joins Measurement.
+    """
+
+    # Source test (one summary per measurement)
+    measurement = models.OneToOneField(
+        'core.Measurement',
+        on_delete=models.CASCADE,
+        related_name='trend_point',
+        verbose_name='Measurement'
+    )
+    client = models.ForeignKey(
+        'core.Client',
+        on_delete=models.CASCADE,
+        related_name='trend_points',
+        verbose_name='Athlete'
+    )
+
+    # Denormalized measurement attributes
+    measurement_date = models.DateTimeField(
+        verbose_name='Test Date'
+    )
+    test_type = models.CharField(
+        max_length=20,
+        verbose_name='Test Type'
+    )
+    use_in_report = models.BooleanField(
+        default=True,
+        verbose_name='Include in Report'
+    )
+
+    # Peaks over items with use_in_report=True
+    vo2max = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Peak VO2 (mL/kg/min)'
+    )
+    vo2max_abs = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Peak VO2 (mL/min)'
+    )
+    hrmax = models.IntegerField(
+        null=True, blank=True,
+        verbose_name='HRmax (bpm)'
+    )
+    peak_power = models.FloatField(
+        null=True, blank=True,
+        verbose_name='Peak Power (W)'
+    )
+
+    # Threshold powers (Threshold.ThresholdType)
+    aet_power = models.IntegerField(
+        null=True, blank=True,
+        verbose_name='АэП Power (W)'
+    )
+    ant_power = models.IntegerField(
+        null=True, blank=True,
+        verbose_name='АнП Power (W)'
+    )
+    vo2max_power = models.IntegerField(
+        null=True, blank=True,
+        verbose_name='МПК Power (W)'
+    )
+    do2_power = models.IntegerField(
+        null=True, blank=True,
+        verbose_name='ДО2 Power (W)'
+    )
+    mam_power = models.IntegerField(
+        null=True, blank=True,
+        verbose_name='МАМ Power (W)'
+    )
+
+    # Timestamps
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Trend Point'
+        verbose_name_plural = 'Trend Points'
+        ordering = ['client', '-measurement_date']
+        indexes = [
+            # History and keyset pages (core/services/listing_service.py);
+            # measurement breaks ties between tests with the same date
+            models.Index(fields=['client', '-measurement_date', '-measurement']),
+            models.Index(fields=['-measurement_date', '-measurement']),
+        ]
+
+    def __str__(self) -> str:
+        date_str = self.measurement_date.strftime('%Y-%m-%d')
+        return f"Trend {self.client_id} - {date_str}"
@@ -45,6 +45,8 @@ class ParsedItem:
     
     # Derived metrics
     ve_vo2: Optional[float] = None
+    ve_vco2: Optional[float] = None
+    o2_pulse: Optional[float] = None  # mL/beat
     feo2: Optional[float] = None
     r: Optional[float] = None       # RER
     
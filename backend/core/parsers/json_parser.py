@@ -80,13 +80,21 @@ class JsonParser(BaseParser):
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
+        return self.parse_data(data, source_file=path.name)
+    
+    def parse_data(self, data: Dict[str, Any], source_file: str = '') -> ParsedMeasurement:
+        """
+        Parse already loaded JSON (setup + dataMap).
+        
+        Also used by live ingest with an empty dataMap to read the setup.
+        """
         # Parse setup (client metadata)
         setup = data.get('setup', {})
         
         # Parse dataMap (time-series)
         items = []
         for entry in data.get('dataMap', []):
-            item = self._parse_data_entry(entry)
+            item = self.parse_entry(entry)
             if item is not None:
                 items.append(item)
         
@@ -102,9 +110,13 @@ class JsonParser(BaseParser):
             test_id=setup.get('testID'),
             comment=setup.get('comment'),
             source_format='CUSTOM_JSON',
-            source_file=path.name
+            source_file=source_file
         )
     
+    def parse_entry(self, entry: list) -> ParsedItem | None:
+        """Parse one dataMap entry (None if malformed)."""
+        return self._parse_data_entry(entry)
+    
     def _parse_data_entry(self, entry: list) -> ParsedItem | None:
         """
         Parse single dataMap entry.
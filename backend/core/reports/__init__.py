@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any
 import json
 
+from core.reports.charts import ChartSeries, LineChart, render_chart
+
 
 @dataclass
 class ThresholdZone:
@@ -43,6 +45,16 @@ class TrainingZone:
     sessions_per_week: Optional[str] = None
 
 
+@dataclass
+class NormRank:
+    """Athlete's position within a database cohort"""
+    label: str             # VO2max (mL/kg/min), HRmax (bpm), ...
+    value: float           # Athlete's peak value
+    percentile: float      # 0..100
+    cohort: str            # e.g. "М, 30-39, Велосипед"
+    cohort_size: int       # Tests in cohort
+
+
 @dataclass
 class ReportData:
     """Complete report data structure"""
@@ -72,8 +84,11 @@ class ReportData:
     # Training zones
     training_zones: List[TrainingZone] = field(default_factory=list)
     
-    # Raw data for charts
-    chart_data: Dict[str, Any] = field(default_factory=dict)
+    # Population ranking (see NormsService.rank_measurement)
+    norms: List[NormRank] = field(default_factory=list)
+    
+    # Charts by name (hr, ve, vo2, ...), full series - downsampled on render
+    chart_data: Dict[str, LineChart] = field(default_factory=dict)
     
     def to_dict(self) -> dict:
         """Convert to dictionary for template rendering."""
@@ -128,7 +143,19 @@ class ReportData:
                 }
                 for z in self.training_zones
             ],
-            'chart_data': self.chart_data,
+            'norms': [
+                {
+                    'label': n.label,
+                    'value': round(n.value, 1),
+                    'percentile': n.percentile,
+                    'cohort': n.cohort,
+                    'cohort_size': n.cohort_size,
+                }
+                for n in self.norms
+            ],
+            'chart_data': {
+                name: render_chart(chart) for name, chart in self.chart_data.items()
+            },
         }
 
 
@@ -0,0 +1,218 @@
+"""
+Team Bundle - Many Athletes in One PDF
+
+Renders one report section per measurement in parallel (ReportGenerator
+batch pool), then merges them behind a table of contents:
+
+1. Contexts are built from the database (ReportService.build, as for
+   a single report); a measurement that cannot be built is a failure
+2. Sections are rendered to temporary PDF files by worker processes
+3. Sections are grouped into parts of at most max_part_pages pages
+   (a longer section gets a part of its own)
+4. Page counts give each section's part and start page; the TOC is
+   rendered (re-rendered once if it spills onto more pages than assumed)
+5. pypdf appends each part's files with one bookmark per athlete and
+   writes the part to disk before the next one is read
+
+While sections render, the parent only holds file paths and page
+counts. pypdf keeps a document in memory until it is written, so the
+merge holds one part at a time: peak memory is bounded by
+max_part_pages, not by the bundle. The first part (with the TOC) is
+output_path, the others output_path with a _part2, _part3... suffix.
+
+Requires pypdf (pip install pypdf) in addition to WeasyPrint.
+
+Usage:
+    from core.reports.bundle import build_bundle
+    result = build_bundle([12, 15, 18], 'team.pdf', workers=8)
+"""
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from core.reports import timing
+from core.reports.generator import BatchJob, BatchResult, ReportGenerator
+
+TOC_TEMPLATE = '_bundle_toc'
+
+# Pages merged into one output file (bounds the merge step's memory)
+MAX_PART_PAGES = 500
+
+
+@dataclass
+class BundleSection:
+    """One athlete's section in the bundle"""
+    measurement_id: int
+    title: str                 # Athlete name
+    subtitle: str              # Test date and type
+    pages: int = 0
+    part: int = 1              # 1-based output file
+    start_page: int = 0        # 1-based, within its part
+
+
+@dataclass
+class BundleResult:
+    """Outcome of a bundle build"""
+    output_path: str
+    parts: List[str] = field(default_factory=list)   # Written files, output_path first
+    sections: List[BundleSection] = field(default_factory=list)
+    failures: List[BatchResult] = field(default_factory=list)
+    pages: int = 0
+    seconds: float = 0.0
+
+
+def build_bundle(
+    measurement_ids: Sequence[int],
+    output_path: str,
+    template: str = 'default_report',
+    workers: int = 1,
+    title: str = 'Командный отчёт',
+    subtitle: str = '',
+    generator: Optional[ReportGenerator] = None,
+    max_part_pages: int = MAX_PART_PAGES
+) -> BundleResult:
+    """
+    Render sections in parallel and merge them with a table of contents.
+
+    Sections that fail to build or render are left out and listed in
+    BundleResult.failures; if none renders, no file is written.
+
+    Args:
+        measurement_ids: Measurements, in bundle order
+        output_path: Merged PDF path
+        template: Section template
+        workers: Worker processes for section rendering
+        title: TOC heading
+        subtitle: TOC subheading (e.g. team and date)
+        generator: Generator to use (default: new ReportGenerator)
+        max_part_pages: Section pages per output file
+
+    Returns:
+        BundleResult
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        raise ImportError(
+            "pypdf is required for report bundles. "
+            "Install with: pip install pypdf"
+        )
+    from core.models import Measurement
+    from core.services.report_service import ReportService
+
+    started = time.perf_counter()
+    generator = generator or ReportGenerator()
+    result = BundleResult(output_path=output_path)
+
+    with tempfile.TemporaryDirectory(prefix='vo2max_bundle_') as tmp:
+        tmp_dir = Path(tmp)
+
+        # Files are named by position: a measurement listed twice gets two sections
+        sections, jobs = [], []
+        for index, mid in enumerate(measurement_ids):
+            path = str(tmp_dir / f'{index:05d}_{mid}.pdf')
+            try:
+                measurement = Measurement.objects.select_related('client').get(pk=mid)
+                data = ReportService.build(template, mid)
+            except Exception as exc:
+                result.failures.append(BatchResult(path, False, 0.0, error=f"{type(exc).__name__}: {exc}"))
+                continue
+            sections.append(BundleSection(
+                measurement_id=mid,
+                title=measurement.client.full_name,
+                subtitle=f"{measurement.measurement_date:%d.%m.%Y}, {measurement.get_test_type_display()}",
+            ))
+            jobs.append(BatchJob(data=data, output_path=path, template=template))
+
+        rendered = generator.generate_batch(jobs, workers=workers, pdf=True) if jobs else []
+        paths = []
+        for section, outcome in zip(sections, rendered):
+            if outcome.ok:
+                section.pages = len(PdfReader(outcome.output_path).pages)
+                result.sections.append(section)
+                paths.append(outcome.output_path)
+            else:
+                result.failures.append(outcome)
+
+        if not result.sections:
+            result.seconds = time.perf_counter() - started
+            return result
+
+        parts = _assign_parts(result.sections, max_part_pages)
+        toc_path = tmp_dir / 'toc.pdf'
+        toc_pages = _render_toc(generator, result.sections, title, subtitle, toc_path, PdfReader, len(parts))
+
+        with timing.span('merge'):
+            for number, part in enumerate(parts, 1):
+                part_path = _part_path(output_path, number)
+                writer = PdfWriter()
+                if number == 1:
+                    writer.append(str(toc_path), outline_item=title)
+                for index in part:
+                    section = result.sections[index]
+                    writer.append(
+                        paths[index],
+                        outline_item=f"{section.title} — {section.subtitle}"
+                    )
+                with open(part_path, 'wb') as f:
+                    writer.write(f)
+                writer.close()
+                result.parts.append(part_path)
+
+    result.pages = toc_pages + sum(s.pages for s in result.sections)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _assign_parts(sections: List[BundleSection], max_pages: int) -> List[List[int]]:
+    """Group sections, in order, into parts of at most max_pages pages (section indices)."""
+    parts: List[List[int]] = [[]]
+    pages = 0
+    for index, section in enumerate(sections):
+        if parts[-1] and pages + section.pages > max_pages:
+            parts.append([])
+            pages = 0
+        parts[-1].append(index)
+        pages += section.pages
+        section.part = len(parts)
+    return parts
+
+
+def _part_path(output_path: str, number: int) -> str:
+    """output_path for part 1, <stem>_part<number><suffix> after."""
+    if number == 1:
+        return output_path
+    path = Path(output_path)
+    return str(path.with_name(f'{path.stem}_part{number}{path.suffix}'))
+
+
+def _render_toc(
+    generator: ReportGenerator,
+    sections: List[BundleSection],
+    title: str,
+    subtitle: str,
+    output_path: Path,
+    reader_class,
+    parts: int = 1
+) -> int:
+    """Render TOC with section parts and start pages; returns its page count."""
+    assumed = 1
+    while True:
+        page, part = assumed + 1, 1
+        for section in sections:
+            if section.part != part:
+                page, part = 1, section.part
+            section.start_page = page
+            page += section.pages
+
+        generator.generate_pdf(
+            {'title': title, 'subtitle': subtitle, 'sections': sections, 'parts': parts},
+            template=TOC_TEMPLATE,
+            output_path=str(output_path)
+        )
+        actual = len(reader_class(str(output_path)).pages)
+        if actual <= assumed:
+            return actual
+        assumed = actual
@@ -0,0 +1,163 @@
+"""
+Report Cache - Content-Addressed Storage of Rendered Reports
+
+Rendered HTML and PDF bytes are stored on disk under a key derived from
+everything that determines the output:
+- the report payload (ReportData.to_dict(), canonical JSON)
+- the template source, including every template it includes (digest)
+- the generator version (GENERATOR_VERSION in generator.py), plus the
+  shared stylesheets' digest for PDFs
+
+Any change to thresholds, zones or the template changes the key, so no
+explicit invalidation is needed. The cache is size-bounded: least
+recently used entries are evicted once the total exceeds max_bytes.
+Writes are atomic, so several worker processes may share a directory.
+
+Usage:
+    cache = ReportCache('/var/cache/vo2max_reports', max_bytes=512 * 2**20)
+    key = cache.make_key('pdf', data, template_source, '3')
+    pdf = cache.get(key)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+# Default location and size limit (overridable via environment)
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    'REPORT_CACHE_DIR',
+    Path(tempfile.gettempdir()) / 'vo2max_report_cache'
+))
+DEFAULT_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_MB', 512)) * 2 ** 20
+
+
+class ReportCache:
+    """
+    Size-bounded on-disk cache of rendered report bytes.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Cache directory (created on first write)
+            max_bytes: Total size limit before LRU eviction
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind: str, data: dict, template_source: str, version: str) -> str:
+        """
+        Stable key of one rendered output.
+
+        Args:
+            kind: Output kind ('html' or 'pdf')
+            data: Template context (must be JSON-serializable, dates via str)
+            template_source: Template source text (or a digest of it and its partials)
+            version: Generator version (and anything else the output depends on)
+        """
+        digest = hashlib.sha256()
+        for part in (kind, version, template_source):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        # Hash the canonical JSON incrementally: large payloads (full
+        # data_rows tables) are never serialized into one string
+        encoder = json.JSONEncoder(sort_keys=True, ensure_ascii=False, default=str)
+        for chunk in encoder.iterencode(data):
+            digest.update(chunk.encode('utf-8'))
+        return f"{digest.hexdigest()}.{kind}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes or None; a hit refreshes the entry's LRU position."""
+        path = self.directory / key
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted concurrently, content is still valid
+        return content
+
+    def path(self, key: str) -> Optional[Path]:
+        """
+        Path of a cached entry for streaming reads, or None.
+        Refreshes the entry's LRU position.
+        """
+        path = self.directory / key
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, content: bytes) -> None:
+        """Store bytes atomically, then evict if over the size limit."""
+        with self.writer(key) as f:
+            f.write(content)
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        """
+        Write an entry incrementally (streaming renders).
+
+        The entry becomes visible only when the block completes; an
+        exception or an abandoned generator discards the partial file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        f = os.fdopen(fd, 'wb')
+        try:
+            yield f
+            f.close()
+            os.replace(tmp_path, self.directory / key)
+        except BaseException:
+            f.close()
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for entry in self._entries():
+            Path(entry.path).unlink(missing_ok=True)
+
+    def size(self) -> int:
+        """Total bytes stored."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self) -> list:
+        """Cache files (no temporary files)."""
+        try:
+            return [
+                entry for entry in os.scandir(self.directory)
+                if entry.is_file() and not entry.name.endswith('.tmp')
+            ]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                Path(path).unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
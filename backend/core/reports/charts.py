@@ -0,0 +1,163 @@
+"""
+Report Charts - Downsampled SVG Line Charts
+
+Turns full measurement series (breath-by-breath, thousands of points)
+into compact SVG path strings for the report templates. Each series is
+downsampled to at most max_points with a shape-preserving algorithm
+(core.analysis.downsample), so PDF size and WeasyPrint layout time stay
+bounded regardless of test length.
+
+Templates draw the frame; render_chart() supplies paths and tick labels
+in the same 300x150 viewBox used by detailed_report.html:
+
+    <svg class="line-chart" viewBox="{{ chart.view_box }}">
+      {% for s in chart.series %}<path d="{{ s.path }}" stroke="{{ s.color }}" fill="none"/>{% endfor %}
+    </svg>
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.analysis.downsample import downsample
+from core.reports import timing
+
+# Geometry of templates' SVG charts (viewBox 0 0 300 150)
+VIEW_WIDTH = 300
+VIEW_HEIGHT = 150
+PLOT_LEFT, PLOT_RIGHT = 30, 290
+PLOT_TOP, PLOT_BOTTOM = 10, 130
+
+# Points per series after downsampling (~1 per horizontal unit)
+DEFAULT_MAX_POINTS = 260
+
+# Series colors matching the report palette (date_1 blue, date_2 red)
+SERIES_COLORS = ['#4a7ab7', '#c44', '#5a5', '#c80']
+
+
+@dataclass
+class ChartSeries:
+    """One line of a chart"""
+    label: str
+    x: Sequence[float]          # e.g. time_sec or power
+    y: Sequence[float]          # None/NaN = missing
+    color: str = ''             # default: SERIES_COLORS by position
+
+
+@dataclass
+class LineChart:
+    """Line chart of one or more series"""
+    title: str
+    series: List[ChartSeries] = field(default_factory=list)
+    x_label: str = ''
+    y_label: str = ''
+    y_range: Optional[Tuple[float, float]] = None   # default: from data
+    method: str = 'lttb'                            # or 'minmax' for spiky signals
+    max_points: int = DEFAULT_MAX_POINTS
+
+
+def render_chart(chart: LineChart) -> Dict[str, Any]:
+    """
+    Downsample and project a chart to SVG path data.
+
+    Returns:
+        {'title', 'view_box', 'x_label', 'y_label',
+         'series': [{'label', 'color', 'path', 'points'}],
+         'x_ticks': [{'pos', 'label'}], 'y_ticks': [{'pos', 'label'}]}
+    """
+    with timing.span('compute'):
+        return _render(chart)
+
+
+def _render(chart: LineChart) -> Dict[str, Any]:
+    """render_chart() body."""
+    reduced = []
+    for s in chart.series:
+        x = np.array([np.nan if v is None else v for v in s.x], dtype=np.float64)
+        y = np.array([np.nan if v is None else v for v in s.y], dtype=np.float64)
+        reduced.append(downsample(x, y, chart.max_points, chart.method))
+
+    all_x = np.concatenate([x for x, _ in reduced]) if reduced else np.array([])
+    all_y = np.concatenate([y for _, y in reduced]) if reduced else np.array([])
+    x_min, x_max = _extent(all_x)
+    y_min, y_max = chart.y_range or _nice_extent(all_y)
+
+    def scale_x(values: np.ndarray) -> np.ndarray:
+        return PLOT_LEFT + (values - x_min) / (x_max - x_min) * (PLOT_RIGHT - PLOT_LEFT)
+
+    def scale_y(values: np.ndarray) -> np.ndarray:
+        return PLOT_BOTTOM - (values - y_min) / (y_max - y_min) * (PLOT_BOTTOM - PLOT_TOP)
+
+    series = []
+    for position, (s, (x, y)) in enumerate(zip(chart.series, reduced)):
+        series.append({
+            'label': s.label,
+            'color': s.color or SERIES_COLORS[position % len(SERIES_COLORS)],
+            'path': _path(scale_x(x), scale_y(np.clip(y, y_min, y_max))),
+            'points': len(x),
+        })
+
+    return {
+        'title': chart.title,
+        'view_box': f"0 0 {VIEW_WIDTH} {VIEW_HEIGHT}",
+        'x_label': chart.x_label,
+        'y_label': chart.y_label,
+        'series': series,
+        'x_ticks': [
+            {'pos': round(float(scale_x(np.float64(v))), 1), 'label': _format(v)}
+            for v in _ticks(x_min, x_max)
+        ],
+        'y_ticks': [
+            {'pos': round(float(scale_y(np.float64(v))), 1), 'label': _format(v)}
+            for v in _ticks(y_min, y_max)
+        ],
+    }
+
+
+def _path(px: np.ndarray, py: np.ndarray) -> str:
+    """SVG path 'M x,y L x,y ...' with 0.1 precision, duplicates dropped."""
+    if not len(px):
+        return ''
+    coords = np.round(np.column_stack([px, py]), 1)
+    keep = np.r_[True, np.any(np.diff(coords, axis=0) != 0, axis=1)]
+    points = [f"{x:g},{y:g}" for x, y in coords[keep]]
+    return 'M' + 'L'.join(points)
+
+
+def _extent(values: np.ndarray) -> Tuple[float, float]:
+    """Finite min/max, widened if degenerate."""
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return 0.0, 1.0
+    low, high = float(values.min()), float(values.max())
+    return (low, high) if high > low else (low - 0.5, high + 0.5)
+
+
+def _nice_extent(values: np.ndarray) -> Tuple[float, float]:
+    """Data extent rounded outwards to tick steps."""
+    low, high = _extent(values)
+    step = _tick_step(low, high)
+    return math.floor(low / step) * step, math.ceil(high / step) * step
+
+
+def _tick_step(low: float, high: float, count: int = 4) -> float:
+    """1/2/5 x 10^n step giving about count intervals."""
+    raw = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def _ticks(low: float, high: float) -> List[float]:
+    """Tick values within [low, high]."""
+    step = _tick_step(low, high)
+    first = math.ceil(low / step) * step
+    return [first + i * step for i in range(int((high - first) / step + 1e-9) + 1)]
+
+
+def _format(value: float) -> str:
+    """Compact tick label."""
+    return f"{value:g}" if abs(value) < 1e5 else f"{value:.0f}"
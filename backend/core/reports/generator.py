@@ -1,21 +1,178 @@
 """
 Report Generator Service
 
-Renders HTML templates with Jinja2 and converts to PDF using WeasyPrint.
+Renders HTML templates with Jinja2 and converts to PDF using WeasyPrint
+(through a long-lived PdfRenderer, core/reports/pdf.py).
 Supports custom templates stored in the templates directory.
 
+Template compilation is shared process-wide: one Jinja2 Environment per
+templates directory (get_environment), backed by an on-disk bytecode
+cache, so generators created per request reuse compiled templates.
+Changed template files are detected by mtime and recompiled.
+
+Rendered HTML/PDF bytes are memoized in a ReportCache (core/reports/cache.py)
+keyed by payload, template source (with every included, imported or
+extended template), GENERATOR_VERSION and, for PDFs, the shared
+stylesheets of the PdfRenderer.
+
 Usage:
     from core.reports.generator import ReportGenerator
     generator = ReportGenerator()
     pdf_bytes = generator.generate_pdf(report_data, template='default_report')
+
+    # Worker startup (see config/wsgi.py)
+    from core.reports.generator import precompile_templates
+    precompile_templates()
+
+    # Large reports: chunks to a file or StreamingHttpResponse
+    response = StreamingHttpResponse(generator.stream_html(data, 'detailed_report'))
+
+    # Many reports in a process pool
+    results = generator.generate_batch(
+        [BatchJob(data=d, output_path=f'report_{i}.pdf') for i, d in enumerate(payloads)],
+        workers=8
+    )
 """
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateSyntaxError, meta, select_autoescape
+
+from core.reports import timing
+from core.reports.cache import ReportCache
+from core.reports.pdf import get_renderer, stylesheet_digest
+
+# Bump when generator code changes rendered output (invalidates ReportCache)
+GENERATOR_VERSION = '1'
+
+# Characters buffered per chunk in stream_html (avoids tiny writes)
+STREAM_CHUNK_SIZE = 64 * 1024
 
 # Template directory
 TEMPLATES_DIR = Path(__file__).parent / 'templates'
 
+# Compiled template bytecode, shared by all processes of a host
+BYTECODE_CACHE_DIR = Path(os.environ.get(
+    'REPORT_TEMPLATE_CACHE_DIR',
+    Path(tempfile.gettempdir()) / 'vo2max_report_templates'
+))
+
+# One Environment per templates directory, shared by all generators
+_environments: Dict[Path, Environment] = {}
+_environments_lock = threading.Lock()
+
+# Rendered report cache shared by generators of this process
+_default_cache = ReportCache()
+
+# (templates dir, template name) -> (uptodate checks of all sources, digest)
+_template_digests: Dict[Tuple[Path, str], Tuple[List[Callable[[], bool]], str]] = {}
+
+
+def get_environment(templates_dir: Optional[Path] = None) -> Environment:
+    """
+    Shared Jinja2 Environment for a templates directory.
+
+    Compiled templates stay in the Environment's in-memory cache and
+    in the bytecode cache on disk; auto_reload recompiles a template
+    when its file changes.
+    """
+    key = Path(templates_dir or TEMPLATES_DIR).resolve()
+    env = _environments.get(key)
+    if env is None:
+        with _environments_lock:
+            env = _environments.get(key)
+            if env is None:
+                BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                env = Environment(
+                    loader=FileSystemLoader(str(key)),
+                    autoescape=select_autoescape(['html', 'xml']),
+                    bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+                    auto_reload=True,
+                )
+                _environments[key] = env
+    return env
+
+
+def template_digest(env: Environment, name: str) -> str:
+    """
+    Digest of a template and every template it references (include,
+    import, extends), recursively.
+
+    Memoized until one of the source files changes, so a cache lookup
+    costs one stat per file.
+    """
+    memo_key = (Path(env.loader.searchpath[0]), name)
+    cached = _template_digests.get(memo_key)
+    if cached is not None and all(uptodate() for uptodate in cached[0]):
+        return cached[1]
+
+    digest = hashlib.sha256()
+    checks = []
+    pending, seen = [name], set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        source, _, uptodate = env.loader.get_source(env, current)
+        for part in (current, source):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        if uptodate is not None:
+            checks.append(uptodate)
+        try:
+            referenced = meta.find_referenced_templates(env.parse(source))
+        except TemplateSyntaxError:
+            continue  # raw asset (e.g. included CSS): nothing referenced
+        # Dynamic names (None) cannot be resolved statically
+        pending.extend(sorted(ref for ref in referenced if ref))
+
+    result = digest.hexdigest()
+    _template_digests[memo_key] = (checks, result)
+    return result
+
+
+def precompile_templates(templates_dir: Optional[Path] = None) -> List[str]:
+    """
+    Load and compile all templates of a directory (call at worker startup).
+
+    Returns:
+        Names of compiled templates
+    """
+    env = get_environment(templates_dir)
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+@dataclass
+class BatchJob:
+    """One document of a batch"""
+    data: dict
+    output_path: str
+    template: str = 'default_report'
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch document"""
+    output_path: str
+    ok: bool
+    seconds: float
+    size: int = 0
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)   # span name -> seconds
+    # Rendered in the calling process: timings were already recorded into
+    # the caller's collector and hooks (pool results must be merged)
+    in_process: bool = False
+
 
 class ReportGenerator:
     """
@@ -25,23 +182,29 @@ class ReportGenerator:
     Users can add custom templates by placing HTML files there.
     """
     
-    def __init__(self, templates_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        templates_dir: Optional[Path] = None,
+        use_cache: bool = True,
+        cache: Optional[ReportCache] = None
+    ):
         """
         Initialize generator with template directory.
         
         Args:
             templates_dir: Custom templates directory (default: ./templates)
+            use_cache: Memoize rendered HTML/PDF bytes
+            cache: Custom ReportCache (default: shared on-disk cache)
         """
         self.templates_dir = templates_dir or TEMPLATES_DIR
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.templates_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        self.env = get_environment(self.templates_dir)
+        self.cache = (cache or _default_cache) if use_cache else None
     
     def list_templates(self) -> list[str]:
-        """List available template names."""
+        """List available template names (partials starting with _ excluded)."""
         return [
             p.stem for p in self.templates_dir.glob('*.html')
+            if not p.stem.startswith('_')
         ]
     
     def render_html(self, data: dict, template: str = 'default_report') -> str:
@@ -55,8 +218,66 @@ class ReportGenerator:
         Returns:
             Rendered HTML string
         """
-        tpl = self.env.get_template(f'{template}.html')
-        return tpl.render(**data)
+        key = self._cache_key('html', data, template)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.decode('utf-8')
+        
+        with timing.span('render_html'):
+            tpl = self.env.get_template(f'{template}.html')
+            html_content = tpl.render(**data)
+        
+        if key:
+            self.cache.put(key, html_content.encode('utf-8'))
+        return html_content
+    
+    def stream_html(
+        self,
+        data: dict,
+        template: str = 'default_report',
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[str]:
+        """
+        Render template incrementally with Jinja's generator API.
+        
+        The document is never held in memory as a whole: chunks of about
+        chunk_size characters are yielded as the template produces them.
+        A cache hit is streamed from disk; a miss is teed into the cache.
+        
+        Args:
+            data: Template context dictionary
+            template: Template name (without .html extension)
+            chunk_size: Characters per yielded chunk
+            
+        Yields:
+            HTML chunks
+        """
+        key = self._cache_key('html', data, template)
+        cached = self.cache.path(key) if key else None
+        if cached:
+            try:
+                f = open(cached, encoding='utf-8')
+            except FileNotFoundError:
+                pass  # evicted meanwhile: render below
+            else:
+                with f:
+                    while chunk := f.read(chunk_size):
+                        yield chunk
+                return
+        
+        chunks = _timed(
+            'render_html',
+            _buffered(self.env.get_template(f'{template}.html').generate(**data), chunk_size)
+        )
+        if not key:
+            yield from chunks
+            return
+        
+        with self.cache.writer(key) as f:
+            for chunk in chunks:
+                f.write(chunk.encode('utf-8'))
+                yield chunk
     
     def generate_pdf(
         self, 
@@ -75,19 +296,22 @@ class ReportGenerator:
         Returns:
             PDF as bytes
         """
-        try:
-            from weasyprint import HTML, CSS
-        except ImportError:
-            raise ImportError(
-                "WeasyPrint is required for PDF generation. "
-                "Install with: pip install weasyprint"
-            )
+        key = self._cache_key('pdf', data, template)
+        pdf_bytes = self.cache.get(key) if key else None
         
-        html_content = self.render_html(data, template)
-        
-        # Generate PDF
-        html = HTML(string=html_content, base_url=str(self.templates_dir))
-        pdf_bytes = html.write_pdf()
+        if pdf_bytes is None:
+            renderer = get_renderer(self.templates_dir)
+            # Shared CSS comes pre-parsed from the renderer, not embedded
+            with timing.span('render_html'):
+                tpl = self.env.get_template(f'{template}.html')
+                html_content = tpl.render(**{**data, 'embed_stylesheet': False})
+            
+            # Generate PDF (warm renderer: shared CSS, fonts and assets)
+            with timing.span('write_pdf'):
+                pdf_bytes = renderer.write_pdf(html_content)
+            
+            if key:
+                self.cache.put(key, pdf_bytes)
         
         # Save if path provided
         if output_path:
@@ -95,6 +319,17 @@ class ReportGenerator:
         
         return pdf_bytes
     
+    def _cache_key(self, kind: str, data: dict, template: str) -> Optional[str]:
+        """ReportCache key of an output (None if caching is off)."""
+        if self.cache is None:
+            return None
+        with timing.span('cache_key'):
+            source = template_digest(self.env, f'{template}.html')
+            version = GENERATOR_VERSION
+            if kind == 'pdf':
+                version += ':' + stylesheet_digest(self.templates_dir)
+            return self.cache.make_key(kind, data, source, version)
+    
     def generate_html_file(
         self,
         data: dict,
@@ -112,25 +347,121 @@ class ReportGenerator:
         Returns:
             Path to generated file
         """
-        html_content = self.render_html(data, template)
-        Path(output_path).write_text(html_content, encoding='utf-8')
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in self.stream_html(data, template):
+                f.write(chunk)
         return output_path
 
+    def generate_batch(
+        self,
+        jobs: List[BatchJob],
+        workers: int = 1,
+        pdf: bool = True
+    ) -> List[BatchResult]:
+        """
+        Render many documents, in a process pool if workers > 1.
 
-def generate_sample_report(output_path: str = 'sample_report.html') -> str:
+        WeasyPrint layout is CPU-bound and single-threaded, so documents
+        are spread over processes. Each worker is warmed once (templates
+        compiled, WeasyPrint and fonts loaded) before taking jobs.
+        A failing document does not stop the batch.
+
+        Args:
+            jobs: Documents to render
+            workers: Worker processes (1 = in-process)
+            pdf: Write PDF (True) or HTML (False)
+
+        Returns:
+            BatchResult per job, in input order
+        """
+        if workers <= 1 or len(jobs) < 2:
+            _warm(self.templates_dir, pdf)
+            return [_render_job(job, pdf, self) for job in jobs]
+
+        # Workers rebuild an equivalent generator (same templates and cache)
+        cache = (self.cache.directory, self.cache.max_bytes) if self.cache else None
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            initializer=_warm_worker,
+            initargs=(self.templates_dir, pdf, cache)
+        ) as pool:
+            return list(pool.map(_render_job, jobs, [pdf] * len(jobs)))
+
+
+def _buffered(pieces: Iterator[str], size: int) -> Iterator[str]:
+    """Join small template output pieces into chunks of about size characters."""
+    buffer: List[str] = []
+    length = 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _timed(name: str, chunks: Iterator[str]) -> Iterator[str]:
+    """Record time spent producing chunks (not consuming them) as one span."""
+    elapsed = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - started
+            yield chunk
+    finally:
+        timing.record(name, elapsed)
+
+
+# Generator of the current (worker) process, set by _warm_worker
+_worker_generator: Optional[ReportGenerator] = None
+
+
+def _warm_worker(templates_dir: Path, pdf: bool, cache: Optional[tuple]) -> None:
     """
-    Generate sample report using default data.
-    
-    Returns:
-        Path to generated HTML file
+    Process pool initializer: build the worker's generator, then warm it.
+
+    Args:
+        cache: (directory, max_bytes) of the parent's ReportCache, None if disabled
     """
-    from core.reports import create_sample_report
-    
-    report_data = create_sample_report()
-    generator = ReportGenerator()
-    
-    return generator.generate_html_file(
-        data=report_data.to_dict(),
-        template='default_report',
-        output_path=output_path
+    global _worker_generator
+    report_cache = ReportCache(*cache) if cache else None
+    _worker_generator = ReportGenerator(templates_dir, use_cache=cache is not None, cache=report_cache)
+    _warm(templates_dir, pdf)
+
+
+def _warm(templates_dir: Path, pdf: bool) -> None:
+    """Compile templates, load WeasyPrint and fonts."""
+    precompile_templates(templates_dir)
+    if pdf:
+        try:
+            get_renderer(templates_dir).warm()
+        except ImportError:
+            pass  # missing WeasyPrint or its system libraries: reported per document
+
+
+def _render_job(job: BatchJob, pdf: bool, generator: Optional[ReportGenerator] = None) -> BatchResult:
+    """Render one batch document (default: the worker's generator), capturing timing and failures."""
+    in_process = generator is not None
+    generator = generator or _worker_generator
+    started = time.perf_counter()
+    with timing.collect() as spans:
+        try:
+            if pdf:
+                size = len(generator.generate_pdf(job.data, job.template, job.output_path))
+            else:
+                generator.generate_html_file(job.data, job.template, job.output_path)
+                size = Path(job.output_path).stat().st_size
+            error = None
+        except Exception as exc:
+            size, error = 0, f"{type(exc).__name__}: {exc}"
+    return BatchResult(
+        job.output_path, error is None, time.perf_counter() - started,
+        size=size, error=error, timings=dict(spans.totals), in_process=in_process
     )
@@ -0,0 +1,209 @@
+"""
+PDF Renderer - Long-Lived WeasyPrint State
+
+A fresh HTML(string=...).write_pdf() per document re-parses stylesheets,
+rebuilds the font configuration and re-reads every image and font from
+disk. PdfRenderer keeps that state for the life of a worker:
+- shared stylesheets (*.css in the templates directory, i.e. report.css)
+  parsed once and re-parsed only when a file changes; templates embed
+  report.css only for HTML output (ReportGenerator renders PDF input
+  with embed_stylesheet=False)
+- one FontConfiguration for all documents (@font-face loaded once)
+- local assets under the templates directory read once and served from
+  memory until the file changes; other URLs use the default fetcher
+- WeasyPrint's image cache shared across documents (WeasyPrint >= 59),
+  emptied between documents when a cached local image changes on disk
+  or the cache exceeds MAX_IMAGE_CACHE_BYTES
+
+One renderer per templates directory and thread (get_renderer), since
+WeasyPrint objects are not meant to be shared between threads.
+
+Usage:
+    from core.reports.pdf import get_renderer
+    pdf_bytes = get_renderer(templates_dir).write_pdf(html_content)
+"""
+import hashlib
+import mimetypes
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+# Local assets larger than this are fetched from disk every time
+MAX_CACHED_ASSET_BYTES = 5 * 2 ** 20
+
+# Decoded image data kept in WeasyPrint's image cache across documents
+MAX_IMAGE_CACHE_BYTES = 64 * 2 ** 20
+
+_local = threading.local()
+
+# templates dir -> ((path, mtime_ns) of each stylesheet, digest)
+_stylesheet_digests: Dict[Path, Tuple[tuple, str]] = {}
+
+
+def stylesheet_paths(templates_dir: Path) -> List[Path]:
+    """Shared stylesheets of a templates directory (*.css), in load order."""
+    return sorted(Path(templates_dir).resolve().glob('*.css'))
+
+
+def _stamp(paths: List[Path]) -> tuple:
+    """(path, mtime_ns) of each file: changes when any file is edited."""
+    return tuple((str(path), path.stat().st_mtime_ns) for path in paths)
+
+
+def stylesheet_digest(templates_dir: Path) -> str:
+    """
+    Digest of the shared stylesheets' content (part of PDF cache keys).
+    Files are re-hashed only when their mtime changes.
+    """
+    paths = stylesheet_paths(templates_dir)
+    stamp = _stamp(paths)
+    key = Path(templates_dir).resolve()
+    cached = _stylesheet_digests.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+    _stylesheet_digests[key] = (stamp, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def get_renderer(templates_dir: Path) -> 'PdfRenderer':
+    """Renderer of the current thread for a templates directory."""
+    renderers = getattr(_local, 'renderers', None)
+    if renderers is None:
+        renderers = _local.renderers = {}
+    key = Path(templates_dir).resolve()
+    if key not in renderers:
+        renderers[key] = PdfRenderer(key)
+    return renderers[key]
+
+
+class PdfRenderer:
+    """
+    WeasyPrint renderer reusing stylesheets, fonts and assets.
+
+    Raises ImportError on construction if WeasyPrint (or its system
+    libraries) is not available.
+    """
+
+    def __init__(self, templates_dir: Path, stylesheets: Optional[List[Path]] = None):
+        """
+        Args:
+            templates_dir: Base directory for relative URLs and local assets
+            stylesheets: Shared CSS files (default: *.css in templates_dir)
+        """
+        try:
+            from weasyprint import default_url_fetcher
+            from weasyprint.text.fonts import FontConfiguration
+        except (ImportError, OSError) as exc:
+            raise ImportError(
+                "WeasyPrint is required for PDF generation. "
+                "Install with: pip install weasyprint"
+            ) from exc
+
+        self.templates_dir = Path(templates_dir).resolve()
+        self._default_fetcher = default_url_fetcher
+        self._assets: Dict[str, Tuple[int, Dict[str, Any]]] = {}   # url -> (mtime_ns, response)
+        self._image_cache: Dict[str, Any] = {}
+        self._image_stamps: Dict[str, Optional[int]] = {}           # cached local url -> mtime_ns
+        self.font_config = FontConfiguration()
+
+        self._stylesheet_paths = stylesheets
+        self._stylesheet_stamp: Optional[tuple] = None
+        self.stylesheets: List[Any] = []
+
+    def write_pdf(self, html_content: str) -> bytes:
+        """Lay out an HTML document and return PDF bytes."""
+        from weasyprint import HTML
+
+        html = HTML(string=html_content, base_url=str(self.templates_dir), url_fetcher=self.fetch)
+        pdf_bytes = html.write_pdf(
+            stylesheets=self._current_stylesheets(),
+            font_config=self.font_config,
+            cache=self._current_image_cache(),
+        )
+        self._image_stamps = {
+            url: self._mtime(url) for url in self._image_cache if self._local_path(url)
+        }
+        return pdf_bytes
+
+    def warm(self) -> None:
+        """Load fontconfig, default stylesheets and shared CSS with a tiny document."""
+        self.write_pdf('<p>warm-up</p>')
+
+    def fetch(self, url: str, *args, **kwargs) -> Dict[str, Any]:
+        """
+        URL fetcher serving local template assets from memory.
+
+        Cached assets are re-read when the file's mtime changes. Anything
+        outside the templates directory (or too large) is delegated to
+        WeasyPrint's default fetcher uncached.
+        """
+        path = self._local_path(url)
+        stat = path.stat() if path else None
+        if stat is None or stat.st_size > MAX_CACHED_ASSET_BYTES:
+            return self._default_fetcher(url, *args, **kwargs)
+
+        cached = self._assets.get(url)
+        if cached is None or cached[0] != stat.st_mtime_ns:
+            mime_type, _ = mimetypes.guess_type(str(path))
+            cached = (stat.st_mtime_ns, {
+                'string': path.read_bytes(),
+                'mime_type': mime_type,
+                'encoding': None,
+                'redirected_url': url,
+                'filename': path.name,
+            })
+            self._assets[url] = cached
+        return dict(cached[1])
+
+    def _current_stylesheets(self) -> List[Any]:
+        """Parsed shared stylesheets, re-parsed when a file changed (or was added)."""
+        from weasyprint import CSS
+
+        paths = self._stylesheet_paths
+        if paths is None:
+            paths = stylesheet_paths(self.templates_dir)
+        stamp = _stamp(paths)
+        if stamp != self._stylesheet_stamp:
+            self.stylesheets = [
+                CSS(
+                    filename=str(path),
+                    base_url=str(self.templates_dir),
+                    font_config=self.font_config,
+                    url_fetcher=self.fetch,
+                )
+                for path in paths
+            ]
+            self._stylesheet_stamp = stamp
+        return self.stylesheets
+
+    def _current_image_cache(self) -> Dict[str, Any]:
+        """
+        Image cache for the next document. Emptied (never during a
+        layout: WeasyPrint reads entries back while writing) when a cached
+        local image changed on disk or the data outgrew MAX_IMAGE_CACHE_BYTES.
+        """
+        changed = any(self._mtime(url) != mtime for url, mtime in self._image_stamps.items())
+        size = sum(len(value) for value in self._image_cache.values() if isinstance(value, (bytes, bytearray)))
+        if changed or size > MAX_IMAGE_CACHE_BYTES:
+            self._image_cache.clear()
+            self._image_stamps = {}
+        return self._image_cache
+
+    def _mtime(self, url: str) -> Optional[int]:
+        path = self._local_path(url)
+        return path.stat().st_mtime_ns if path else None
+
+    def _local_path(self, url: str) -> Optional[Path]:
+        """File path for a file:// URL inside the templates directory."""
+        if not url.startswith('file://'):
+            return None
+        path = Path(unquote(urlsplit(url).path)).resolve()
+        if not path.is_file() or self.templates_dir not in path.parents:
+            return None
+        return path
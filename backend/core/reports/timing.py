@@ -0,0 +1,133 @@
+"""
+Report Timing - Named Spans for the Report Pipeline
+
+Splits report wall time into stages so a slow report can be attributed:
+- query:       database reads (ReportService)
+- compute:     aggregation of stage tables, charts, norms
+- render_html: Jinja rendering (ReportGenerator)
+- write_pdf:   WeasyPrint layout and PDF output
+- cache_key:   hashing the payload for ReportCache lookups
+
+Spans are recorded into the active Timings collector (per thread/task,
+via contextvars) and passed to registered hooks, so production workers
+can forward them to a metrics backend:
+
+    from core.reports import timing
+
+    timing.add_hook(lambda name, seconds: statsd.timing(f'report.{name}', seconds * 1000))
+
+    with timing.collect() as timings:
+        generator.generate_pdf(data)
+    print(timings.format())
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hook signature: (span name, seconds)
+SpanHook = Callable[[str, float], None]
+
+_hooks: List[SpanHook] = []
+_collector: ContextVar[Optional['Timings']] = ContextVar('report_timings', default=None)
+_active: ContextVar[frozenset] = ContextVar('report_active_spans', default=frozenset())
+
+
+class Timings:
+    """Accumulated span durations of one collection."""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add one span."""
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def merge(self, totals: Dict[str, float]) -> None:
+        """Add totals collected elsewhere (e.g. in a batch worker)."""
+        for name, seconds in totals.items():
+            self.add(name, seconds)
+
+    def absorb(self, other: 'Timings') -> None:
+        """Add totals and call counts of another collection."""
+        for name, seconds in other.totals.items():
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + other.counts[name]
+
+    @property
+    def total(self) -> float:
+        return sum(self.totals.values())
+
+    def format(self, wall: Optional[float] = None) -> str:
+        """Breakdown table, slowest stage first."""
+        wall = wall or self.total
+        lines = [f"{'stage':<12} {'calls':>6} {'total ms':>10} {'share':>7}"]
+        for name, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            share = seconds / wall * 100 if wall else 0.0
+            lines.append(f"{name:<12} {self.counts[name]:>6} {seconds * 1000:>10.1f} {share:>6.1f}%")
+        return '\n'.join(lines)
+
+
+def add_hook(hook: SpanHook) -> None:
+    """Register a callback receiving every finished span."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: SpanHook) -> None:
+    """Unregister a callback."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def record(name: str, seconds: float) -> None:
+    """Record a finished span (for durations measured by the caller)."""
+    collector = _collector.get()
+    if collector is not None:
+        collector.add(name, seconds)
+    for hook in list(_hooks):
+        try:
+            hook(name, seconds)
+        except Exception:
+            # Metrics must never break report generation
+            logger.exception("Report timing hook failed for span %s", name)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as a named span. A span nested in a span of
+    the same name is not recorded (the outer one already covers it).
+    """
+    active = _active.get()
+    if name in active:
+        yield
+        return
+    token = _active.set(active | {name})
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+        _active.reset(token)
+
+
+@contextmanager
+def collect() -> Iterator[Timings]:
+    """
+    Collect spans recorded in the enclosed block. A nested collection
+    also passes its spans on to the enclosing one.
+    """
+    outer = _collector.get()
+    timings = Timings()
+    token = _collector.set(timings)
+    try:
+        yield timings
+    finally:
+        _collector.reset(token)
+        if outer is not None:
+            outer.absorb(timings)
@@ -0,0 +1,191 @@
+"""
+ArtifactService - Automatic Exclusion of Artifact Rows
+
+Runs vectorized artifact detection (core.analysis.artifacts) over a
+measurement's channel arrays and applies the verdicts to
+MeasurementItem.use_in_report with ONE set-based UPDATE per measurement.
+
+Reasons are appended to edit_notes after the AUTO_PREFIX marker (a
+note already on the row is kept in front, shortened if the field would
+overflow), so a re-run can restore rows it excluded earlier and give
+back the original note. Specialist decisions are never overridden: rows
+with is_edited=True, and rows excluded by hand (use_in_report=False
+without the marker), are left untouched.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+"""
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+from django.db import connections, transaction
+from django.db.models import Case, Value, When
+
+from core.analysis.artifacts import detect_artifacts
+from core.models import MeasurementItem
+from core.signals import ChangeReason, notify_measurements_changed
+
+
+class ArtifactService:
+    """
+    Service for detecting and excluding artifact rows.
+    """
+
+    # Channels inspected by the detector
+    CHANNELS = ['hr', 'vo2_ml_min', 'vco2_ml_min', 've', 'rf', 'tv', 'r']
+
+    # Marker of automatic verdicts in MeasurementItem.edit_notes, and
+    # separator from a note that was already there
+    AUTO_PREFIX = 'auto:'
+    AUTO_SEPARATOR = '; '
+
+    @classmethod
+    def clean_measurement(cls, measurement_id: int, apply: bool = True) -> Dict[str, Any]:
+        """
+        Detect artifacts in one measurement and apply verdicts.
+
+        Args:
+            measurement_id: Measurement ID
+            apply: False for a dry run (no UPDATE)
+
+        Returns:
+            {'measurement_id', 'rows', 'flagged', 'excluded', 'restored', 'reasons'}
+        """
+        rows = list(MeasurementItem.objects.filter(
+            measurement_id=measurement_id
+        ).order_by('time_sec').values_list(
+            'id', 'time_sec', 'is_edited', 'use_in_report', 'edit_notes', *cls.CHANNELS
+        ))
+        summary = {
+            'measurement_id': measurement_id, 'rows': len(rows),
+            'flagged': 0, 'excluded': 0, 'restored': 0, 'reasons': Counter(),
+        }
+        if not rows:
+            return summary
+
+        columns = list(zip(*rows))
+        ids = np.array(columns[0], dtype=np.int64)
+        time_sec = np.array(columns[1], dtype=np.float64)
+        is_edited = np.array(columns[2], dtype=bool)
+        use_in_report = np.array(columns[3], dtype=bool)
+        notes = columns[4]
+        channels = {
+            name: np.array(values, dtype=np.float64)
+            for name, values in zip(cls.CHANNELS, columns[5:])
+        }
+
+        result = detect_artifacts(time_sec, channels)
+
+        split = [cls._split_note(n) for n in notes]
+        auto = np.array([verdict is not None for _, verdict in split], dtype=bool)
+        # Editable = untouched by specialist (included, or excluded by us)
+        editable = ~is_edited & (use_in_report | auto)
+
+        to_exclude = editable & result.mask
+        to_restore = editable & ~result.mask & auto
+
+        new_notes = {
+            i: cls._join_note(split[i][0], result.reasons[i])
+            for i in np.flatnonzero(to_exclude)
+        }
+        # Skip rows already carrying the same verdict
+        changed_exclude = [
+            i for i, note in new_notes.items()
+            if use_in_report[i] or notes[i] != note
+        ]
+
+        summary['flagged'] = result.count
+        summary['excluded'] = len(changed_exclude)
+        summary['restored'] = int(to_restore.sum())
+        summary['reasons'] = Counter(
+            part for i in np.flatnonzero(result.mask)
+            for part in result.reasons[i].split(',')
+        )
+
+        if apply and (changed_exclude or summary['restored']):
+            by_note: Dict[str, List[int]] = defaultdict(list)
+            for i in changed_exclude:
+                by_note[new_notes[i]].append(int(ids[i]))
+            for i in np.flatnonzero(to_restore):
+                by_note[split[i][0]].append(int(ids[i]))
+            exclude_ids = [int(ids[i]) for i in changed_exclude]
+            restore_ids = ids[to_restore].tolist()
+
+            with transaction.atomic():
+                MeasurementItem.objects.filter(pk__in=exclude_ids + restore_ids).update(
+                    use_in_report=Case(
+                        When(pk__in=exclude_ids, then=Value(False)),
+                        default=Value(True)
+                    ),
+                    edit_notes=Case(
+                        *[When(pk__in=pks, then=Value(note)) for note, pks in by_note.items()],
+                        default=Value('')
+                    ),
+                )
+                notify_measurements_changed([measurement_id], ChangeReason.ITEMS)
+
+        return summary
+
+    @classmethod
+    def _split_note(cls, note: str):
+        """(note without the verdict, verdict reasons or None)."""
+        if note.startswith(cls.AUTO_PREFIX):
+            return '', note[len(cls.AUTO_PREFIX):]
+        marker = cls.AUTO_SEPARATOR + cls.AUTO_PREFIX
+        position = note.rfind(marker)
+        if position < 0:
+            return note, None
+        return note[:position], note[position + len(marker):]
+
+    @classmethod
+    def _join_note(cls, note: str, reasons: str) -> str:
+        """Note with the verdict appended, cut to fit edit_notes (the note is shortened first)."""
+        limit = MeasurementItem._meta.get_field('edit_notes').max_length
+        verdict = (cls.AUTO_PREFIX + reasons)[:limit]
+        if not note:
+            return verdict
+        room = limit - len(verdict) - len(cls.AUTO_SEPARATOR)
+        if room <= 0:
+            return verdict
+        return note[:room] + cls.AUTO_SEPARATOR + verdict
+
+    @classmethod
+    def clean_archive(
+        cls,
+        measurement_ids: Iterable[int],
+        jobs: int = 1,
+        apply: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Clean many measurements, optionally in parallel processes.
+
+        Args:
+            measurement_ids: Measurement IDs
+            jobs: Worker processes (1 = in-process)
+            apply: False for a dry run
+
+        Returns:
+            Summary per measurement
+        """
+        ids = list(measurement_ids)
+        if jobs <= 1 or len(ids) < 2:
+            return [cls.clean_measurement(mid, apply) for mid in ids]
+
+        # Children must open their own connections, never share the parent's
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(
+                _clean_worker, ids, [apply] * len(ids),
+                chunksize=max(1, len(ids) // (jobs * 4))
+            ))
+
+
+def _clean_worker(measurement_id: int, apply: bool) -> Dict[str, Any]:
+    """Process pool entry point (module-level for pickling)."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    return ArtifactService.clean_measurement(measurement_id, apply)
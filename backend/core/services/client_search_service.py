@@ -0,0 +1,180 @@
+"""
+ClientSearchService - Fuzzy Athlete Search
+
+Finds clients by partial or misspelled names in either script and word
+order, ranked best first (search keys: core/analysis/names.py):
+
+- PostgreSQL with pg_trgm: `search_name %> query` served by a GIN
+  trigram index, ranked by word_similarity. prepare() (run after
+  migrate) creates the extension and the index and fills empty keys.
+- Other databases: an in-process TrigramIndex over Client.search_name.
+  Before each search one aggregate (row count, latest updated_at) is
+  compared with the index: changed rows are re-indexed, a lower count
+  (deletions) rebuilds it; IDs of rows deleted meanwhile are dropped
+  when results are loaded.
+
+match() serves import-time client matching (MeasurementService): the
+best candidate whose whole name is similar enough to the imported one.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (client search)
+    API: GET /api/clients/search/?q=петров (core/views/listing.py)
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, Max
+
+from core.analysis.names import TrigramIndex, search_key, similarity
+from core.models import Client
+
+INDEX_NAME = 'core_client_search_trgm'
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClientMatch:
+    """Search result"""
+    client: Client
+    score: float        # word similarity of the query, 0..1
+
+
+class ClientSearchService:
+    """
+    Service for ranked fuzzy client search.
+    """
+
+    # Minimum word similarity of a result
+    MIN_SCORE = 0.4
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    # Import matching: whole-name similarity needed to reuse a client
+    MATCH_SIMILARITY = 0.8
+
+    _index = TrigramIndex()
+    _stamp = None           # (count, latest updated_at) of the indexed rows
+    _lock = threading.Lock()
+    _trigram_available: Optional[bool] = None
+
+    @classmethod
+    def search(cls, query: str, limit: Optional[int] = None) -> List[ClientMatch]:
+        """
+        Clients matching a name query, best first.
+
+        Args:
+            query: Any part of the name(s), e.g. "петров ив" or "Ivan Petrov"
+            limit: Max results (default DEFAULT_LIMIT, at most MAX_LIMIT)
+        """
+        key = search_key(query)
+        limit = min(max(int(limit or cls.DEFAULT_LIMIT), 1), cls.MAX_LIMIT)
+        if not key:
+            return []
+        if cls._use_trigram_index():
+            return cls._search_postgres(key, limit)
+
+        with cls._lock:
+            cls._sync_index()
+            ranked = cls._index.search(key, limit, cls.MIN_SCORE)
+        clients = Client.objects.in_bulk([client_id for client_id, _ in ranked])
+        return [
+            ClientMatch(client=clients[client_id], score=score)
+            for client_id, score in ranked if client_id in clients
+        ]
+
+    @classmethod
+    def match(cls, name: str) -> Optional[Client]:
+        """
+        Existing client for an imported name, or None.
+
+        Word order, case, ё/е and script are ignored; the middle name
+        may be missing on either side.
+        """
+        key = search_key(name)
+        best, best_similarity = None, cls.MATCH_SIMILARITY
+        for found in cls.search(name, limit=5):
+            client = found.client
+            candidates = (client.search_name, search_key(client.last_name, client.name))
+            value = max(similarity(key, candidate) for candidate in candidates)
+            if value >= best_similarity:
+                best, best_similarity = client, value
+        return best
+
+    @classmethod
+    def prepare(cls) -> None:
+        """
+        Fill empty search keys; on PostgreSQL create pg_trgm and the GIN
+        index (needs CREATE privilege; the index is skipped otherwise).
+        """
+        missing = Client.objects.filter(search_name='').exclude(name='', last_name='', second_name='')
+        batch = []
+        for client in missing.only('name', 'last_name', 'second_name').iterator(chunk_size=1000):
+            client.search_name = search_key(client.last_name, client.name, client.second_name)
+            batch.append(client)
+            if len(batch) >= 1000:
+                Client.objects.bulk_update(batch, ['search_name'])
+                batch = []
+        Client.objects.bulk_update(batch, ['search_name'])
+
+        if connection.vendor != 'postgresql':
+            return
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {Client._meta.db_table} '
+                    'USING gin (search_name gin_trgm_ops)'
+                )
+        except Exception:
+            logger.exception("pg_trgm search index not created, client search uses the in-memory index")
+        cls._trigram_available = None
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _use_trigram_index(cls) -> bool:
+        """PostgreSQL with the pg_trgm extension installed (checked once)."""
+        if connection.vendor != 'postgresql':
+            return False
+        if cls._trigram_available is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                cls._trigram_available = cursor.fetchone() is not None
+        return cls._trigram_available
+
+    @classmethod
+    def _search_postgres(cls, key: str, limit: int) -> List[ClientMatch]:
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Threshold of the index-backed %> operator
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(cls.MIN_SCORE)])
+            clients = list(
+                Client.objects.filter(search_name__trigram_word_similar=key)
+                .annotate(score=TrigramWordSimilarity(key, 'search_name'))
+                .order_by('-score', 'last_name', 'name', 'id')[:limit]
+            )
+        return [ClientMatch(client=client, score=client.score) for client in clients]
+
+    @classmethod
+    def _sync_index(cls) -> None:
+        """Bring the in-memory index up to date (lock held)."""
+        stamp = Client.objects.aggregate(count=Count('id'), changed=Max('updated_at'))
+        stamp = (stamp['count'], stamp['changed'])
+        if stamp == cls._stamp:
+            return
+
+        rows = Client.objects.values_list('id', 'search_name')
+        if cls._stamp is None or stamp[0] < cls._stamp[0]:
+            cls._index = TrigramIndex()
+        elif cls._stamp[1] is not None:
+            rows = rows.filter(updated_at__gte=cls._stamp[1])
+        for client_id, key in rows.iterator(chunk_size=5000):
+            cls._index.add(client_id, key)
+        cls._stamp = stamp
@@ -4,6 +4,10 @@ Comparison Service
 Compares multiple tests of the same client, building comparison tables
 and calculating dynamics across test dates.
 
+Tables and dynamics are cached per (measurement IDs, metric, data
+versions) in ResultCache; any data change bumps the version, so cached
+results are always current.
+
 DOCUMENTATION:
     Spec: implementation_plan.md (Phase 2)
 """
@@ -11,6 +15,8 @@ from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+from core.services.result_cache import ResultCache
+
 
 @dataclass
 class ComparisonColumn:
@@ -36,6 +42,8 @@ class ComparisonService:
     and filters by test type to prevent invalid comparisons.
     """
     
+    cache = ResultCache('comparison')
+    
     @staticmethod
     def get_client_tests(
         client_id: int,
@@ -60,13 +68,14 @@ class ComparisonService:
             qs = qs.filter(test_type=test_type)
         return list(qs.order_by('-measurement_date')[:limit])
     
-    @staticmethod
+    @classmethod
     def build_power_aligned_table(
+        cls,
         measurements: list,
         metric: str = 'hr'
     ) -> Dict[str, Any]:
         """
-        Build comparison table aligned by power levels.
+        Build comparison table aligned by power levels (cached).
         
         Args:
             measurements: List of Measurement objects
@@ -81,7 +90,15 @@ class ComparisonService:
         """
         if not measurements:
             return {'columns': [], 'rows': [], 'metric': metric}
-        
+        key = cls.cache.key('table', [m.id for m in measurements], metric)
+        return dict(cls.cache.get_or_compute(
+            key, lambda: cls._build_power_aligned_table(measurements, metric)
+        ))
+    
+    @staticmethod
+    def _build_power_aligned_table(measurements: list, metric: str) -> Dict[str, Any]:
+        """Uncached build_power_aligned_table."""
+
         # Build columns
         columns = []
         for m in measurements:
@@ -116,6 +133,17 @@ class ComparisonService:
                     all_powers.add(power)
                     data_by_measurement[m.id][power] = sum(values) / len(values)
         
+        # Lactate is compared on the fitted curves (LactateFit), so tests
+        # line up at every stage power within their fitted range
+        if metric == 'lactat':
+            from core.services.lactate_service import LactateService
+            aligned = sorted(all_powers)
+            fits = LactateService.get_fits(m.id for m in measurements)
+            for mid, fit in fits.items():
+                for power, value in zip(aligned, LactateService.evaluate(fit, aligned)):
+                    if value is not None:
+                        data_by_measurement[mid][power] = value
+
         # Build rows
         rows = []
         for power in sorted(all_powers):
@@ -130,13 +158,14 @@ class ComparisonService:
             'metric': metric
         }
     
-    @staticmethod
+    @classmethod
     def calculate_dynamics(
+        cls,
         measurements: list,
         thresholds: bool = True
     ) -> Dict[str, Any]:
         """
-        Calculate dynamics (changes) between consecutive tests.
+        Calculate dynamics (changes) between consecutive tests (cached).
         
         Args:
             measurements: List of Measurement objects (ordered by date)
@@ -152,14 +181,42 @@ class ComparisonService:
         if len(measurements) < 2:
             return {'tests': measurements, 'deltas': [], 'thresholds_deltas': []}
         
+        key = cls.cache.key('dynamics', [m.id for m in measurements])
+        deltas = cls.cache.get_or_compute(key, lambda: cls._calculate_deltas(measurements))
+        return {
+            'tests': measurements,
+            'deltas': deltas
+        }
+    
+    @staticmethod
+    def _calculate_deltas(measurements: list) -> List[Dict[str, Any]]:
+        """Peak deltas between consecutive tests (uncached)."""
+        # Peak values for all tests in one query (trend store),
+        # falling back to item aggregates for tests not yet summarized
+        from core.services.trend_service import TrendService
+        from core.services.lactate_service import LactateService
+        peaks = TrendService.get_peaks(m.id for m in measurements)
+        for m in measurements:
+            if m.id not in peaks:
+                peaks[m.id] = ComparisonService._get_peaks(m)
+        fits = LactateService.get_fits(m.id for m in measurements)
+
+        def marker_delta(prev, curr, name: str) -> Optional[float]:
+            """Change of a lactate marker power (None unless both tests have it)."""
+            if prev.id not in fits or curr.id not in fits:
+                return None
+            before, after = getattr(fits[prev.id], name), getattr(fits[curr.id], name)
+            if before is None or after is None:
+                return None
+            return round(after - before, 1)
+        
         deltas = []
         for i in range(1, len(measurements)):
             prev = measurements[i - 1]
             curr = measurements[i]
             
-            # Calculate peak values
-            prev_peaks = ComparisonService._get_peaks(prev)
-            curr_peaks = ComparisonService._get_peaks(curr)
+            prev_peaks = peaks[prev.id]
+            curr_peaks = peaks[curr.id]
             
             delta = {
                 'from': prev.measurement_date,
@@ -168,13 +225,13 @@ class ComparisonService:
                 'vo2max_delta': (curr_peaks.get('vo2max', 0) or 0) - (prev_peaks.get('vo2max', 0) or 0),
                 'hrmax_delta': (curr_peaks.get('hrmax', 0) or 0) - (prev_peaks.get('hrmax', 0) or 0),
                 'power_delta': (curr_peaks.get('power', 0) or 0) - (prev_peaks.get('power', 0) or 0),
+                'lactate_2mmol_delta': marker_delta(prev, curr, 'power_2mmol'),
+                'lactate_4mmol_delta': marker_delta(prev, curr, 'power_4mmol'),
+                'dmax_delta': marker_delta(prev, curr, 'power_dmax'),
             }
             deltas.append(delta)
         
-        return {
-            'tests': measurements,
-            'deltas': deltas
-        }
+        return deltas
     
     @staticmethod
     def _get_peaks(measurement) -> Dict[str, Any]:
@@ -0,0 +1,272 @@
+"""
+ExportService - Streaming Bulk Export of Measurement Series
+
+Exports MeasurementItem rows of many measurements (a cohort, a client's
+history) for offline analysis without loading them through the ORM:
+
+- CSV: on PostgreSQL every measurement is one COPY ... TO STDOUT (rows
+  are formatted by the server, no Python objects per row); other
+  backends iterate values_list() with a server-side cursor where
+  available and write through csv.writer. Chunks are yielded as they
+  fill, so memory is bounded by one measurement (COPY) or
+  CHUNK_BYTES (iterator) whatever the cohort size.
+- Parquet (optional pyarrow): one row group per measurement, written
+  to the output as soon as the measurement is read. On PostgreSQL the
+  measurement's COPY output is parsed by pyarrow.csv; elsewhere rows are
+  converted to column arrays FETCH_ROWS at a time (record batches), so
+  per-row tuples never outlive one slice.
+
+Rows are ordered by measurement, then time. Columns: EXPORT_COLUMNS;
+use_in_report is written as 1/0 and only with include_excluded.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 3)
+    Command: python manage.py export_measurements cohort.parquet --test-type CYCLING
+    API: GET /api/exports/?client=12&format=csv (core/views/export.py)
+"""
+import csv
+import io
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+
+import numpy as np
+from django.db import connection
+
+from core.models import Measurement, MeasurementItem
+
+FORMATS = ('csv', 'parquet')
+
+
+class ExportService:
+    """
+    Service streaming measurement series to CSV / Parquet.
+    """
+
+    EXPORT_COLUMNS = [
+        'measurement_id', 'time_sec', 'rated_power', 'power', 'hr', 'vo2_ml_min',
+        'vo2_ml_kg_min', 'vco2_ml_min', 'r', 've', 'rf', 'tv', 've_vo2', 've_vco2',
+        'o2_pulse', 'feo2', 'rpm', 'hrv', 'sd1', 'sd2', 'lactat', 'temp', 'hum',
+    ]
+
+    # Iterator fallback: rows fetched per round trip, bytes per CSV chunk
+    FETCH_ROWS = 5000
+    CHUNK_BYTES = 1 << 20
+
+    @staticmethod
+    def select(
+        measurement_ids: Optional[Sequence[int]] = None,
+        client_id: Optional[int] = None,
+        test_type: Optional[str] = None
+    ) -> List[int]:
+        """Measurement IDs matching all given filters, oldest test first."""
+        qs = Measurement.objects.all()
+        if measurement_ids:
+            qs = qs.filter(pk__in=measurement_ids)
+        if client_id is not None:
+            qs = qs.filter(client_id=client_id)
+        if test_type:
+            qs = qs.filter(test_type=test_type)
+        return list(qs.order_by('measurement_date', 'pk').values_list('pk', flat=True))
+
+    @classmethod
+    def columns(cls, include_excluded: bool = False) -> List[str]:
+        return cls.EXPORT_COLUMNS + (['use_in_report'] if include_excluded else [])
+
+    # ------------------------------------------------------------------
+    # CSV
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def iter_csv(cls, measurement_ids: Sequence[int], include_excluded: bool = False) -> Iterator[bytes]:
+        """CSV (header + rows, UTF-8) of the measurements, chunk by chunk."""
+        header = ','.join(cls.columns(include_excluded)) + '\n'
+        yield header.encode('utf-8')
+        if connection.vendor == 'postgresql':
+            yield from cls._iter_copy(measurement_ids, include_excluded)
+        else:
+            yield from cls._iter_rows_csv(measurement_ids, include_excluded)
+
+    @classmethod
+    def write_csv(cls, measurement_ids: Sequence[int], out: BinaryIO, include_excluded: bool = False) -> None:
+        for chunk in cls.iter_csv(measurement_ids, include_excluded):
+            out.write(chunk)
+
+    @classmethod
+    def _iter_copy(cls, measurement_ids: Sequence[int], include_excluded: bool) -> Iterator[bytes]:
+        """One COPY TO STDOUT per measurement (psycopg2 copy_expert)."""
+        query = cls._copy_query(include_excluded)
+        buffer = io.BytesIO()
+        with connection.cursor() as cursor:
+            for measurement_id in measurement_ids:
+                cursor.copy_expert(query % int(measurement_id), buffer)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    @classmethod
+    def _copy_query(cls, include_excluded: bool) -> str:
+        """COPY of one measurement's rows as CSV; %d takes the measurement ID."""
+        quote = connection.ops.quote_name
+        select = [quote(c) for c in cls.EXPORT_COLUMNS]
+        where = f"{quote('measurement_id')} = %d"
+        if include_excluded:
+            select.append(f"{quote('use_in_report')}::int")
+        else:
+            where += f" AND {quote('use_in_report')}"
+        return (
+            f"COPY (SELECT {', '.join(select)} FROM {quote(MeasurementItem._meta.db_table)} "
+            f"WHERE {where} ORDER BY {quote('time_sec')}) TO STDOUT WITH (FORMAT csv)"
+        )
+
+    @classmethod
+    def _iter_rows_csv(cls, measurement_ids: Sequence[int], include_excluded: bool) -> Iterator[bytes]:
+        """values_list() iterator written through csv.writer in CHUNK_BYTES pieces."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for measurement_id in measurement_ids:
+            for row in cls._rows(measurement_id, include_excluded).iterator(chunk_size=cls.FETCH_ROWS):
+                if include_excluded:
+                    row = (*row[:-1], int(row[-1]))
+                writer.writerow(row)
+                if buffer.tell() >= cls.CHUNK_BYTES:
+                    yield buffer.getvalue().encode('utf-8')
+                    buffer.seek(0)
+                    buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    @classmethod
+    def _rows(cls, measurement_id: int, include_excluded: bool):
+        items = MeasurementItem.objects.filter(measurement_id=measurement_id)
+        if not include_excluded:
+            items = items.filter(use_in_report=True)
+        return items.order_by('time_sec').values_list(*cls.columns(include_excluded))
+
+    # ------------------------------------------------------------------
+    # Parquet
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def iter_parquet(cls, measurement_ids: Sequence[int], include_excluded: bool = False) -> Iterator[bytes]:
+        """
+        Parquet file of the measurements, yielded after each row group.
+
+        Raises:
+            ImportError: pyarrow not installed (on call, before streaming)
+        """
+        sink = _ChunkSink()
+        writer = cls._parquet_writer(sink, include_excluded)
+
+        def chunks() -> Iterator[bytes]:
+            with writer:
+                for measurement_id in measurement_ids:
+                    writer.append(measurement_id)
+                    yield sink.drain()
+            yield sink.drain()
+        return chunks()
+
+    @classmethod
+    def write_parquet(cls, measurement_ids: Sequence[int], out: BinaryIO, include_excluded: bool = False) -> None:
+        """
+        Raises:
+            ImportError: pyarrow not installed
+        """
+        with cls._parquet_writer(out, include_excluded) as writer:
+            for measurement_id in measurement_ids:
+                writer.append(measurement_id)
+
+    @classmethod
+    def _parquet_writer(cls, out: BinaryIO, include_excluded: bool) -> '_ParquetWriter':
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError(
+                "pyarrow is required for Parquet export. Install with: pip install pyarrow"
+            ) from exc
+
+        names = cls.columns(include_excluded)
+        # Channels as nullable float64, like the CSV columns
+        integers = {'measurement_id': pa.int64(), 'use_in_report': pa.int8()}
+        schema = pa.schema([(name, integers.get(name, pa.float64())) for name in names])
+
+        def from_copy(measurement_id: int):
+            buffer = io.BytesIO()
+            with connection.cursor() as cursor:
+                cursor.copy_expert(cls._copy_query(include_excluded) % int(measurement_id), buffer)
+            if not buffer.tell():
+                return None
+            buffer.seek(0)
+            return pa_csv.read_csv(
+                buffer,
+                read_options=pa_csv.ReadOptions(column_names=names),
+                convert_options=pa_csv.ConvertOptions(column_types=schema),
+            )
+
+        def to_batch(rows: list):
+            block = np.array(rows, dtype=np.float64)   # None -> NaN
+            arrays = []
+            for index, name in enumerate(names):
+                column = block[:, index]
+                if name in integers:
+                    arrays.append(pa.array(column.astype(np.int64), type=integers[name]))
+                else:
+                    arrays.append(pa.array(column, mask=np.isnan(column)))
+            return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+        def from_rows(measurement_id: int):
+            rows = cls._rows(measurement_id, include_excluded).iterator(chunk_size=cls.FETCH_ROWS)
+            batches = []
+            while True:
+                chunk = list(islice(rows, cls.FETCH_ROWS))
+                if not chunk:
+                    break
+                batches.append(to_batch(chunk))
+            return pa.Table.from_batches(batches, schema=schema) if batches else None
+
+        to_table = from_copy if connection.vendor == 'postgresql' else from_rows
+        return _ParquetWriter(pq.ParquetWriter(out, schema), to_table)
+
+
+class _ParquetWriter:
+    """pyarrow ParquetWriter writing one row group per measurement; closes on exit."""
+
+    def __init__(self, writer, to_table):
+        self._writer, self._to_table = writer, to_table
+
+    def __enter__(self) -> '_ParquetWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._writer.close()
+
+    def append(self, measurement_id: int) -> None:
+        table = self._to_table(measurement_id)
+        if table is not None:
+            self._writer.write_table(table, row_group_size=table.num_rows)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file whose content is taken out with drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b''.join(self._chunks), []
+        return data
@@ -0,0 +1,274 @@
+"""
+GeneratedReportService - Incremental Report Regeneration
+
+Stores generated reports with their dependencies (GeneratedReport) and
+keeps them fresh without nightly full rebuilds:
+
+- generate(): render a report, write it to disk, record dependencies
+  (ReportService.CLIENT_FIELDS / THRESHOLD_TYPES for the template)
+- mark_dirty(): called from core.signals on measurements_changed; flags
+  only reports whose recorded inputs were touched (threshold type,
+  client field, items; item edits reach chart-less templates only if
+  they changed the peaks)
+- regenerate_dirty(): rebuild flagged reports in a process pool; a
+  report edited again during regeneration stays dirty (every edit moves
+  dirtied_at, also on reports that are dirty already)
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 2)
+    Command: python manage.py regenerate_reports --watch
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import GeneratedReport, Measurement
+from core.reports.generator import BatchJob, ReportGenerator
+from core.services.report_service import ReportService
+from core.signals import ChangeReason
+
+
+class GeneratedReportService:
+    """
+    Service for stored reports and their incremental regeneration.
+    """
+
+    # Reports regenerated per batch
+    BATCH_SIZE = 50
+
+    @staticmethod
+    def output_dir() -> Path:
+        """Directory for generated report files (settings.GENERATED_REPORTS_DIR)."""
+        return Path(getattr(settings, 'GENERATED_REPORTS_DIR', settings.BASE_DIR / 'generated_reports'))
+
+    @classmethod
+    def generate(
+        cls,
+        measurement_id: int,
+        template: str = 'default_report',
+        compare_with: Optional[int] = None,
+        pdf: bool = True
+    ) -> GeneratedReport:
+        """
+        Render a report now and record it with its dependencies.
+
+        Raises:
+            Measurement.DoesNotExist
+            ImportError: PDF requested without WeasyPrint
+        """
+        report, _ = GeneratedReport.objects.get_or_create(
+            measurement_id=measurement_id,
+            compare_with_id=compare_with,
+            template=template,
+            pdf=pdf,
+            defaults={'output_path': cls._output_path(measurement_id, template, compare_with, pdf)}
+        )
+        cls._set_dependencies(report)
+
+        started = timezone.now()
+        data = ReportService.build(template, measurement_id, compare_with)
+        generator = ReportGenerator()
+        Path(report.output_path).parent.mkdir(parents=True, exist_ok=True)
+        if pdf:
+            generator.generate_pdf(data, template, report.output_path)
+        else:
+            generator.generate_html_file(data, template, report.output_path)
+
+        cls._mark_generated([report.pk], started)
+        report.refresh_from_db()
+        return report
+
+    @classmethod
+    def mark_dirty(
+        cls,
+        measurement_ids: Iterable[int],
+        reason: str,
+        threshold_type: Optional[str] = None,
+        client_fields: Optional[Iterable[str]] = None,
+        peaks_changed: bool = True
+    ) -> int:
+        """
+        Flag reports depending on changed measurements.
+
+        Args:
+            measurement_ids: Changed measurements
+            reason: ChangeReason value
+            threshold_type: Changed threshold type (THRESHOLDS)
+            client_fields: Changed client fields (CLIENT; None = unknown, all)
+            peaks_changed: The item edit changed peaks (ITEMS; False flags
+                only reports reading items directly)
+
+        Returns:
+            Number of reports newly marked dirty
+        """
+        # Already dirty reports are matched too: their dirtied_at must move
+        # past a regeneration that may be running (see _mark_generated)
+        candidates = GeneratedReport.objects.filter(
+            depends_on__in=list(measurement_ids)
+        ).values_list('pk', 'threshold_types', 'client_fields', 'uses_items').distinct()
+
+        changed_fields = set(client_fields) if client_fields is not None else None
+        dirty = []
+        for pk, types, fields, uses_items in candidates:
+            if reason == ChangeReason.THRESHOLDS:
+                affected = threshold_type is None or threshold_type in types
+            elif reason == ChangeReason.CLIENT:
+                affected = changed_fields is None or bool(changed_fields & set(fields))
+            elif reason == ChangeReason.ITEMS:
+                affected = uses_items or peaks_changed
+            else:
+                affected = True
+            if affected:
+                dirty.append(pk)
+
+        if not dirty:
+            return 0
+        now = timezone.now()
+        with transaction.atomic():
+            marked = GeneratedReport.objects.filter(pk__in=dirty, is_dirty=False).update(
+                is_dirty=True, dirty_reason=reason, dirtied_at=now
+            )
+            GeneratedReport.objects.filter(pk__in=dirty).update(dirtied_at=now)
+        return marked
+
+    @classmethod
+    def regenerate_dirty(cls, workers: int = 1, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rebuild dirty reports (oldest change first).
+
+        Returns:
+            [{'report_id', 'output_path', 'ok', 'seconds', 'error'}, ...]
+        """
+        dirty = GeneratedReport.objects.filter(is_dirty=True).order_by('dirtied_at')
+        reports = list(dirty[:limit] if limit else dirty)
+        generator = ReportGenerator()
+        summaries = []
+
+        for start in range(0, len(reports), cls.BATCH_SIZE):
+            batch = reports[start:start + cls.BATCH_SIZE]
+            started = timezone.now()
+
+            jobs, built = [], []
+            for report in batch:
+                try:
+                    data = ReportService.build(report.template, report.measurement_id, report.compare_with_id)
+                except Measurement.DoesNotExist as exc:
+                    cls._record_error(report, str(exc))
+                    summaries.append(cls._summary(report, False, 0.0, str(exc)))
+                    continue
+                Path(report.output_path).parent.mkdir(parents=True, exist_ok=True)
+                jobs.append(BatchJob(data=data, output_path=report.output_path, template=report.template))
+                built.append(report)
+
+            # PDF and HTML reports go to separate pool runs
+            for pdf in (True, False):
+                selected = [(r, j) for r, j in zip(built, jobs) if r.pdf == pdf]
+                if not selected:
+                    continue
+                results = generator.generate_batch([j for _, j in selected], workers=workers, pdf=pdf)
+                ok = []
+                for (report, _), result in zip(selected, results):
+                    if result.ok:
+                        ok.append(report.pk)
+                    else:
+                        cls._record_error(report, result.error)
+                    summaries.append(cls._summary(report, result.ok, result.seconds, result.error))
+                cls._mark_generated(ok, started)
+
+        return summaries
+
+    @classmethod
+    def on_measurements_changed(
+        cls,
+        measurement_ids: List[int],
+        reason: str,
+        previous: Optional[Dict[str, Any]] = None,
+        peaks_changed: Optional[Iterable[int]] = None
+    ) -> None:
+        """
+        React to data changes (see core.signals).
+
+        previous carries the changed threshold type (THRESHOLDS) or the
+        client values before the edit (CLIENT). peaks_changed lists the
+        measurements whose peaks an ITEMS edit changed (None = unknown, all).
+        """
+        if reason == ChangeReason.IMPORT:
+            return  # new measurements have no reports yet
+        previous = previous or {}
+
+        if reason == ChangeReason.THRESHOLDS:
+            cls.mark_dirty(measurement_ids, reason, threshold_type=previous.get('threshold_type'))
+        elif reason == ChangeReason.CLIENT:
+            cls.mark_dirty(measurement_ids, reason, client_fields=cls._changed_client_fields(
+                measurement_ids, previous
+            ))
+        elif reason == ChangeReason.ITEMS and peaks_changed is not None:
+            changed = set(peaks_changed)
+            cls.mark_dirty([i for i in measurement_ids if i in changed], reason)
+            cls.mark_dirty([i for i in measurement_ids if i not in changed], reason, peaks_changed=False)
+        else:
+            cls.mark_dirty(measurement_ids, reason)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _output_path(cls, measurement_id: int, template: str, compare_with: Optional[int], pdf: bool) -> str:
+        """Default file path of a report."""
+        suffix = f"_vs{compare_with}" if compare_with else ''
+        extension = 'pdf' if pdf else 'html'
+        return str(cls.output_dir() / f"{template}_{measurement_id}{suffix}.{extension}")
+
+    @staticmethod
+    def _set_dependencies(report: GeneratedReport) -> None:
+        """Record what the report's template reads."""
+        report.threshold_types = ReportService.THRESHOLD_TYPES.get(report.template, [])
+        report.client_fields = ReportService.CLIENT_FIELDS.get(report.template, [])
+        report.uses_items = ReportService.uses_items(report.template)
+        report.save(update_fields=['threshold_types', 'client_fields', 'uses_items'])
+        report.depends_on.set([
+            mid for mid in (report.measurement_id, report.compare_with_id) if mid
+        ])
+
+    @staticmethod
+    def _mark_generated(report_ids: List[int], started) -> None:
+        """Clear dirty flag unless the report was dirtied again meanwhile."""
+        if not report_ids:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            GeneratedReport.objects.filter(pk__in=report_ids).update(generated_at=now, error='')
+            GeneratedReport.objects.filter(pk__in=report_ids).exclude(dirtied_at__gt=started).update(
+                is_dirty=False, dirty_reason=''
+            )
+
+    @staticmethod
+    def _record_error(report: GeneratedReport, error: str) -> None:
+        """Keep report dirty and remember the failure."""
+        GeneratedReport.objects.filter(pk=report.pk).update(error=error or '')
+
+    @staticmethod
+    def _summary(report: GeneratedReport, ok: bool, seconds: float, error: Optional[str]) -> Dict[str, Any]:
+        return {
+            'report_id': report.pk,
+            'output_path': report.output_path,
+            'ok': ok,
+            'seconds': seconds,
+            'error': error,
+        }
+
+    @staticmethod
+    def _changed_client_fields(measurement_ids: List[int], previous: Dict[str, Any]) -> Optional[List[str]]:
+        """Client fields differing from the pre-edit values (None if unknown)."""
+        if not previous:
+            return None
+        current = Measurement.objects.filter(pk__in=measurement_ids).values(
+            *[f'client__{name}' for name in previous]
+        ).first()
+        if current is None:
+            return None
+        return [name for name in previous if current[f'client__{name}'] != previous[name]]
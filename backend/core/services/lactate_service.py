@@ -0,0 +1,183 @@
+"""
+LactateService - Cached Lactate Curve Fits
+
+Collects manually entered lactate values (MeasurementItem.lactat per
+stage, Threshold.lactate) for many measurements, fits all stale curves
+in one vectorized batch and persists the result (LactateFit).
+
+A fit is keyed by a hash of its (power, lactate) points, so it is reused
+until a value is edited, added or excluded via use_in_report. Fits are
+refreshed on write (measurements_changed: import, item and threshold
+edits, core/signals.py) and by the fit_lactate command; reports and
+comparisons only read them (get_fits), so a GET never writes.
+
+DOCUMENTATION:
+    Spec: Research/03_threshold_calculation_algorithms.md
+"""
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.analysis.lactate import fit_lactate_curves, evaluate_curve, LactateCurveFit
+from core.models import LactateFit, MeasurementItem, Threshold
+
+# [(power, lactate), ...] sorted by power
+Points = List[Tuple[float, float]]
+
+
+class LactateService:
+    """
+    Service for batched, cached lactate curve fitting.
+    """
+
+    # Measurements fitted per batch in fit_all()
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def get_fits(measurement_ids: Iterable[int]) -> Dict[int, LactateFit]:
+        """
+        Stored fits (one query, no refitting).
+
+        Returns:
+            {measurement_id: LactateFit} for measurements with a fit
+        """
+        fits = LactateFit.objects.filter(measurement_id__in=list(measurement_ids))
+        return {fit.measurement_id: fit for fit in fits}
+
+    @classmethod
+    def refresh(
+        cls,
+        measurement_ids: Iterable[int],
+        force: bool = False
+    ) -> Dict[int, LactateFit]:
+        """
+        Bring stored fits up to date, refitting only measurements whose
+        lactate values changed since the stored fit.
+
+        Queries: stage points (2), stored fits (1), one bulk upsert
+        if anything was stale.
+
+        Args:
+            measurement_ids: Measurement IDs
+            force: Refit even if hashes match
+
+        Returns:
+            {measurement_id: LactateFit} for measurements with lactate values
+        """
+        ids = list(measurement_ids)
+        points = cls.load_points(ids)
+        hashes = {mid: cls._hash(p) for mid, p in points.items()}
+
+        stored = {fit.measurement_id: fit for fit in LactateFit.objects.filter(measurement_id__in=ids)}
+        stale = [
+            mid for mid in points
+            if force or mid not in stored or stored[mid].source_hash != hashes[mid]
+        ]
+
+        if stale:
+            curves = [
+                ([p for p, _ in points[mid]], [la for _, la in points[mid]])
+                for mid in stale
+            ]
+            fitted = fit_lactate_curves(curves)
+            rows = [
+                cls._to_model(mid, hashes[mid], fit)
+                for mid, fit in zip(stale, fitted)
+            ]
+            LactateFit.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['measurement'],
+                update_fields=[
+                    'source_hash', 'n_points', 'coefficients', 'power_min',
+                    'power_max', 'r2', 'power_2mmol', 'power_4mmol',
+                    'power_dmax', 'updated_at',
+                ]
+            )
+            stored.update({row.measurement_id: row for row in rows})
+
+        # Lactate values removed entirely: drop stale fits
+        orphaned = [mid for mid in stored if mid not in points]
+        if orphaned:
+            LactateFit.objects.filter(measurement_id__in=orphaned).delete()
+
+        return {mid: stored[mid] for mid in points}
+
+    @classmethod
+    def fit_all(cls, measurement_ids: Iterable[int], force: bool = False) -> int:
+        """
+        Refresh fits for many measurements in batches of BATCH_SIZE.
+
+        Returns:
+            Number of measurements with lactate values
+        """
+        ids = list(measurement_ids)
+        total = 0
+        for start in range(0, len(ids), cls.BATCH_SIZE):
+            total += len(cls.refresh(ids[start:start + cls.BATCH_SIZE], force=force))
+        return total
+
+    @staticmethod
+    def load_points(measurement_ids: List[int]) -> Dict[int, Points]:
+        """
+        Stage lactate points per measurement (two queries).
+
+        Several values at the same power are averaged. Items excluded
+        with use_in_report=False are ignored.
+        """
+        by_power: Dict[int, Dict[float, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+        items = MeasurementItem.objects.filter(
+            measurement_id__in=measurement_ids,
+            lactat__isnull=False,
+            use_in_report=True
+        ).values_list('measurement_id', 'rated_power', 'power', 'lactat')
+        for mid, rated_power, power, lactate in items:
+            stage_power = rated_power or power
+            if stage_power:
+                by_power[mid][float(round(stage_power))].append(lactate)
+
+        thresholds = Threshold.objects.filter(
+            measurement_id__in=measurement_ids,
+            lactate__isnull=False
+        ).values_list('measurement_id', 'power', 'lactate')
+        for mid, power, lactate in thresholds:
+            by_power[mid][float(power)].append(lactate)
+
+        return {
+            mid: sorted((p, sum(v) / len(v)) for p, v in stages.items())
+            for mid, stages in by_power.items()
+        }
+
+    @staticmethod
+    def evaluate(fit: LactateFit, powers: Iterable[float]) -> List[Optional[float]]:
+        """Fitted lactate at given powers (None outside fitted range)."""
+        curve = LactateCurveFit(
+            n_points=fit.n_points,
+            coefficients=fit.coefficients,
+            power_min=fit.power_min,
+            power_max=fit.power_max,
+        )
+        return evaluate_curve(curve, list(powers))
+
+    @staticmethod
+    def _hash(points: Points) -> str:
+        """Stable hash of stage points."""
+        payload = ';'.join(f"{p:.1f}:{la:.3f}" for p, la in points)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _to_model(measurement_id: int, source_hash: str, fit: LactateCurveFit) -> LactateFit:
+        """Build LactateFit row from computed fit."""
+        return LactateFit(
+            measurement_id=measurement_id,
+            source_hash=source_hash,
+            n_points=fit.n_points,
+            coefficients=fit.coefficients,
+            power_min=fit.power_min,
+            power_max=fit.power_max,
+            r2=fit.r2,
+            power_2mmol=fit.fixed_powers.get(2.0),
+            power_4mmol=fit.fixed_powers.get(4.0),
+            power_dmax=fit.dmax_power,
+        )
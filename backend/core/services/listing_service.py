@@ -0,0 +1,162 @@
+"""
+ListingService - Keyset-Paginated Client and Test Lists
+
+OFFSET pagination reads and discards every row before the page, so deep
+pages of a large archive get slower and slower. Lists here seek instead:
+the cursor holds the sort key of the last row returned, and the next
+page is "rows after this key" - one row-value comparison such as
+(last_name, name, id) > (%s, %s, %s) - read straight from a composite index:
+- clients: (last_name, name, id)               Client index
+- tests:   (measurement_date DESC, measurement) TrendPoint indexes,
+           optionally within one client
+
+Test rows come from the trend store (TrendPoint), so no page touches
+MeasurementItem. Cursors are opaque URL-safe strings.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 3)
+    API: GET /api/clients/, GET /api/measurements/ (core/views/listing.py)
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.db import connection
+from django.db.models import BooleanField, Count, F, Max, QuerySet
+from django.db.models.expressions import RawSQL
+
+from core.models import Client, TrendPoint
+from core.services.trend_service import TrendService
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated list"""
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None    # None on the last page
+
+
+class ListingService:
+    """
+    Service for seek-paginated lists.
+    """
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 500
+
+    CLIENT_FIELDS = ['id', 'last_name', 'name', 'second_name', 'gender', 'birthdate']
+    MEASUREMENT_FIELDS = TrendService.HISTORY_FIELDS
+
+    @classmethod
+    def list_clients(cls, cursor: Optional[str] = None, limit: Optional[int] = None) -> Page:
+        """
+        Clients in Client.Meta.ordering (last name, name), with test
+        count and last test date per client.
+
+        Raises:
+            ValueError: Malformed cursor
+        """
+        limit = cls._limit(limit)
+        qs = Client.objects.order_by('last_name', 'name', 'id')
+        if cursor:
+            last_name, name, pk = cls._decode(cursor)
+            qs = cls._after(qs, ['last_name', 'name', 'id'], [last_name, name, pk])
+        rows = list(qs.values(*cls.CLIENT_FIELDS)[:limit + 1])
+        page = cls._page(rows, limit, lambda r: [r['last_name'], r['name'], r['id']])
+
+        summaries = {
+            s['client_id']: s for s in TrendPoint.objects.filter(
+                client_id__in=[r['id'] for r in page.rows]
+            ).values('client_id').annotate(tests=Count('id'), last_test=Max('measurement_date'))
+        }
+        for row in page.rows:
+            summary = summaries.get(row['id'], {})
+            row['tests'] = summary.get('tests', 0)
+            row['last_test'] = summary.get('last_test')
+        return page
+
+    @classmethod
+    def list_measurements(
+        cls,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        client_id: Optional[int] = None,
+        test_type: Optional[str] = None
+    ) -> Page:
+        """
+        Tests newest first (ties by measurement id), from the trend store.
+
+        Raises:
+            ValueError: Malformed cursor
+        """
+        limit = cls._limit(limit)
+        qs = TrendPoint.objects.order_by('-measurement_date', '-measurement_id')
+        if client_id is not None:
+            qs = qs.filter(client_id=client_id)
+        if test_type:
+            qs = qs.filter(test_type=test_type)
+        if cursor:
+            date, pk = cls._decode(cursor)
+            date = datetime.fromisoformat(str(date))
+            qs = cls._after(qs, ['measurement_date', 'measurement_id'], [date, pk], descending=True)
+        rows = list(qs.values(
+            *cls.MEASUREMENT_FIELDS,
+            client_last_name=F('client__last_name'),
+            client_name=F('client__name')
+        )[:limit + 1])
+        return cls._page(rows, limit, lambda r: [r['measurement_date'].isoformat(), r['measurement_id']])
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _limit(cls, limit: Optional[int]) -> int:
+        return min(max(int(limit or cls.DEFAULT_LIMIT), 1), cls.MAX_LIMIT)
+
+    @staticmethod
+    def _after(qs: QuerySet, columns: List[str], key: List[Any], descending: bool = False) -> QuerySet:
+        """
+        Rows past a cursor key in (columns) order, as one row-value
+        comparison: (a, b, c) > (%s, %s, %s). The composite index serves
+        it as a single range scan, unlike an OR chain of per-column
+        conditions; the redundant bound on the leading column keeps the
+        seek for planners that do not use row values for index ranges.
+        """
+        model = qs.model
+        quote = connection.ops.quote_name
+        fields = [model._meta.get_field(name) for name in columns]
+        lhs = ', '.join(f"{quote(model._meta.db_table)}.{quote(f.column)}" for f in fields)
+        params = [f.get_db_prep_value(value, connection) for f, value in zip(fields, key)]
+        operator = '<' if descending else '>'
+        placeholders = ', '.join(['%s'] * len(fields))
+        leading = {f"{columns[0]}__{'lte' if descending else 'gte'}": key[0]}
+        return qs.filter(
+            RawSQL(f"({lhs}) {operator} ({placeholders})", params, output_field=BooleanField()),
+            **leading
+        )
+
+    @classmethod
+    def _page(cls, rows: List[Dict[str, Any]], limit: int, key) -> Page:
+        """Trim the look-ahead row and build the cursor from the last kept row."""
+        if len(rows) <= limit:
+            return Page(rows=rows)
+        rows = rows[:limit]
+        return Page(rows=rows, next_cursor=cls._encode(key(rows[-1])))
+
+    @staticmethod
+    def _encode(key: List[Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decode(cursor: str) -> List[Any]:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if not isinstance(key, list):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return key
@@ -0,0 +1,337 @@
+"""
+LiveService - Streaming Ingest of a Test in Progress
+
+Samples arrive as dataMap entries ([time_sec, {"O2_Flow": ..., "HR": ...}])
+while the athlete is still on the ergometer. A LiveSession per
+measurement:
+- parses entries with JsonParser.parse_entry
+- buffers them and writes small batches (MeasurementService item
+  writer, derived channels included) every FLUSH_SIZE samples or
+  FLUSH_SEC seconds
+- keeps running aggregates in memory: averages of the current stage
+  (5 W power step, or STAGE_SEC window without power) and peaks
+- pushes one update per batch to subscribers: new points reduced to at
+  most PUSH_POINTS (minmax), plus stage and peaks
+
+Sessions live in process memory: ingest and subscribers of one test
+must reach the same server process. finish() flushes the rest, sets the
+protocol parameters and announces the measurement like a file import.
+A session that receives no samples for IDLE_TIMEOUT_SEC (the ingest
+client went away without finishing) is finished by expire_idle(), run
+on every session lookup and by idle event streams.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 3, live dashboard)
+    API: /api/live/ (core/views/live.py)
+    Simulator: python manage.py simulate_live test.json --speed 10
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.db.models import F
+from django.utils import timezone
+
+from core.analysis.derived import fill_derived_channels, items_to_columns
+from core.analysis.downsample import downsample_indices
+from core.models import Client, Measurement
+from core.parsers.base import ParsedItem
+from core.parsers.json_parser import JsonParser
+from core.services.measurement_service import MeasurementService
+from core.signals import ChangeReason, notify_measurements_changed
+
+# Channels pushed to subscribers and aggregated per stage
+LIVE_CHANNELS = ['vo2_ml_min', 'vo2_ml_kg_min', 'hr', 'power', 've', 'r']
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSession:
+    """
+    In-memory state of one test being recorded.
+    """
+
+    FLUSH_SIZE = 20
+    FLUSH_SEC = 2.0
+    PUSH_POINTS = 50
+    STAGE_SEC = 60
+    SUBSCRIBER_QUEUE = 100
+
+    def __init__(self, measurement: Measurement, weight: Optional[float]):
+        self.measurement = measurement
+        self.weight = weight
+        self.finished = False
+        self.item_count = 0
+
+        self._parser = JsonParser()
+        self._lock = threading.Lock()
+        self._pending: List[ParsedItem] = []
+        self._last_flush = time.monotonic()
+        self.last_activity = time.monotonic()       # last start or append
+        self._subscribers: List[Tuple[queue.Queue, Optional[Callable[[], None]]]] = []
+
+        # Running aggregates
+        self._stage_key: Optional[float] = None
+        self._stage_sums: Dict[str, float] = {}
+        self._stage_counts: Dict[str, int] = {}
+        self._stage_start: Optional[float] = None
+        self.peaks: Dict[str, Optional[float]] = {'vo2max': None, 'hrmax': None, 'power': None}
+        self._protocol_items: List[ParsedItem] = []   # one per distinct 5 W power
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def append(self, entries: Iterable[list]) -> int:
+        """
+        Add dataMap entries; writes a batch when one is due.
+
+        Returns:
+            Number of entries accepted (malformed ones are skipped)
+        """
+        accepted = 0
+        with self._lock:
+            if self.finished:
+                raise ValueError(f"Live session {self.measurement.pk} is finished")
+            self.last_activity = time.monotonic()
+            for entry in entries:
+                item = self._parser.parse_entry(entry)
+                if item is None:
+                    continue
+                self._pending.append(item)
+                accepted += 1
+                self.last_activity = time.monotonic()
+                if self._due():
+                    self._flush()
+        return accepted
+
+    def flush(self) -> None:
+        """Write buffered samples now."""
+        with self._lock:
+            self._flush()
+
+    def finish(self) -> int:
+        """Write the rest, store protocol parameters and close. Returns item count."""
+        with self._lock:
+            self._flush()
+            self.finished = True
+            start_power, power_step = MeasurementService._detect_protocol(self._protocol_items)
+            Measurement.objects.filter(pk=self.measurement.pk).update(
+                start_power=start_power, power_step=power_step
+            )
+            self._publish({'type': 'finished', 'items': self.item_count})
+        notify_measurements_changed([self.measurement.pk], ChangeReason.IMPORT)
+        return self.item_count
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, notify: Optional[Callable[[], None]] = None) -> queue.Queue:
+        """
+        Queue receiving update dicts; starts with the current state.
+
+        Args:
+            notify: Called (from the publishing thread) after each update
+                    is queued, e.g. to wake an asyncio consumer
+        """
+        q = queue.Queue(maxsize=self.SUBSCRIBER_QUEUE)
+        with self._lock:
+            q.put(self._state('state'))
+            if self.finished:
+                q.put({'type': 'finished', 'items': self.item_count})
+            else:
+                self._subscribers.append((q, notify))
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers = [(s, notify) for s, notify in self._subscribers if s is not q]
+
+    # ------------------------------------------------------------------
+    # Internals (called with the lock held)
+    # ------------------------------------------------------------------
+
+    def _due(self) -> bool:
+        return (
+            len(self._pending) >= self.FLUSH_SIZE
+            or time.monotonic() - self._last_flush >= self.FLUSH_SEC
+        )
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+
+        columns = items_to_columns(batch, MeasurementService.ITEM_FIELDS)
+        fill_derived_channels(columns, self.weight)
+        MeasurementService._write_columns(self.measurement, columns, len(batch))
+        self.item_count += len(batch)
+        # Series ETags (core/views/caching.py) must change while recording
+        Measurement.objects.filter(pk=self.measurement.pk).update(
+            data_version=F('data_version') + 1, data_changed_at=timezone.now()
+        )
+
+        self._aggregate(columns)
+        self._publish(self._update(columns))
+
+    def _aggregate(self, columns: Dict[str, np.ndarray]) -> None:
+        """Update stage averages and peaks with a batch, sample by sample."""
+        time_sec, power = columns['time_sec'], columns['power']
+        for i in range(len(time_sec)):
+            has_power = not np.isnan(power[i]) and power[i] > 0
+            key = round(power[i] / 5) * 5 if has_power else time_sec[i] // self.STAGE_SEC
+            if key != self._stage_key:
+                self._stage_key, self._stage_start = float(key), float(time_sec[i])
+                self._stage_sums, self._stage_counts = {}, {}
+                if has_power:
+                    self._protocol_items.append(ParsedItem(time_sec=float(time_sec[i]), power=float(key)))
+
+            for name in LIVE_CHANNELS:
+                value = columns[name][i]
+                if not np.isnan(value):
+                    self._stage_sums[name] = self._stage_sums.get(name, 0.0) + float(value)
+                    self._stage_counts[name] = self._stage_counts.get(name, 0) + 1
+
+        for peak, name in (('vo2max', 'vo2_ml_kg_min'), ('hrmax', 'hr'), ('power', 'power')):
+            column = columns[name]
+            if np.isnan(column).all():
+                continue
+            value = float(np.nanmax(column))
+            if self.peaks[peak] is None or value > self.peaks[peak]:
+                self.peaks[peak] = value
+
+    def _state(self, kind: str) -> Dict[str, Any]:
+        """Aggregates part of an update."""
+        return {
+            'type': kind,
+            'measurement_id': self.measurement.pk,
+            'items': self.item_count,
+            'stage': {
+                'key': self._stage_key,
+                'start_sec': self._stage_start,
+                'averages': {
+                    name: self._stage_sums[name] / self._stage_counts[name]
+                    for name in self._stage_sums
+                },
+            },
+            'peaks': dict(self.peaks),
+        }
+
+    def _update(self, columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Update with the batch's points reduced to PUSH_POINTS."""
+        time_sec = columns['time_sec']
+        if len(time_sec) > self.PUSH_POINTS:
+            kept = [
+                downsample_indices(time_sec, columns[name], self.PUSH_POINTS, 'minmax')
+                for name in LIVE_CHANNELS
+            ]
+            index = np.unique(np.concatenate(kept))
+        else:
+            index = np.arange(len(time_sec))
+
+        update = self._state('samples')
+        update['time_sec'] = time_sec[index].tolist()
+        update['channels'] = {
+            name: [None if np.isnan(v) else float(v) for v in columns[name][index]]
+            for name in LIVE_CHANNELS
+        }
+        return update
+
+    def _publish(self, update: Dict[str, Any]) -> None:
+        """Deliver to subscribers; a full queue drops its oldest update."""
+        for q, notify in self._subscribers:
+            while True:
+                try:
+                    q.put_nowait(update)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+            if notify is not None:
+                try:
+                    notify()
+                except RuntimeError:
+                    pass  # consumer's event loop already closed: it unsubscribes on exit
+
+
+class LiveService:
+    """
+    Registry of live sessions in this process.
+    """
+
+    # Seconds without samples after which a session is finished
+    IDLE_TIMEOUT_SEC = 600
+
+    _sessions: Dict[int, LiveSession] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, setup: Optional[Dict[str, Any]] = None, client: Optional[Client] = None) -> LiveSession:
+        """
+        Create the measurement and open a session.
+
+        Args:
+            setup: dataMap-style setup (name, weight, height, sex, createTS)
+            client: Existing client (otherwise found/created from setup)
+        """
+        cls.expire_idle()
+        parsed = JsonParser().parse_data({'setup': setup or {}}, source_file='live')
+        if client is None:
+            client = MeasurementService._get_or_create_client(parsed)
+        measurement = Measurement.objects.create(
+            client=client,
+            measurement_date=parsed.measurement_date or timezone.now(),
+            source_format=Measurement.SourceFormat.CUSTOM_JSON,
+            source_file='live',
+        )
+        weight = client.weight or parsed.client_weight
+        session = LiveSession(measurement, float(weight) if weight else None)
+        with cls._lock:
+            cls._sessions[measurement.pk] = session
+        return session
+
+    @classmethod
+    def get(cls, measurement_id: int) -> LiveSession:
+        """
+        Raises:
+            KeyError: No live session for this measurement in this process
+        """
+        cls.expire_idle()
+        with cls._lock:
+            return cls._sessions[measurement_id]
+
+    @classmethod
+    def finish(cls, measurement_id: int) -> int:
+        """Close a session (see LiveSession.finish). Returns item count."""
+        with cls._lock:
+            session = cls._sessions.pop(measurement_id)
+        return session.finish()
+
+    @classmethod
+    def expire_idle(cls) -> List[int]:
+        """
+        Finish sessions idle for more than IDLE_TIMEOUT_SEC (samples so
+        far are kept, subscribers get "finished").
+
+        Returns:
+            Measurement IDs of the expired sessions
+        """
+        now = time.monotonic()
+        with cls._lock:
+            expired = [
+                session for session in cls._sessions.values()
+                if now - session.last_activity > cls.IDLE_TIMEOUT_SEC
+            ]
+            for session in expired:
+                del cls._sessions[session.measurement.pk]
+        for session in expired:
+            logger.warning("Live session %s idle for %ss, finishing", session.measurement.pk, cls.IDLE_TIMEOUT_SEC)
+            session.finish()
+        return [session.measurement.pk for session in expired]
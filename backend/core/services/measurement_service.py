@@ -12,7 +12,10 @@ from typing import Optional, Tuple
 from pathlib import Path
 
 from core.models import Client, Measurement, MeasurementItem
+from core.analysis.derived import column_to_list, fill_derived_channels, items_to_columns
 from core.parsers import ParserFactory, ParsedMeasurement, ParsedItem
+from core.services.client_search_service import ClientSearchService
+from core.signals import ChangeReason, notify_measurements_changed
 
 
 class MeasurementService:
@@ -23,7 +26,8 @@ class MeasurementService:
     1. Parse file using ParserFactory
     2. Create or find Client from parsed metadata
     3. Create Measurement record
-    4. Bulk create MeasurementItems
+    4. Fill derived channels and bulk create MeasurementItems
+    5. Notify derived stores (norms, ...) about the new measurement
     """
     
     @classmethod
@@ -59,19 +63,24 @@ class MeasurementService:
             measurement_date=measurement_date
         )
         
-        # Create items
-        item_count = cls._create_items(measurement, parsed.items)
+        # Create items (with derived channels)
+        weight = client.weight or parsed.client_weight
+        item_count = cls._create_items(
+            measurement, parsed.items,
+            weight=float(weight) if weight else None
+        )
+        
+        # bulk_create skips post_save, announce explicitly
+        notify_measurements_changed([measurement.id], ChangeReason.IMPORT)
         
         return measurement, item_count
     
     @classmethod
     def _get_or_create_client(cls, parsed: ParsedMeasurement) -> Client:
         """Create or find client from parsed metadata."""
-        # Try to find existing by name
+        # Try to find existing by name (any word order, script, ё/е)
         if parsed.client_name:
-            existing = Client.objects.filter(
-                name__iexact=parsed.client_name
-            ).first()
+            existing = ClientSearchService.match(parsed.client_name)
             if existing:
                 return existing
         
@@ -108,33 +117,54 @@ class MeasurementService:
             source_file=Path(file_path).name
         )
     
+    # Series columns written to MeasurementItem
+    ITEM_FIELDS = [
+        'time_sec', 'vo2_ml_kg_min', 'vo2_ml_min', 'vco2_ml_min', 'hr', 'power',
+        'rf', 'tv', 've', 'rpm', 've_vo2', 've_vco2', 'o2_pulse', 'feo2', 'r',
+        'hrv', 'sd1', 'sd2', 'temp', 'hum',
+    ]
+    
+    # Columns stored as integers
+    INT_ITEM_FIELDS = {'hr', 'hrv'}
+    
     @classmethod
-    def _create_items(cls, measurement: Measurement, items: list[ParsedItem]) -> int:
-        """Bulk create MeasurementItem records."""
-        db_items = []
+    def _create_items(
+        cls,
+        measurement: Measurement,
+        items: list[ParsedItem],
+        weight: Optional[float] = None
+    ) -> int:
+        """
+        Bulk create MeasurementItem records.
         
-        for item in items:
-            db_items.append(MeasurementItem(
+        The parsed series is transposed to NumPy columns, missing derived
+        channels (VO2/kg, RER, Ve/VO2, Ve/VCO2, O2 pulse) are filled as
+        whole-array operations and the result is written in the same
+        bulk insert.
+        """
+        if not items:
+            return 0
+        
+        columns = items_to_columns(items, cls.ITEM_FIELDS)
+        fill_derived_channels(columns, weight)
+        return cls._write_columns(measurement, columns, len(items))
+    
+    @classmethod
+    def _write_columns(cls, measurement: Measurement, columns: dict, count: int) -> int:
+        """Bulk create MeasurementItem records from filled float columns."""
+        values = {
+            name: column_to_list(column, as_int=name in cls.INT_ITEM_FIELDS)
+            for name, column in columns.items()
+            if name in cls.ITEM_FIELDS
+        }
+        
+        db_items = [
+            MeasurementItem(
                 measurement=measurement,
-                time_sec=item.time_sec,
-                vo2_ml_kg_min=item.vo2_ml_kg_min,
-                vo2_ml_min=item.vo2_ml_min,
-                vco2_ml_min=item.vco2_ml_min,
-                hr=item.hr,
-                power=item.power,
-                rf=item.rf,
-                tv=item.tv,
-                ve=item.ve,
-                rpm=item.rpm,
-                ve_vo2=item.ve_vo2,
-                feo2=item.feo2,
-                r=item.r,
-                hrv=item.hrv,
-                sd1=item.sd1,
-                sd2=item.sd2,
-                temp=item.temp,
-                hum=item.hum
-            ))
+                **{name: values[name][i] for name in cls.ITEM_FIELDS}
+            )
+            for i in range(count)
+        ]
         
         MeasurementItem.objects.bulk_create(db_items)
         return len(db_items)
@@ -0,0 +1,379 @@
+"""
+NormsService - Population Percentile Ranking
+
+Maintains per-cohort quantile sketches (CohortSketch) and answers
+"where does this athlete rank against our database" from memory.
+
+Cohort cell = metric x gender x age band x test type:
+- Import: values of the new measurement are added incrementally
+- Edits: affected (test type, gender) groups are rebuilt from the database
+- rebuild(): recreate all sketches from scratch (manage.py rebuild_norms)
+
+Peak values are read from the trend store (TrendPoint), so a group
+rebuild never touches MeasurementItem.
+
+Sketches are cached per process and refreshed every CACHE_TTL_SEC, so a
+lookup is a dictionary access plus an in-memory CDF evaluation.
+
+DOCUMENTATION:
+    Spec: Research/16_normative_reference_values.md
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+
+from django.db import transaction
+
+from core.analysis import TDigest
+from core.models import CohortSketch, Measurement, Client, TrendPoint
+
+# (metric, gender, age_band, test_type)
+CellKey = Tuple[str, str, str, str]
+
+
+class NormsService:
+    """
+    Service for population percentile sketches.
+
+    All methods are classmethods; the in-memory cache is process-wide.
+    """
+
+    # Metric -> TrendPoint peak field
+    METRICS: Dict[str, str] = {
+        CohortSketch.Metric.VO2MAX: 'vo2max',
+        CohortSketch.Metric.HRMAX: 'hrmax',
+        CohortSketch.Metric.PEAK_POWER: 'peak_power',
+    }
+
+    # (min_age, max_age, label) - age at test date
+    AGE_BANDS: List[Tuple[int, int, str]] = [
+        (0, 19, '<20'),
+        (20, 29, '20-29'),
+        (30, 39, '30-39'),
+        (40, 49, '40-49'),
+        (50, 59, '50-59'),
+        (60, 200, '60+'),
+    ]
+
+    # Below this size a cell falls back to all ages for ranking
+    MIN_COHORT_SIZE = 20
+
+    # How long a process trusts its cached sketches
+    CACHE_TTL_SEC = 300
+
+    _cells: Optional[Dict[CellKey, TDigest]] = None
+    _merged: Dict[tuple, TDigest] = {}
+    _loaded_at: float = 0.0
+    _lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def percentile(
+        cls,
+        metric: str,
+        value: float,
+        gender: Optional[str] = None,
+        age_band: Optional[str] = None,
+        test_type: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Percentile (0..100) of value within a cohort.
+
+        None for any cohort argument means "all" - matching cells are
+        merged on the fly and the merged digest is cached.
+
+        Returns:
+            Percentile or None if cohort is empty
+        """
+        digest = cls.cohort(metric, gender, age_band, test_type)
+        share = digest.cdf(value)
+        return None if share is None else round(share * 100, 1)
+
+    @classmethod
+    def cohort(
+        cls,
+        metric: str,
+        gender: Optional[str] = None,
+        age_band: Optional[str] = None,
+        test_type: Optional[str] = None
+    ) -> TDigest:
+        """Return (possibly merged) digest for cohort."""
+        key = (metric, gender, age_band, test_type)
+        with cls._lock:
+            cells = cls._ensure_cache()
+            digest = cls._merged.get(key)
+            if digest is None:
+                digest = TDigest.merged(
+                    d for (m, g, a, t), d in cells.items()
+                    if m == metric
+                    and (gender is None or g == gender)
+                    and (age_band is None or a == age_band)
+                    and (test_type is None or t == test_type)
+                )
+                cls._merged[key] = digest
+            return digest
+
+    @classmethod
+    def rank_measurement(cls, measurement: Measurement) -> List[Dict[str, Any]]:
+        """
+        Rank measurement peaks against its cohort.
+
+        Uses the narrow cell (gender, age band, test type) when it holds
+        at least MIN_COHORT_SIZE tests, otherwise all ages.
+
+        Returns:
+            [{'metric', 'label', 'value', 'percentile', 'cohort', 'cohort_size'}, ...]
+        """
+        peaks = TrendPoint.objects.filter(measurement=measurement).values(
+            *cls.METRICS.values()
+        ).first() or {}
+        client = measurement.client
+        gender = client.gender
+        band = cls.age_band(client.birthdate, measurement.measurement_date)
+        test_type = measurement.test_type
+
+        ranks = []
+        for metric, field_name in cls.METRICS.items():
+            value = peaks.get(field_name)
+            if value is None:
+                continue
+
+            age_band = band or None
+            digest = cls.cohort(metric, gender, age_band, test_type)
+            if age_band is None or digest.count < cls.MIN_COHORT_SIZE:
+                age_band = None
+                digest = cls.cohort(metric, gender, None, test_type)
+            if not digest.count:
+                continue
+
+            ranks.append({
+                'metric': metric,
+                'label': CohortSketch.Metric(metric).label,
+                'value': value,
+                'percentile': round(digest.cdf(value) * 100, 1),
+                'cohort': cls._cohort_label(gender, age_band, test_type),
+                'cohort_size': int(digest.count),
+            })
+        return ranks
+
+    @staticmethod
+    def age_band(birthdate: Optional[date], on_date=None) -> str:
+        """
+        Age band label for age at test date ('' if birthdate unknown).
+        """
+        if not birthdate:
+            return ''
+        on_date = on_date or date.today()
+        if hasattr(on_date, 'date'):
+            on_date = on_date.date()
+        age = on_date.year - birthdate.year - (
+            (on_date.month, on_date.day) < (birthdate.month, birthdate.day)
+        )
+        for low, high, label in NormsService.AGE_BANDS:
+            if low <= age <= high:
+                return label
+        return ''
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def add_measurement(cls, measurement_id: int) -> int:
+        """
+        Incrementally add freshly imported measurement to its cells.
+
+        Returns:
+            Number of cells updated
+        """
+        row = cls._peaks_queryset().filter(measurement_id=measurement_id).first()
+        if row is None:
+            return 0
+
+        updated = 0
+        for key, value in cls._cell_values(row):
+            metric, gender, age_band, test_type = key
+            with transaction.atomic():
+                sketch, _ = CohortSketch.objects.select_for_update().get_or_create(
+                    metric=metric, gender=gender,
+                    age_band=age_band, test_type=test_type
+                )
+                digest = TDigest.from_dict(sketch.digest)
+                digest.add(value)
+                sketch.digest = digest.to_dict()
+                sketch.count += 1
+                sketch.save(update_fields=['digest', 'count', 'updated_at'])
+            cls._store_in_cache(key, digest)
+            updated += 1
+        return updated
+
+    @classmethod
+    def refresh_groups(cls, groups: Iterable[Tuple[str, str]]) -> int:
+        """
+        Rebuild all cells of given (test_type, gender) groups.
+
+        Used after edits, where a single value cannot be removed from
+        a digest. Each group is one aggregate query.
+
+        Returns:
+            Number of cells written
+        """
+        written = 0
+        for test_type, gender in set(groups):
+            rows = cls._peaks_queryset().filter(
+                test_type=test_type, client__gender=gender
+            )
+            digests = cls._build_digests(rows)
+            with transaction.atomic():
+                CohortSketch.objects.filter(
+                    test_type=test_type, gender=gender
+                ).delete()
+                cls._bulk_save(digests)
+            with cls._lock:
+                if cls._cells is not None:
+                    for key in [k for k in cls._cells if k[3] == test_type and k[1] == gender]:
+                        del cls._cells[key]
+                    cls._cells.update(digests)
+                cls._merged = {}
+            written += len(digests)
+        return written
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recreate all sketches from scratch (single trend store query).
+
+        Expects an up-to-date trend store (manage.py rebuild_trends).
+
+        Returns:
+            Number of cells written
+        """
+        digests = cls._build_digests(cls._peaks_queryset())
+        with transaction.atomic():
+            CohortSketch.objects.all().delete()
+            cls._bulk_save(digests)
+        cls.reload()
+        return len(digests)
+
+    @classmethod
+    def reload(cls) -> None:
+        """Drop process cache; next query reloads sketches."""
+        with cls._lock:
+            cls._cells = None
+            cls._merged = {}
+
+    @classmethod
+    def on_measurements_changed(
+        cls,
+        measurement_ids: List[int],
+        reason: str,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        React to data changes (see core.signals).
+
+        Imports are added incrementally; edits rebuild affected groups,
+        including the group the measurement belonged to before the edit.
+        """
+        from core.signals import ChangeReason
+
+        if reason == ChangeReason.THRESHOLDS:
+            return
+        if reason == ChangeReason.IMPORT:
+            for measurement_id in measurement_ids:
+                cls.add_measurement(measurement_id)
+            return
+
+        previous = previous or {}
+        groups: Set[Tuple[str, str]] = set()
+        current = Measurement.objects.filter(pk__in=measurement_ids).values_list(
+            'test_type', 'client__gender'
+        ).distinct()
+        for test_type, gender in current:
+            groups.add((test_type, gender))
+            groups.add((previous.get('test_type', test_type), previous.get('gender', gender)))
+        if not groups and previous.get('test_type') and previous.get('gender'):
+            groups.add((previous['test_type'], previous['gender']))
+        cls.refresh_groups(groups)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _peaks_queryset(cls):
+        """Per-measurement peak values with cohort attributes."""
+        return TrendPoint.objects.filter(use_in_report=True).values(
+            'measurement_id', 'test_type', 'measurement_date',
+            'client__gender', 'client__birthdate', *cls.METRICS.values()
+        )
+
+    @classmethod
+    def _cell_values(cls, row: dict) -> List[Tuple[CellKey, float]]:
+        """Map peaks row to [(cell key, value), ...]."""
+        age_band = cls.age_band(row['client__birthdate'], row['measurement_date'])
+        result = []
+        for metric, field_name in cls.METRICS.items():
+            value = row.get(field_name)
+            if value is not None:
+                key = (metric, row['client__gender'], age_band, row['test_type'])
+                result.append((key, float(value)))
+        return result
+
+    @classmethod
+    def _build_digests(cls, rows) -> Dict[CellKey, TDigest]:
+        """Build fresh digests from peaks rows."""
+        digests: Dict[CellKey, TDigest] = defaultdict(TDigest)
+        for row in rows:
+            for key, value in cls._cell_values(row):
+                digests[key].add(value)
+        return dict(digests)
+
+    @staticmethod
+    def _bulk_save(digests: Dict[CellKey, TDigest]) -> None:
+        """Insert CohortSketch rows for digests."""
+        CohortSketch.objects.bulk_create([
+            CohortSketch(
+                metric=metric, gender=gender, age_band=age_band,
+                test_type=test_type, digest=digest.to_dict(),
+                count=int(digest.count)
+            )
+            for (metric, gender, age_band, test_type), digest in digests.items()
+        ])
+
+    @classmethod
+    def _ensure_cache(cls) -> Dict[CellKey, TDigest]:
+        """Load all sketches in one query if cache is cold or expired."""
+        now = time.monotonic()
+        if cls._cells is None or now - cls._loaded_at > cls.CACHE_TTL_SEC:
+            cls._cells = {
+                (s.metric, s.gender, s.age_band, s.test_type): TDigest.from_dict(s.digest)
+                for s in CohortSketch.objects.all()
+            }
+            cls._merged = {}
+            cls._loaded_at = now
+        return cls._cells
+
+    @classmethod
+    def _store_in_cache(cls, key: CellKey, digest: TDigest) -> None:
+        """Update single cell in warm cache."""
+        with cls._lock:
+            if cls._cells is not None:
+                cls._cells[key] = digest
+            cls._merged = {}
+
+    @staticmethod
+    def _cohort_label(gender: str, age_band: Optional[str], test_type: str) -> str:
+        """Human-readable cohort description for reports."""
+        parts = ['М' if gender == Client.Gender.MALE else 'Ж']
+        if age_band:
+            parts.append(age_band)
+        if test_type in Measurement.TestType.values:
+            test_type = Measurement.TestType(test_type).label
+        parts.append(test_type)
+        return ', '.join(parts)
@@ -0,0 +1,408 @@
+"""
+ReportService - Report Data from the Database
+
+Assembles ReportData (default_report) or the detailed_report context for
+one measurement, or a pair of measurements of the same client, with a
+fixed query budget regardless of the number of rows:
+
+1. Measurements with their client (select_related)
+2. Thresholds of all measurements
+3. Items of all measurements (values_list, only needed columns), unless
+   the template renders no charts (default_report)
+4. Norms: TrendPoint row + cohort sketches (cached in-process)
+5. Lactate fits (detailed_report, stored LactateFit rows; refitted on
+   edit by core/signals.py, never on read)
+
+Work is timed as 'query' and 'compute' spans (core/reports/timing.py).
+
+Stage tables average items per rated power (stepped protocols) or per
+STAGE_SEC interval (ramps). Comparisons of two tests average both on one
+power grid (the stepped protocol's start and step, else POWER_BIN_W
+bins of measured power), so rows pair equal powers even when one test
+is a ramp. Charts use the full series and are downsampled on render
+(core/reports/charts.py).
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 2)
+"""
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.models import LactateFit, Measurement, MeasurementItem, Threshold
+from core.reports import ChartSeries, LineChart, NormRank, ReportData, ThresholdZone, timing
+from core.reports.charts import render_chart
+from core.services.lactate_service import LactateService
+from core.services.norms_service import NormsService
+
+# Threshold presentation (short name, full name, bar color), report order
+THRESHOLD_ZONES = {
+    Threshold.ThresholdType.AET: ("АэП", "Аэробный порог", "#6b9bd1"),
+    Threshold.ThresholdType.ANT: ("АнП", "Анаэробный порог", "#5a8bc4"),
+    Threshold.ThresholdType.VO2MAX: ("МПК", "Макс. потр. O2", "#4a7ab7"),
+    Threshold.ThresholdType.DO2: ("ДО2", "Дефлекция O2", "#3a6aaa"),
+    Threshold.ThresholdType.MAM: ("МАМ", "Макс. анаэр. мощн.", "#2a5a9d"),
+}
+
+# Columns loaded per item
+ITEM_COLUMNS = ['measurement_id', 'time_sec', 'rated_power', 'power', 'hr', 'lactat', 'vo2_ml_min', 've', 'tv', 'rf']
+
+# Averaging interval when the protocol has no rated power steps
+STAGE_SEC = 60
+
+# Comparison grid step (W) when neither test has a power step
+POWER_BIN_W = 20
+
+MONTHS_GENITIVE = [
+    'января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+    'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря',
+]
+
+
+class ReportService:
+    """
+    Service building report payloads from stored measurements.
+    """
+
+    # Inputs read per template (GeneratedReport dependency tracking):
+    # client fields and threshold types shown, and whether item rows are
+    # read directly (stage tables, charts). Every template shows peaks
+    # (norms, comparisons), which item edits can also change.
+    CLIENT_FIELDS = {
+        'default_report': ['name', 'last_name', 'second_name', 'gender', 'birthdate', 'height', 'weight'],
+        'detailed_report': ['name', 'last_name', 'second_name', 'weight'],
+    }
+    THRESHOLD_TYPES = {
+        'default_report': [str(t) for t in THRESHOLD_ZONES],
+        # Lactate fits include Threshold.lactate of any type
+        'detailed_report': [str(t) for t in Threshold.ThresholdType],
+    }
+    USES_ITEMS = {
+        'default_report': False,
+        'detailed_report': True,
+    }
+    # Whether the template renders chart_data (custom templates: assumed)
+    USES_CHARTS = {
+        'default_report': False,
+        'detailed_report': True,
+    }
+
+    @classmethod
+    def build(cls, template: str, measurement_id: int, compare_with: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Template context for any supported template.
+
+        Raises:
+            Measurement.DoesNotExist
+        """
+        if template == 'detailed_report':
+            return cls.build_detailed_context(measurement_id, compare_with)
+        return cls.build_report_data(measurement_id, with_charts=cls.uses_charts(template)).to_dict()
+
+    @classmethod
+    def uses_items(cls, template: str) -> bool:
+        """True if the template reads item rows directly (unknown templates: True)."""
+        return cls.USES_ITEMS.get(template, True)
+
+    @classmethod
+    def uses_charts(cls, template: str) -> bool:
+        """True if the template renders chart_data (unknown templates: True)."""
+        return cls.USES_CHARTS.get(template, True)
+
+    @classmethod
+    def build_report_data(
+        cls,
+        measurement_id: int,
+        with_norms: bool = True,
+        with_charts: bool = False
+    ) -> ReportData:
+        """
+        ReportData for default_report (or custom templates).
+
+        Args:
+            measurement_id: Measurement ID
+            with_norms: Include population ranking (NormsService)
+            with_charts: Build chart_data (loads the item series)
+
+        Raises:
+            Measurement.DoesNotExist
+        """
+        with timing.span('query'):
+            measurement = Measurement.objects.select_related('client').get(pk=measurement_id)
+            thresholds = cls._load_thresholds([measurement_id])[measurement_id]
+            series = cls._load_items([measurement_id])[measurement_id] if with_charts else None
+            ranks = NormsService.rank_measurement(measurement) if with_norms else []
+
+        with timing.span('compute'):
+            return cls._to_report_data(measurement, thresholds, series, ranks)
+
+    @classmethod
+    def _to_report_data(
+        cls,
+        measurement: Measurement,
+        thresholds: List[Threshold],
+        series: Optional[Dict[str, list]],
+        ranks: List[Dict[str, Any]]
+    ) -> ReportData:
+        """ReportData from loaded rows (no chart_data without series)."""
+        client = measurement.client
+        weight = float(client.weight) if client.weight else None
+
+        zones = []
+        for t in thresholds:
+            name, name_full, color = THRESHOLD_ZONES[t.threshold_type]
+            zones.append(ThresholdZone(
+                name=name,
+                name_full=name_full,
+                power=t.power,
+                power_per_kg=round(t.power / weight, 2) if weight else 0,
+                vo2=round(t.vo2 / 1000, 1) if t.vo2 else 0,
+                vo2_per_kg=round(t.vo2_per_kg) if t.vo2_per_kg else 0,
+                hr=t.hr or 0,
+                color=color,
+            ))
+        by_type = {t.threshold_type: t for t in thresholds}
+        do2 = by_type.get(Threshold.ThresholdType.DO2)
+
+        norms = [
+            NormRank(r['label'], r['value'], r['percentile'], r['cohort'], r['cohort_size'])
+            for r in ranks
+        ]
+
+        return ReportData(
+            client_name=client.full_name,
+            client_age=client.age,
+            client_height=int(client.height) if client.height else None,
+            client_weight=weight,
+            test_date=measurement.measurement_date,
+            sport=measurement.get_test_type_display(),
+            test_type=measurement.get_test_type_display(),
+            protocol=cls._protocol(measurement),
+            thresholds=zones,
+            o2_delivery_limit=do2.power if do2 else None,
+            norms=norms,
+            chart_data=cls._time_charts([(measurement, series)]) if series is not None else {},
+        )
+
+    @classmethod
+    def build_detailed_context(
+        cls,
+        measurement_id: int,
+        compare_with: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Template context for detailed_report (stage table + comparisons).
+
+        Args:
+            measurement_id: Measurement shown in the stage table
+            compare_with: Earlier measurement for the comparison charts
+                          (default: the measurement itself)
+
+        Raises:
+            Measurement.DoesNotExist
+        """
+        ids = [measurement_id] if compare_with is None else [compare_with, measurement_id]
+        with timing.span('query'):
+            measurements = Measurement.objects.select_related('client').in_bulk(ids)
+            missing = [mid for mid in ids if mid not in measurements]
+            if missing:
+                raise Measurement.DoesNotExist(f"Measurement {missing[0]} not found")
+            series = cls._load_items(ids)
+            fits = LactateService.get_fits(ids)
+
+        with timing.span('compute'):
+            return cls._to_detailed_context(ids, measurements, series, fits, compare_with is not None)
+
+    @classmethod
+    def _to_detailed_context(
+        cls,
+        ids: List[int],
+        measurements: Dict[int, Measurement],
+        series: Dict[int, Dict[str, list]],
+        fits: Dict[int, LactateFit],
+        compared: bool
+    ) -> Dict[str, Any]:
+        """detailed_report context from loaded rows and lactate fits."""
+        first, second = measurements[ids[0]], measurements[ids[-1]]
+        stages = cls._stage_rows(series[ids[-1]])
+        client = second.client
+
+        # Both tests averaged on one power grid and paired by grid power
+        grid = cls._power_grid([second, first])
+        binned = {mid: cls._stage_rows(series[mid], grid) for mid in ids}
+        powers = sorted(set(binned[ids[0]]) & set(binned[ids[-1]]))
+        comparison = defaultdict(list)
+        for power in powers:
+            row_1, row_2 = binned[ids[0]][power], binned[ids[-1]][power]
+            comparison['hr'].append({'power': power, 'hr_1': row_1['hr'], 'hr_2': row_2['hr']})
+            comparison['ve'].append({'power': power, 've_1': row_1['ve'], 've_2': row_2['ve']})
+            comparison['vo2'].append({'power': power, 'vo2_1': row_1['vo2'], 'vo2_2': row_2['vo2']})
+
+        # Lactate compared on the fitted curves at the grid power
+        # (measured means where a test has no fit or the power is outside
+        # its fitted range)
+        def lactate(mid: int) -> list:
+            measured = [binned[mid][power]['lactate'] for power in powers]
+            if mid not in fits:
+                return measured
+            fitted = LactateService.evaluate(fits[mid], powers)
+            return [row if value is None else value for row, value in zip(measured, fitted)]
+
+        for power, la_1, la_2 in zip(powers, lactate(ids[0]), lactate(ids[-1])):
+            comparison['lactate'].append({'power': power, 'la_1': la_1, 'la_2': la_2})
+
+        pair = [(measurements[mid], series[mid]) for mid in dict.fromkeys(ids)]
+        return {
+            'client': {
+                'name': client.full_name,
+                'weight': float(client.weight) if client.weight else '',
+            },
+            'test': {
+                'sport': second.get_test_type_display().lower(),
+                'date': cls._date_label(second, year=True),
+                'equipment': '',
+                'cadence': '',
+                'notes': cls._protocol(second),
+                'date_1': cls._date_label(first),
+                'date_2': cls._date_label(second),
+            },
+            'data_rows': list(stages.values()),
+            'hr_comparison': comparison['hr'],
+            've_comparison': comparison['ve'],
+            'vo2_comparison': comparison['vo2'],
+            'lactate_comparison': comparison['lactate'],
+            'lactate_markers': [
+                {
+                    'date': cls._date_label(measurements[mid]),
+                    'power_2mmol': fits[mid].power_2mmol,
+                    'power_4mmol': fits[mid].power_4mmol,
+                    'power_dmax': fits[mid].power_dmax,
+                }
+                for mid in dict.fromkeys(ids) if mid in fits
+            ],
+            'skills': [],
+            'examples': [],
+            'conclusion': '',
+            'chart_data': {
+                name: render_chart(chart) for name, chart in cls._time_charts(pair).items()
+            },
+        }
+
+    @staticmethod
+    def _load_thresholds(measurement_ids: Sequence[int]) -> Dict[int, List[Threshold]]:
+        """Thresholds per measurement in report order (one query)."""
+        order = list(THRESHOLD_ZONES)
+        result: Dict[int, List[Threshold]] = {mid: [] for mid in measurement_ids}
+        for t in Threshold.objects.filter(measurement_id__in=measurement_ids):
+            result[t.measurement_id].append(t)
+        for thresholds in result.values():
+            thresholds.sort(key=lambda t: order.index(t.threshold_type))
+        return result
+
+    @staticmethod
+    def _load_items(measurement_ids: Sequence[int]) -> Dict[int, Dict[str, list]]:
+        """Item columns per measurement, by time (one query)."""
+        columns = ITEM_COLUMNS[1:]
+        result = {mid: {name: [] for name in columns} for mid in measurement_ids}
+        rows = MeasurementItem.objects.filter(
+            measurement_id__in=measurement_ids,
+            use_in_report=True
+        ).order_by('measurement_id', 'time_sec').values_list(*ITEM_COLUMNS)
+        for mid, *values in rows.iterator(chunk_size=5000):
+            target = result[mid]
+            for name, value in zip(columns, values):
+                target[name].append(value)
+        return result
+
+    @staticmethod
+    def _power_grid(measurements: List[Measurement]) -> tuple:
+        """(start, step) W of the first stepped protocol, else (0, POWER_BIN_W)."""
+        for measurement in measurements:
+            if measurement.power_step:
+                return measurement.start_power or 0, measurement.power_step
+        return 0, POWER_BIN_W
+
+    @staticmethod
+    def _stage_rows(series: Dict[str, list], grid: Optional[tuple] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Averaged rows per stage: {key: {'time', 'power', 'hr', ...}}.
+        Stage = rated power step (key: the rated power), or STAGE_SEC
+        interval for ramps (key: interval index, power: its mean power).
+
+        With grid=(start, step), stages are power bins instead: rated
+        (stepped) or measured (ramp) power rounded to start + k * step;
+        key and power are the bin power.
+        """
+        stepped = any(p for p in series['rated_power'])
+        sums: Dict[Any, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        for i, time_sec in enumerate(series['time_sec']):
+            if grid is not None:
+                power = series['rated_power'][i] if stepped else series['power'][i]
+                start, step = grid
+                key = None if power is None else int(start + step * math.floor((power - start) / step + 0.5))
+            else:
+                key = series['rated_power'][i] if stepped else int(time_sec // STAGE_SEC)
+            if key is None:
+                continue
+            stage = sums[key]
+            stage['time'].append(time_sec)
+            for name in ('power', 'hr', 'lactat', 'vo2_ml_min', 've', 'tv', 'rf'):
+                value = series[name][i]
+                if value is not None:
+                    stage[name].append(value)
+
+        def mean(values: List[float], digits: int = 2):
+            return round(sum(values) / len(values), digits) if values else ''
+
+        rows = {}
+        for key, stage in sums.items():
+            power = key if stepped or grid is not None else round(mean(stage['power'], 0) or 0)
+            end = int(max(stage['time']))
+            rows[key] = {
+                'time': f"{end // 60}:{end % 60:02d}",
+                'power': power,
+                'hr': mean(stage['hr']),
+                'lactate': mean(stage['lactat'], 1),
+                'vo2': mean(stage['vo2_ml_min']),
+                've': mean(stage['ve']),
+                'tv': mean(stage['tv']),
+                'rf': mean(stage['rf']),
+            }
+        return dict(sorted(rows.items()))
+
+    @classmethod
+    def _time_charts(cls, pairs: list) -> Dict[str, LineChart]:
+        """HR, Ve and VO2 over time (minutes), one series per measurement."""
+        charts = {}
+        for name, field_name, title in (
+            ('hr', 'hr', 'ЧСС'),
+            ('ve', 've', 'Лёгочная вентиляция'),
+            ('vo2', 'vo2_ml_min', 'Потребление кислорода'),
+        ):
+            charts[name] = LineChart(
+                title=title,
+                x_label='мин',
+                series=[
+                    ChartSeries(
+                        cls._date_label(measurement),
+                        [t / 60 for t in series['time_sec']],
+                        series[field_name],
+                    )
+                    for measurement, series in pairs
+                ],
+            )
+        return charts
+
+    @staticmethod
+    def _protocol(measurement: Measurement) -> str:
+        """Protocol description from start power and step."""
+        if measurement.start_power and measurement.power_step:
+            return f"Старт {measurement.start_power} ватт, +{measurement.power_step} ватт каждую ступень"
+        return ''
+
+    @staticmethod
+    def _date_label(measurement: Measurement, year: bool = False) -> str:
+        """Russian date label, e.g. "2 ноября" or "2 ноября 2019"."""
+        d = measurement.measurement_date
+        label = f"{d.day} {MONTHS_GENITIVE[d.month - 1]}"
+        return f"{label} {d.year}" if year else label
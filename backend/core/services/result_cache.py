@@ -0,0 +1,131 @@
+"""
+ResultCache - Versioned Cache for Computed Results
+
+Results computed from measurement data (comparison tables, dynamics)
+are cached under a key that includes each source measurement's
+Measurement.data_version. core.signals bumps that version on every item,
+threshold, use_in_report or client change, so an edit simply makes new
+keys: entries are never stale and need no TTL. Old entries age out of
+the LRU (and the shared backend's own culling). Cached values are shared
+between callers and must be treated as read-only.
+
+Two levels:
+- in-process LRU (per worker, fastest)
+- optional shared Django cache (settings.RESULT_CACHE_ALIAS, e.g. a
+  FileBasedCache or LocMemCache alias) for hits across workers
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 2)
+    Used by: core/services/comparison_service.py
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Sequence
+
+from django.conf import settings
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    Two-level LRU cache keyed by measurement data versions.
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+
+    def __init__(self, namespace: str, max_entries: Optional[int] = None, alias: Optional[str] = None):
+        """
+        Args:
+            namespace: Key prefix (e.g. 'comparison')
+            max_entries: In-process LRU size (default: settings.RESULT_CACHE_SIZE)
+            alias: Django cache alias for the shared level
+                (default: settings.RESULT_CACHE_ALIAS, None = in-process only)
+        """
+        self.namespace = namespace
+        self._max_entries = max_entries
+        self._alias = alias
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries or getattr(settings, 'RESULT_CACHE_SIZE', self.DEFAULT_MAX_ENTRIES)
+
+    @property
+    def alias(self) -> Optional[str]:
+        return self._alias if self._alias is not None else getattr(settings, 'RESULT_CACHE_ALIAS', None)
+
+    def key(self, kind: str, measurement_ids: Sequence[int], *parts: Any) -> Optional[str]:
+        """
+        Key for a result over measurements (in the given order).
+
+        One query for the current data versions. Returns None if any
+        measurement is missing (result is not cached).
+        """
+        from core.models import Measurement
+
+        versions = dict(Measurement.objects.filter(
+            pk__in=list(measurement_ids)
+        ).values_list('pk', 'data_version'))
+        if any(mid not in versions for mid in measurement_ids):
+            return None
+        sources = ','.join(f"{mid}v{versions[mid]}" for mid in measurement_ids)
+        return ':'.join([self.namespace, kind, sources, *map(str, parts)])
+
+    def get_or_compute(self, key: Optional[str], compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss."""
+        if key is None:
+            return compute()
+
+        value = self._get_local(key)
+        if value is _MISSING and self.alias:
+            value = self._shared().get(self._shared_key(key), _MISSING)
+            if value is not _MISSING:
+                self._put_local(key, value)
+
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        self._put_local(key, value)
+        if self.alias:
+            self._shared().set(self._shared_key(key), value)
+        return value
+
+    def clear(self) -> None:
+        """Drop the in-process level (the shared level only ages out)."""
+        with self._lock:
+            self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+            return value
+
+    def _put_local(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _shared(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    @staticmethod
+    def _shared_key(key: str) -> str:
+        """Fixed-length key (memcached-safe)."""
+        return 'vo2:' + hashlib.sha1(key.encode()).hexdigest()
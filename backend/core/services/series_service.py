@@ -0,0 +1,366 @@
+"""
+SeriesService - Measurement Channels for Charts
+
+Reads selected MeasurementItem channels for a time window (index on
+measurement, time_sec) as NumPy columns and reduces them on the server
+to the chart's pixel width:
+- every channel is downsampled on its own (lttb or minmax) and the kept
+  indices are merged, so all channels share one time axis and no
+  channel loses its peaks
+- a window narrower than the budget is returned at full resolution,
+  so zooming in fetches raw points
+
+Series pyramid (SeriesLevel): build_pyramid() stores min / max / mean
+buckets of every channel at PYRAMID_LEVELS resolutions when items are
+imported or edited. A window is read from the coarsest level that still
+has at least `points` buckets in it (two queries, at most ~10x points
+values whatever the recording length); only narrower windows, and
+include_excluded requests, scan MeasurementItem. minmax reads each
+bucket as two points at its first and last time, min and max in the
+order they occurred (max_first); lttb reads the means.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 3, dashboard)
+    API: GET /api/measurements/<id>/series/ (core/views/series.py)
+    Backfill: python manage.py build_series_pyramid
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from django.db import transaction
+
+from core.analysis.downsample import METHODS, downsample_indices
+from core.models import Measurement, MeasurementItem, SeriesLevel
+
+
+@dataclass
+class SeriesWindow:
+    """Channels of one measurement in a time window"""
+    measurement_id: int
+    time_sec: np.ndarray                                        # float64, ascending
+    channels: Dict[str, np.ndarray] = field(default_factory=dict)  # float64, NaN = missing
+    total: int = 0              # Rows in the window before downsampling
+    start: Optional[float] = None
+    end: Optional[float] = None
+    method: str = 'minmax'
+    resolution: Optional[int] = None   # Pyramid bucket (s), None = raw rows
+
+    @property
+    def downsampled(self) -> bool:
+        return self.resolution is not None or len(self.time_sec) < self.total
+
+
+class SeriesService:
+    """
+    Service for chart-ready measurement series.
+    """
+
+    # Channels that may be requested (numeric MeasurementItem fields)
+    CHANNELS = [
+        'vo2_ml_kg_min', 'vo2_ml_min', 'vco2_ml_min', 'hr', 'power', 'rated_power',
+        'rf', 'tv', 've', 'rpm', 've_vo2', 've_vco2', 'o2_pulse', 'feo2', 'r',
+        'hrv', 'sd1', 'sd2', 'lactat', 'temp', 'hum',
+    ]
+    DEFAULT_CHANNELS = ['vo2_ml_kg_min', 'vo2_ml_min', 'hr', 'power']
+
+    # Points per channel: default (chart width) and upper bound
+    DEFAULT_POINTS = 800
+    MAX_POINTS = 10000
+
+    # Pyramid bucket sizes, seconds (finest first)
+    PYRAMID_LEVELS = [1, 10, 60, 600]
+
+    @classmethod
+    def get_series(
+        cls,
+        measurement_id: int,
+        channels: Optional[Sequence[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        points: Optional[int] = None,
+        method: str = 'minmax',
+        include_excluded: bool = False
+    ) -> SeriesWindow:
+        """
+        Load a time window and downsample it to about `points` per channel.
+
+        Args:
+            measurement_id: Measurement ID
+            channels: Channel names (default: DEFAULT_CHANNELS)
+            start, end: Window bounds in seconds (inclusive, None = open)
+            points: Target points per channel (default: DEFAULT_POINTS)
+            method: 'minmax' (keeps peaks) or 'lttb'
+            include_excluded: Also return rows with use_in_report=False
+
+        Raises:
+            Measurement.DoesNotExist
+            ValueError: Unknown channel or method
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown downsampling method: {method}")
+        window = cls.load(measurement_id, channels, start, end, include_excluded, points, method)
+        return cls.reduce(window, points, method)
+
+    @classmethod
+    def load(
+        cls,
+        measurement_id: int,
+        channels: Optional[Sequence[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        include_excluded: bool = False,
+        points: Optional[int] = None,
+        method: str = 'minmax'
+    ) -> SeriesWindow:
+        """
+        Database step of get_series: the window from the coarsest pyramid
+        level with at least `points` buckets, else at full resolution.
+
+        Raises:
+            Measurement.DoesNotExist
+            ValueError: Unknown channel
+        """
+        channels = list(channels or cls.DEFAULT_CHANNELS)
+        unknown = [c for c in channels if c not in cls.CHANNELS]
+        if unknown:
+            raise ValueError(f"Unknown channels: {', '.join(unknown)}")
+
+        if not include_excluded:
+            window = cls._load_level(measurement_id, channels, start, end, cls._target(points), method)
+            if window is not None:
+                return window
+
+        if not Measurement.objects.filter(pk=measurement_id).exists():
+            raise Measurement.DoesNotExist(f"Measurement {measurement_id} not found")
+
+        items = MeasurementItem.objects.filter(measurement_id=measurement_id)
+        if start is not None:
+            items = items.filter(time_sec__gte=start)
+        if end is not None:
+            items = items.filter(time_sec__lte=end)
+        if not include_excluded:
+            items = items.filter(use_in_report=True)
+        rows = list(items.order_by('time_sec').values_list('time_sec', *channels))
+
+        columns = cls._to_columns(rows, len(channels) + 1)
+        return SeriesWindow(
+            measurement_id=measurement_id,
+            time_sec=columns[0],
+            channels=dict(zip(channels, columns[1:])),
+            total=len(rows),
+            start=start,
+            end=end,
+        )
+
+    @classmethod
+    def reduce(cls, window: SeriesWindow, points: Optional[int] = None, method: str = 'minmax') -> SeriesWindow:
+        """
+        Compute step of get_series: downsample a loaded window.
+
+        Raises:
+            ValueError: Unknown method
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown downsampling method: {method}")
+        points = cls._target(points)
+
+        index = cls._kept_indices(window.time_sec, window.channels, points, method)
+        return SeriesWindow(
+            measurement_id=window.measurement_id,
+            time_sec=window.time_sec[index],
+            channels={name: column[index] for name, column in window.channels.items()},
+            total=window.total,
+            start=window.start,
+            end=window.end,
+            method=method,
+            resolution=window.resolution,
+        )
+
+    # ------------------------------------------------------------------
+    # Pyramid
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build_pyramid(cls, measurement_ids: Iterable[int]) -> int:
+        """
+        (Re)build SeriesLevel rows from the report rows of measurements.
+
+        A level is stored only if it has fewer buckets than there are
+        rows (e.g. no 1 s level for a 1 Hz recording).
+
+        Returns:
+            Number of SeriesLevel rows written
+        """
+        written = 0
+        for measurement_id in measurement_ids:
+            rows = list(
+                MeasurementItem.objects.filter(measurement_id=measurement_id, use_in_report=True)
+                .order_by('time_sec').values_list('time_sec', *cls.CHANNELS)
+            )
+            columns = cls._to_columns(rows, len(cls.CHANNELS) + 1)
+            levels = []
+            for resolution in cls.PYRAMID_LEVELS if rows else []:
+                levels.extend(cls._aggregate(measurement_id, resolution, columns[0], columns[1:]))
+            with transaction.atomic():
+                SeriesLevel.objects.filter(measurement_id=measurement_id).delete()
+                SeriesLevel.objects.bulk_create(levels)
+            written += len(levels)
+        return written
+
+    @classmethod
+    def rebuild_pyramid(cls) -> int:
+        """Build the pyramid of every measurement. Returns rows written."""
+        return cls.build_pyramid(Measurement.objects.order_by('pk').values_list('pk', flat=True))
+
+    @classmethod
+    def _aggregate(
+        cls,
+        measurement_id: int,
+        resolution: int,
+        time_sec: np.ndarray,
+        values: List[np.ndarray]
+    ) -> List[SeriesLevel]:
+        """SeriesLevel rows of one resolution (empty if not coarser than raw)."""
+        bucket = np.floor(time_sec / resolution)
+        starts = np.flatnonzero(np.diff(bucket, prepend=np.nan) != 0)
+        if len(starts) >= len(time_sec):
+            return []
+        sizes = np.diff(np.append(starts, len(time_sec)))
+
+        def level(channel: str, mins, maxs, means, counts=None, max_first=None) -> SeriesLevel:
+            return SeriesLevel(
+                measurement_id=measurement_id, resolution=resolution, channel=channel,
+                buckets=len(starts), start_sec=float(time_sec[0]), end_sec=float(time_sec[-1]),
+                mins=_pack(mins), maxs=_pack(maxs), means=_pack(means),
+                counts=_pack(counts) if counts is not None else b'',
+                max_first=max_first.astype(np.uint8).tobytes() if max_first is not None else b'',
+            )
+
+        # Row index of the first occurrence of a bucket's extreme (NaN never matches)
+        index = np.arange(len(time_sec))
+
+        def first_at(column: np.ndarray, extremes: np.ndarray) -> np.ndarray:
+            hits = column == np.repeat(extremes, sizes)
+            return np.minimum.reduceat(np.where(hits, index, len(time_sec)), starts)
+
+        levels = [level(
+            'time_sec', time_sec[starts], time_sec[starts + sizes - 1],
+            np.add.reduceat(time_sec, starts) / sizes, sizes
+        )]
+        for channel, column in zip(cls.CHANNELS, values):
+            valid = ~np.isnan(column)
+            counts = np.add.reduceat(valid, starts)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = np.add.reduceat(np.where(valid, column, 0.0), starts) / counts
+            mins = np.minimum.reduceat(np.where(valid, column, np.inf), starts)
+            maxs = np.maximum.reduceat(np.where(valid, column, -np.inf), starts)
+            empty = counts == 0
+            mins[empty] = maxs[empty] = np.nan
+            max_first = first_at(column, maxs) < first_at(column, mins)
+            levels.append(level(channel, mins, maxs, means, max_first=max_first))
+        return levels
+
+    @classmethod
+    def _load_level(
+        cls,
+        measurement_id: int,
+        channels: List[str],
+        start: Optional[float],
+        end: Optional[float],
+        points: int,
+        method: str
+    ) -> Optional[SeriesWindow]:
+        """Window from the coarsest level with >= points buckets in it (None = use raw rows)."""
+        resolution = None
+        levels = SeriesLevel.objects.filter(measurement_id=measurement_id, channel='time_sec')
+        for level, buckets, first, last in levels.order_by('-resolution').values_list(
+            'resolution', 'buckets', 'start_sec', 'end_sec'
+        ):
+            low = first if start is None else max(start, first)
+            high = last if end is None else min(end, last)
+            covered = (high - low) / (last - first) if last > first else 1.0
+            if high >= low and buckets * covered >= points:
+                resolution = level
+                break
+        if resolution is None:
+            return None
+
+        rows = {
+            row.channel: row for row in SeriesLevel.objects.filter(
+                measurement_id=measurement_id, resolution=resolution, channel__in=['time_sec', *channels]
+            )
+        }
+        if len(rows) != len(channels) + 1:
+            return None
+        first, last = _unpack(rows['time_sec'].mins), _unpack(rows['time_sec'].maxs)
+        inside = np.ones(len(first), dtype=bool)
+        if start is not None:
+            inside &= last >= start
+        if end is not None:
+            inside &= first <= end
+
+        if method == 'minmax':
+            time_sec = _interleave(first[inside], last[inside])
+            series = {}
+            for c in channels:
+                mins, maxs = _unpack(rows[c].mins)[inside], _unpack(rows[c].maxs)[inside]
+                order = bytes(rows[c].max_first)
+                if order:   # levels built before max_first: min first
+                    max_first = np.frombuffer(order, dtype=np.uint8)[inside].astype(bool)
+                    mins, maxs = np.where(max_first, maxs, mins), np.where(max_first, mins, maxs)
+                series[c] = _interleave(mins, maxs)
+        else:
+            time_sec = _unpack(rows['time_sec'].means)[inside]
+            series = {c: _unpack(rows[c].means)[inside] for c in channels}
+        return SeriesWindow(
+            measurement_id=measurement_id,
+            time_sec=time_sec,
+            channels=series,
+            total=int(_unpack(rows['time_sec'].counts)[inside].sum()),
+            start=start,
+            end=end,
+            resolution=resolution,
+        )
+
+    @classmethod
+    def _target(cls, points: Optional[int]) -> int:
+        """Requested points clamped to 2..MAX_POINTS."""
+        return min(max(int(points or cls.DEFAULT_POINTS), 2), cls.MAX_POINTS)
+
+    @staticmethod
+    def _to_columns(rows: List[tuple], width: int) -> List[np.ndarray]:
+        """Transpose value rows into float64 columns (None -> NaN)."""
+        if not rows:
+            return [np.empty(0) for _ in range(width)]
+        return [np.array(column, dtype=np.float64) for column in zip(*rows)]
+
+    @staticmethod
+    def _kept_indices(
+        time_sec: np.ndarray,
+        channels: Dict[str, np.ndarray],
+        points: int,
+        method: str
+    ) -> np.ndarray:
+        """Union of per-channel downsampling indices."""
+        if len(time_sec) <= points:
+            return np.arange(len(time_sec))
+        kept = [downsample_indices(time_sec, column, points, method) for column in channels.values()]
+        return np.unique(np.concatenate(kept)) if kept else np.arange(0)
+
+
+def _pack(values: np.ndarray) -> bytes:
+    """Array to little-endian float32 bytes."""
+    return np.asarray(values, dtype='<f4').tobytes()
+
+
+def _unpack(blob) -> np.ndarray:
+    """Little-endian float32 bytes to a float64 array."""
+    return np.frombuffer(bytes(blob), dtype='<f4').astype(np.float64)
+
+
+def _interleave(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """[a0, b0, a1, b1, ...]"""
+    result = np.empty(2 * len(a))
+    result[0::2], result[1::2] = a, b
+    return result
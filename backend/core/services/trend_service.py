@@ -0,0 +1,201 @@
+"""
+TrendService - Per-Client Longitudinal History
+
+Maintains TrendPoint rows (one per measurement) and serves client
+histories from them in a single indexed query.
+
+Refresh triggers (see core.signals):
+- Import, item edits, use_in_report toggles: peaks recomputed
+- Threshold set_manual / reset_to_auto: threshold powers recomputed
+- Measurement edits: date, test type, use_in_report copied
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 2)
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from django.db.models import Max, Q
+
+from core.models import Measurement, Threshold, TrendPoint
+
+
+class TrendService:
+    """
+    Service for the materialized longitudinal trend store.
+    """
+
+    # Threshold type -> TrendPoint column
+    THRESHOLD_FIELDS: Dict[str, str] = {
+        Threshold.ThresholdType.AET: 'aet_power',
+        Threshold.ThresholdType.ANT: 'ant_power',
+        Threshold.ThresholdType.VO2MAX: 'vo2max_power',
+        Threshold.ThresholdType.DO2: 'do2_power',
+        Threshold.ThresholdType.MAM: 'mam_power',
+    }
+
+    PEAK_FIELDS = ['vo2max', 'vo2max_abs', 'hrmax', 'peak_power']
+
+    # Columns returned by history queries
+    HISTORY_FIELDS = [
+        'measurement_id', 'client_id', 'measurement_date', 'test_type',
+        'use_in_report', *PEAK_FIELDS, *THRESHOLD_FIELDS.values(),
+    ]
+
+    # Measurements refreshed per query during rebuild
+    REBUILD_BATCH_SIZE = 500
+
+    @classmethod
+    def get_client_history(
+        cls,
+        client_id: int,
+        test_type: Optional[str] = None,
+        include_excluded: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Full history of a client, newest first (one indexed read).
+
+        Args:
+            client_id: Client ID
+            test_type: Optional test type filter
+            include_excluded: Include measurements with use_in_report=False
+
+        Returns:
+            List of dicts with HISTORY_FIELDS
+        """
+        return cls.get_histories([client_id], test_type, include_excluded).get(client_id, [])
+
+    @classmethod
+    def get_histories(
+        cls,
+        client_ids: Iterable[int],
+        test_type: Optional[str] = None,
+        include_excluded: bool = False
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Histories of many clients at once (one query for a whole page).
+
+        Returns:
+            {client_id: [history rows, newest first]}
+        """
+        qs = TrendPoint.objects.filter(client_id__in=list(client_ids))
+        if test_type:
+            qs = qs.filter(test_type=test_type)
+        if not include_excluded:
+            qs = qs.filter(use_in_report=True)
+
+        histories: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for row in qs.order_by('client_id', '-measurement_date').values(*cls.HISTORY_FIELDS):
+            histories[row['client_id']].append(row)
+        return dict(histories)
+
+    @classmethod
+    def get_peaks(cls, measurement_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Peak values for many measurements (one query).
+
+        Returns:
+            {measurement_id: {'vo2max', 'hrmax', 'power'}} - same keys
+            as ComparisonService._get_peaks
+        """
+        rows = TrendPoint.objects.filter(
+            measurement_id__in=list(measurement_ids)
+        ).values_list('measurement_id', 'vo2max', 'hrmax', 'peak_power')
+        return {
+            mid: {'vo2max': vo2max, 'hrmax': hrmax, 'power': power}
+            for mid, vo2max, hrmax, power in rows
+        }
+
+    @classmethod
+    def refresh(cls, measurement_ids: Iterable[int]) -> Set[int]:
+        """
+        Recompute trend rows for measurements (upsert).
+
+        Three queries regardless of count: peaks aggregate, thresholds,
+        existing rows; then one bulk upsert.
+
+        Returns:
+            IDs whose cohort-relevant values (peaks, test type,
+            use_in_report) changed or that are new
+        """
+        ids = list(measurement_ids)
+        if not ids:
+            return set()
+
+        included = Q(items__use_in_report=True)
+        rows = Measurement.objects.filter(pk__in=ids).annotate(
+            vo2max=Max('items__vo2_ml_kg_min', filter=included),
+            vo2max_abs=Max('items__vo2_ml_min', filter=included),
+            hrmax=Max('items__hr', filter=included),
+            peak_power=Max('items__power', filter=included),
+        ).values(
+            'id', 'client_id', 'measurement_date', 'test_type',
+            'use_in_report', *cls.PEAK_FIELDS
+        )
+
+        threshold_powers: Dict[int, Dict[str, int]] = defaultdict(dict)
+        thresholds = Threshold.objects.filter(measurement_id__in=ids).values_list(
+            'measurement_id', 'threshold_type', 'power'
+        )
+        for mid, threshold_type, power in thresholds:
+            field_name = cls.THRESHOLD_FIELDS.get(threshold_type)
+            if field_name:
+                threshold_powers[mid][field_name] = power
+
+        existing = {
+            row['measurement_id']: row
+            for row in TrendPoint.objects.filter(measurement_id__in=ids).values(
+                'measurement_id', 'test_type', 'use_in_report', *cls.PEAK_FIELDS
+            )
+        }
+
+        points = []
+        changed = set()
+        for row in rows:
+            mid = row['id']
+            values = {name: row[name] for name in cls.PEAK_FIELDS}
+            values.update({name: None for name in cls.THRESHOLD_FIELDS.values()})
+            values.update(threshold_powers.get(mid, {}))
+
+            before = existing.get(mid)
+            cohort_values = {
+                'test_type': row['test_type'],
+                'use_in_report': row['use_in_report'],
+                **{name: row[name] for name in cls.PEAK_FIELDS},
+            }
+            if before is None or any(before[k] != v for k, v in cohort_values.items()):
+                changed.add(mid)
+
+            points.append(TrendPoint(
+                measurement_id=mid,
+                client_id=row['client_id'],
+                measurement_date=row['measurement_date'],
+                test_type=row['test_type'],
+                use_in_report=row['use_in_report'],
+                **values
+            ))
+
+        TrendPoint.objects.bulk_create(
+            points,
+            update_conflicts=True,
+            unique_fields=['measurement'],
+            update_fields=[
+                'client', 'measurement_date', 'test_type', 'use_in_report',
+                *cls.PEAK_FIELDS, *cls.THRESHOLD_FIELDS.values(), 'updated_at',
+            ]
+        )
+        return changed
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recreate trend rows for all measurements.
+
+        Returns:
+            Number of rows written
+        """
+        TrendPoint.objects.all().delete()
+        ids = list(Measurement.objects.order_by('pk').values_list('pk', flat=True))
+        for start in range(0, len(ids), cls.REBUILD_BATCH_SIZE):
+            cls.refresh(ids[start:start + cls.REBUILD_BATCH_SIZE])
+        return len(ids)
@@ -0,0 +1,255 @@
+"""
+Change Propagation - Model Signals
+
+Single "measurement data changed" event for all derived stores
+(trend store, population norms, chart pyramids, lactate fits, generated
+reports, ...). Subscribers listen to `measurements_changed` instead of
+watching every model separately.
+
+Event sources:
+- MeasurementService.import_file (bulk insert bypasses post_save)
+- MeasurementItem saves (admin edits, use_in_report toggles); item
+  deletes are not tracked, see _item_changed
+- Threshold saves/deletes (set_manual, reset_to_auto)
+- Measurement saves/deletes, Client saves (use_in_report, test type,
+  gender, birthdate)
+
+Events are dispatched after the surrounding transaction commits and
+coalesced per transaction: all notifications with the same reason and
+previous values become one event with the union of the IDs, so a bulk
+edit in one transaction (admin list_editable, artifact detection)
+refreshes the derived stores once instead of once per row.
+Every event bumps Measurement.data_version / data_changed_at, the
+validators of HTTP conditional requests (core/views/caching.py).
+
+DOCUMENTATION:
+    Spec: implementation_plan.md
+"""
+import threading
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from core.models import Client, Measurement, MeasurementItem, Threshold
+
+# Sent with: measurement_ids (list[int]), reason (str), previous (dict | None)
+measurements_changed = Signal()
+
+# Notifications of the current thread's open transaction:
+# (reason, previous key) -> (measurement IDs, previous)
+_pending = threading.local()
+
+
+class ChangeReason:
+    """Values of the `reason` argument of measurements_changed."""
+    IMPORT = 'import'
+    ITEMS = 'items'
+    THRESHOLDS = 'thresholds'
+    MEASUREMENT = 'measurement'
+    CLIENT = 'client'
+
+
+def notify_measurements_changed(
+    measurement_ids: Iterable[int],
+    reason: str,
+    previous: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Announce changed measurements once the current transaction commits.
+
+    Within a transaction, notifications are merged (see module docstring)
+    and sent by one on_commit callback; outside, they are sent at once.
+
+    Args:
+        measurement_ids: IDs of affected measurements
+        reason: ChangeReason value
+        previous: Values before the edit (test_type, gender, client fields,
+            threshold_type)
+    """
+    ids = {i for i in measurement_ids if i is not None}
+    if not ids:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _send(ids, reason, previous)
+        return
+
+    batch = getattr(_pending, 'batch', None)
+    # A rolled-back transaction drops the flush callback: start over
+    if batch is None or not any(func is _flush for _, func, _ in connection.run_on_commit):
+        batch = _pending.batch = {}
+        transaction.on_commit(_flush)
+    key = (reason, repr(sorted(previous.items())) if previous else None)
+    batch.setdefault(key, (set(), previous))[0].update(ids)
+
+
+def _flush() -> None:
+    """Send the merged notifications of the committed transaction."""
+    batch: Dict[Tuple[str, Optional[str]], Tuple[Set[int], Any]] = getattr(_pending, 'batch', None) or {}
+    _pending.batch = None
+    for (reason, _), (ids, previous) in batch.items():
+        _send(ids, reason, previous)
+
+
+def _send(ids: Set[int], reason: str, previous: Optional[Dict[str, Any]]) -> None:
+    measurements_changed.send(
+        sender=Measurement,
+        measurement_ids=sorted(ids),
+        reason=reason,
+        previous=previous
+    )
+
+
+# ----------------------------------------------------------------------
+# Model -> measurements_changed
+# ----------------------------------------------------------------------
+
+# post_save only: a post_delete receiver would disable fast cascade
+# deletion of the (large) item set when a measurement is removed.
+@receiver(post_save, sender=MeasurementItem)
+def _item_changed(sender, instance, **kwargs):
+    """Single item edited in admin or toggled use_in_report."""
+    notify_measurements_changed([instance.measurement_id], ChangeReason.ITEMS)
+
+
+@receiver([post_save, post_delete], sender=Threshold)
+def _threshold_changed(sender, instance, **kwargs):
+    """Threshold set manually, reset to auto or removed."""
+    notify_measurements_changed(
+        [instance.measurement_id], ChangeReason.THRESHOLDS,
+        previous={'threshold_type': instance.threshold_type}
+    )
+
+
+@receiver(pre_save, sender=Measurement)
+def _remember_measurement(sender, instance, **kwargs):
+    """Keep cohort attributes before edit (for moving between cohorts)."""
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = Measurement.objects.filter(pk=instance.pk).values(
+            'test_type', 'use_in_report', gender=F('client__gender')
+        ).first()
+
+
+@receiver(post_save, sender=Measurement)
+def _measurement_changed(sender, instance, created, **kwargs):
+    """Measurement edited (new ones are announced by the importer)."""
+    if created:
+        return
+    notify_measurements_changed(
+        [instance.pk], ChangeReason.MEASUREMENT,
+        previous=getattr(instance, '_previous_state', None)
+    )
+
+
+@receiver(pre_delete, sender=Measurement)
+def _remember_deleted_measurement(sender, instance, **kwargs):
+    """Keep the cohort while the client still exists (a client delete cascades)."""
+    instance._previous_state = {
+        'test_type': instance.test_type,
+        'gender': Client.objects.filter(pk=instance.client_id).values_list(
+            'gender', flat=True
+        ).first(),
+    }
+
+
+@receiver(post_delete, sender=Measurement)
+def _measurement_deleted(sender, instance, **kwargs):
+    """Measurement removed: its former cohort must forget it."""
+    notify_measurements_changed(
+        [instance.pk], ChangeReason.MEASUREMENT,
+        previous=getattr(instance, '_previous_state', None)
+    )
+
+
+@receiver(pre_save, sender=Client)
+def _remember_client(sender, instance, **kwargs):
+    """Keep demographic and report-visible values before edit."""
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = Client.objects.filter(pk=instance.pk).values(
+            'name', 'last_name', 'second_name', 'gender', 'birthdate', 'height', 'weight'
+        ).first()
+
+
+@receiver(post_save, sender=Client)
+def _client_changed(sender, instance, created, **kwargs):
+    """Client edited: all of their measurements are affected."""
+    if created:
+        return
+    measurement_ids = list(instance.measurements.values_list('id', flat=True))
+    notify_measurements_changed(
+        measurement_ids, ChangeReason.CLIENT,
+        previous=getattr(instance, '_previous_state', None)
+    )
+
+
+# ----------------------------------------------------------------------
+# measurements_changed -> derived stores
+# ----------------------------------------------------------------------
+
+@receiver(measurements_changed)
+def _bump_data_version(sender, measurement_ids, reason, previous=None, **kwargs):
+    """Invalidate ETags of the changed measurements (UPDATE sends no signals)."""
+    Measurement.objects.filter(pk__in=measurement_ids).update(
+        data_version=F('data_version') + 1,
+        data_changed_at=timezone.now()
+    )
+
+
+@receiver(measurements_changed)
+def _refit_lactate(sender, measurement_ids, reason, previous=None, **kwargs):
+    """Refit lactate curves whose points may have changed (before reports are flagged)."""
+    from core.services.lactate_service import LactateService
+
+    if reason in (ChangeReason.IMPORT, ChangeReason.ITEMS, ChangeReason.THRESHOLDS):
+        LactateService.refresh(measurement_ids)
+
+
+@receiver(measurements_changed)
+def _update_trends_norms_and_reports(sender, measurement_ids, reason, previous=None, **kwargs):
+    """
+    Keep trend store, population sketches and stored reports in sync.
+
+    Norms and reports read peaks from the trend store, so trends go
+    first; item edits that leave the peaks unchanged skip the norms
+    rebuild and flag only reports reading items directly.
+    """
+    from core.services.generated_report_service import GeneratedReportService
+    from core.services.norms_service import NormsService
+    from core.services.trend_service import TrendService
+
+    changed = TrendService.refresh(measurement_ids)
+    GeneratedReportService.on_measurements_changed(measurement_ids, reason, previous, peaks_changed=changed)
+    if reason == ChangeReason.ITEMS:
+        measurement_ids = [i for i in measurement_ids if i in changed]
+        if not measurement_ids:
+            return
+    NormsService.on_measurements_changed(measurement_ids, reason, previous)
+
+
+@receiver(measurements_changed)
+def _rebuild_series_pyramid(sender, measurement_ids, reason, previous=None, **kwargs):
+    """Re-aggregate chart levels when rows were imported or edited."""
+    from core.services.series_service import SeriesService
+
+    if reason in (ChangeReason.IMPORT, ChangeReason.ITEMS):
+        SeriesService.build_pyramid(measurement_ids)
+
+
+# ----------------------------------------------------------------------
+# Client search
+# ----------------------------------------------------------------------
+
+@receiver(post_migrate)
+def _prepare_client_search(sender, **kwargs):
+    """Search keys of existing clients; pg_trgm index on PostgreSQL."""
+    if sender.name != 'core':
+        return
+    from core.services.client_search_service import ClientSearchService
+
+    ClientSearchService.prepare()
@@ -0,0 +1,18 @@
+"""API URL configuration (mounted at /api/ in config/urls.py)."""
+from django.urls import path
+
+from core import views
+
+urlpatterns = [
+    path('clients/', views.client_list, name='client-list'),
+    path('clients/search/', views.client_search, name='client-search'),
+    path('measurements/', views.measurement_list, name='measurement-list'),
+    path('measurements/<int:measurement_id>/series/', views.measurement_series, name='measurement-series'),
+    path('measurements/<int:measurement_id>/report/', views.measurement_report, name='measurement-report'),
+    path('exports/', views.measurement_export, name='measurement-export'),
+    path('comparisons/', views.comparison, name='comparison'),
+    path('live/', views.live_start, name='live-start'),
+    path('live/<int:measurement_id>/samples/', views.live_samples, name='live-samples'),
+    path('live/<int:measurement_id>/finish/', views.live_finish, name='live-finish'),
+    path('live/<int:measurement_id>/events/', views.live_events, name='live-events'),
+]
@@ -0,0 +1,29 @@
+"""
+VO2max Report - HTTP API
+
+JSON endpoints under /api/ (core/urls.py) and the dashboard page.
+
+DOCUMENTATION:
+    Spec: implementation_plan.md (Phase 3)
+"""
+from .comparison import comparison
+from .export import measurement_export
+from .listing import client_list, client_search, measurement_list
+from .live import live_events, live_finish, live_samples, live_start
+from .report import measurement_report
+from .series import dashboard, measurement_series
+
+__all__ = [
+    'client_list',
+    'client_search',
+    'comparison',
+    'dashboard',
+    'live_events',
+    'live_finish',
+    'live_samples',
+    'live_start',
+    'measurement_export',
+    'measurement_list',
+    'measurement_report',
+    'measurement_series',
+]
@@ -0,0 +1,114 @@
+"""
+Conditional Requests - ETag / Last-Modified for Measurement Resources
+
+Validators come from one cheap query over the measurements a response
+is built from:
+- Measurement.updated_at (the row itself)
+- Measurement.data_version / data_changed_at (bumped by core.signals on
+  item edits, use_in_report toggles, threshold and client changes)
+- latest Threshold.updated_at
+
+If the client's If-None-Match / If-Modified-Since still match, the view
+answers 304 without running; otherwise ETag and Last-Modified are set
+on the fresh response, with Cache-Control: private, no-cache so that
+browsers revalidate on every reload instead of guessing freshness.
+
+Works on sync and async views (validators of async views are read in
+the database pool, core/views/offload.py).
+
+Usage:
+    @conditional_on_measurements(lambda request, measurement_id: [measurement_id])
+    def view(request, measurement_id): ...
+"""
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.models import Max
+from django.http import HttpRequest
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from core.models import Measurement
+
+# Part of every ETag: bump when response formats change
+API_VERSION = '1'
+
+
+def measurement_validators(measurement_ids: Sequence[int]) -> Optional[Tuple[str, datetime]]:
+    """
+    (ETag, Last-Modified) of a set of measurements.
+
+    Returns None if any measurement does not exist (the view decides).
+    """
+    ids = sorted(set(measurement_ids))
+    rows = list(Measurement.objects.filter(pk__in=ids).annotate(
+        thresholds_changed=Max('thresholds__updated_at')
+    ).order_by('pk').values_list(
+        'pk', 'data_version', 'updated_at', 'data_changed_at', 'thresholds_changed'
+    ))
+    if not rows or len(rows) != len(ids):
+        return None
+
+    digest = hashlib.sha1(API_VERSION.encode())
+    for pk, version, updated, data_changed, thresholds_changed in rows:
+        digest.update(f"{pk}:{version}:{updated.isoformat()}:{data_changed}:{thresholds_changed};".encode())
+    last_modified = max(
+        stamp for row in rows for stamp in row[2:] if stamp is not None
+    )
+    return digest.hexdigest(), last_modified
+
+
+def conditional_on_measurements(get_ids: Callable[..., Optional[List[int]]]):
+    """
+    View decorator: 304 for unchanged measurement data.
+
+    Args:
+        get_ids: (request, *args, **kwargs) -> measurement IDs the response
+            depends on (None = not conditional, e.g. malformed request)
+    """
+    def decorator(view):
+        def check(request: HttpRequest, validators):
+            """(304 response or None, headers setter)."""
+            etag, last_modified = validators
+            etag = quote_etag(etag)
+            timestamp = int(last_modified.timestamp())
+
+            def set_headers(response):
+                if response.status_code == 200:
+                    response.headers.setdefault('ETag', etag)
+                    response.headers.setdefault('Last-Modified', http_date(timestamp))
+                    patch_cache_control(response, private=True, no_cache=True)
+                return response
+            return get_conditional_response(request, etag=etag, last_modified=timestamp), set_headers
+
+        if iscoroutinefunction(view):
+            from core.views.offload import database
+
+            async def async_wrapper(request: HttpRequest, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+                ids = get_ids(request, *args, **kwargs)
+                validators = await database(measurement_validators, ids) if ids else None
+                if validators is None:
+                    return await view(request, *args, **kwargs)
+                not_modified, set_headers = check(request, validators)
+                return not_modified or set_headers(await view(request, *args, **kwargs))
+
+            markcoroutinefunction(async_wrapper)
+            return wraps(view)(async_wrapper)
+
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            ids = get_ids(request, *args, **kwargs)
+            validators = measurement_validators(ids) if ids else None
+            if validators is None:
+                return view(request, *args, **kwargs)
+            not_modified, set_headers = check(request, validators)
+            return not_modified or set_headers(view(request, *args, **kwargs))
+        return wrapper
+    return decorator
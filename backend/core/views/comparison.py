@@ -0,0 +1,72 @@
+"""
+Comparison API - Tests of One Client Side by Side
+
+GET /api/comparisons/?ids=7,12,15&metric=hr
+    ids      measurement IDs (compared in test date order)
+    metric   MeasurementItem field for the power-aligned table (default hr)
+
+Response:
+    {"metric", "columns": [...], "rows": [{"power", "values": {id: value}}],
+     "deltas": [{"from", "to", "days", "vo2max_delta", "hrmax_delta", "power_delta",
+                 "lactate_2mmol_delta", "lactate_4mmol_delta", "dmax_delta"}]}
+    Lactate (metric=lactat and the marker deltas, W) comes from the
+    fitted curves (LactateFit); marker deltas are null without a fit.
+
+Conditional: ETag / Last-Modified over all compared measurements.
+
+Async view: the table and dynamics (ORM reads plus alignment) run in
+the database pool (core/views/offload.py).
+"""
+from typing import List, Optional
+
+from django.http import Http404, HttpRequest, JsonResponse
+from django.views.decorators.http import require_GET
+
+from core.models import Measurement
+from core.services.comparison_service import ComparisonService
+from core.views.caching import conditional_on_measurements
+from core.views.offload import database
+
+# Fields accepted as ?metric=
+METRICS = ['hr', 'vo2_ml_min', 'vo2_ml_kg_min', 've', 'rf', 'tv', 'lactat', 'r', 'o2_pulse']
+
+
+def _parse_ids(request: HttpRequest) -> Optional[List[int]]:
+    """?ids=1,2,3 -> [1, 2, 3] (None if malformed)."""
+    try:
+        ids = [int(i) for i in request.GET.get('ids', '').split(',') if i]
+    except ValueError:
+        return None
+    return ids or None
+
+
+@require_GET
+@conditional_on_measurements(lambda request: _parse_ids(request))
+async def comparison(request: HttpRequest) -> JsonResponse:
+    """Power-aligned table and dynamics for the given measurements."""
+    ids = _parse_ids(request)
+    metric = request.GET.get('metric', 'hr')
+    if not ids:
+        return JsonResponse({'error': 'ids must be a comma-separated list of measurement IDs'}, status=400)
+    if metric not in METRICS:
+        return JsonResponse({'error': f"Unknown metric: {metric}"}, status=400)
+
+    table = await database(_build, ids, metric)
+    if table is None:
+        raise Http404("Measurement not found")
+    return JsonResponse(table)
+
+
+def _build(ids: List[int], metric: str) -> Optional[dict]:
+    """Comparison payload (None if a measurement is missing)."""
+    measurements = list(Measurement.objects.filter(pk__in=ids).order_by('measurement_date'))
+    if len(measurements) != len(set(ids)):
+        return None
+
+    table = ComparisonService.to_dict(ComparisonService.build_power_aligned_table(measurements, metric))
+    dynamics = ComparisonService.calculate_dynamics(measurements)
+    table['deltas'] = [
+        {**delta, 'from': delta['from'].isoformat(), 'to': delta['to'].isoformat()}
+        for delta in dynamics['deltas']
+    ]
+    return table
@@ -0,0 +1,53 @@
+"""
+Export API - Streaming Bulk Download of Measurement Series
+
+GET /api/exports/?ids=7,12&client=12&test_type=CYCLING&format=csv|parquet&all=1
+    ids, client, test_type   filters (combined; at least one is required)
+    all=1                    include rows excluded from the report
+                             (adds a use_in_report column)
+
+The file is streamed measurement by measurement (COPY on PostgreSQL,
+core/services/export_service.py); memory does not grow with the cohort.
+Parquet requires pyarrow (501 otherwise).
+
+Async view: the export generator runs on one database pool thread
+(offload.aiter_database), holding its cursor for the whole download
+while the event loop only passes chunks on.
+"""
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from core.services.export_service import FORMATS, ExportService
+from core.views.offload import aiter_database, database
+
+CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8', 'parquet': 'application/vnd.apache.parquet'}
+
+
+@require_GET
+async def measurement_export(request: HttpRequest) -> HttpResponse:
+    """Series of the selected measurements as one CSV / Parquet file."""
+    output = request.GET.get('format', 'csv')
+    if output not in FORMATS:
+        return JsonResponse({'error': f"Unknown format: {output}"}, status=400)
+    try:
+        ids = [int(i) for i in request.GET.get('ids', '').split(',') if i]
+        client_id = int(request.GET['client']) if request.GET.get('client') else None
+    except ValueError:
+        return JsonResponse({'error': 'ids and client must be integers'}, status=400)
+    test_type = request.GET.get('test_type') or None
+    if not (ids or client_id or test_type):
+        return JsonResponse({'error': 'Select measurements with ids, client or test_type'}, status=400)
+
+    measurement_ids = await database(ExportService.select, ids, client_id, test_type)
+    include_excluded = request.GET.get('all') == '1'
+    try:
+        if output == 'parquet':
+            chunks = ExportService.iter_parquet(measurement_ids, include_excluded)
+        else:
+            chunks = ExportService.iter_csv(measurement_ids, include_excluded)
+    except ImportError as exc:
+        return JsonResponse({'error': str(exc)}, status=501)
+
+    response = StreamingHttpResponse(aiter_database(chunks), content_type=CONTENT_TYPES[output])
+    response['Content-Disposition'] = f'attachment; filename="measurements.{output}"'
+    return response
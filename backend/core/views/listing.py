@@ -0,0 +1,74 @@
+"""
+List API - Keyset-Paginated Clients and Tests
+
+GET /api/clients/?limit=50&cursor=...
+GET /api/measurements/?limit=50&cursor=...&client=12&test_type=CYCLING
+
+Response:
+    {"results": [...], "next": "<cursor>" | null}
+
+Pass "next" back as ?cursor= for the following page; every page costs
+the same, however deep (core/services/listing_service.py).
+
+GET /api/clients/search/?q=петров ив&limit=20
+    {"results": [{"id", "last_name", "name", "second_name", "gender",
+                  "birthdate", "score"}]}   best match first
+    Partial, misspelled, Latin or reordered names
+    (core/services/client_search_service.py).
+"""
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import require_GET
+
+from core.services.client_search_service import ClientSearchService
+from core.services.listing_service import ListingService, Page
+
+
+def _page_response(page: Page) -> JsonResponse:
+    return JsonResponse({'results': page.rows, 'next': page.next_cursor})
+
+
+@require_GET
+def client_list(request: HttpRequest) -> JsonResponse:
+    """Clients by last name, name."""
+    try:
+        page = ListingService.list_clients(
+            cursor=request.GET.get('cursor') or None,
+            limit=int(request.GET['limit']) if request.GET.get('limit') else None,
+        )
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return _page_response(page)
+
+
+@require_GET
+def measurement_list(request: HttpRequest) -> JsonResponse:
+    """Tests newest first, optionally of one client / test type."""
+    try:
+        page = ListingService.list_measurements(
+            cursor=request.GET.get('cursor') or None,
+            limit=int(request.GET['limit']) if request.GET.get('limit') else None,
+            client_id=int(request.GET['client']) if request.GET.get('client') else None,
+            test_type=request.GET.get('test_type') or None,
+        )
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return _page_response(page)
+
+
+@require_GET
+def client_search(request: HttpRequest) -> JsonResponse:
+    """Clients ranked by name similarity to ?q=."""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'q is required'}, status=400)
+    try:
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+    results = []
+    for found in ClientSearchService.search(query, limit):
+        row = {field: getattr(found.client, field) for field in ListingService.CLIENT_FIELDS}
+        row['score'] = round(found.score, 3)
+        results.append(row)
+    return JsonResponse({'results': results})
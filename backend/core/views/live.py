@@ -0,0 +1,134 @@
+"""
+Live API - Streaming Ingest and Updates of a Running Test
+
+POST /api/live/                       {"setup": {...}, "client_id": 12}
+    -> 201 {"measurement_id": 57}
+POST /api/live/<id>/samples/          NDJSON body, one dataMap entry per line:
+                                      [5, {"O2_Flow": 1462, "HR": 112, "Power": 100}]
+    -> {"accepted": 20}
+    The body is read line by line, so a chunked upload can stay open
+    for the whole test (under a server that passes chunked bodies on).
+POST /api/live/<id>/finish/           -> {"measurement_id", "items"}
+GET  /api/live/<id>/events/           text/event-stream (Server-Sent Events):
+    data: {"type": "samples", "time_sec": [...], "channels": {...},
+           "stage": {...}, "peaks": {...}}
+    first event "state" (current aggregates), last event "finished"
+    Async view: waiting for updates holds no worker thread; a keep-alive
+    comment every KEEPALIVE_SEC also expires idle sessions.
+
+Sessions are in-process (core/services/live_service.py); a session with
+no samples for LiveService.IDLE_TIMEOUT_SEC is finished automatically.
+"""
+import asyncio
+import json
+import queue
+from typing import AsyncIterator, Iterator
+
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from core.models import Client
+from core.services.live_service import LiveService, LiveSession
+from core.views.offload import database
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_SEC = 15
+
+
+def _session_or_404(measurement_id: int):
+    try:
+        return LiveService.get(measurement_id), None
+    except KeyError:
+        return None, JsonResponse({'error': f"No live session for measurement {measurement_id}"}, status=404)
+
+
+@csrf_exempt
+@require_POST
+def live_start(request: HttpRequest) -> JsonResponse:
+    """Open a live session (creates the measurement)."""
+    try:
+        body = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Body must be JSON'}, status=400)
+    client = None
+    if body.get('client_id'):
+        client = Client.objects.filter(pk=body['client_id']).first()
+        if client is None:
+            return JsonResponse({'error': f"Client {body['client_id']} not found"}, status=404)
+    session = LiveService.start(setup=body.get('setup'), client=client)
+    return JsonResponse({'measurement_id': session.measurement.pk}, status=201)
+
+
+@csrf_exempt
+@require_POST
+def live_samples(request: HttpRequest, measurement_id: int) -> JsonResponse:
+    """Append NDJSON samples as they are read from the request body."""
+    session, error = _session_or_404(measurement_id)
+    if error:
+        return error
+
+    def entries() -> Iterator[list]:
+        for line in request:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    try:
+        accepted = session.append(entries())
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=409)
+    return JsonResponse({'accepted': accepted})
+
+
+@csrf_exempt
+@require_POST
+def live_finish(request: HttpRequest, measurement_id: int) -> JsonResponse:
+    """Flush and close the session."""
+    try:
+        items = LiveService.finish(measurement_id)
+    except KeyError:
+        return JsonResponse({'error': f"No live session for measurement {measurement_id}"}, status=404)
+    return JsonResponse({'measurement_id': measurement_id, 'items': items})
+
+
+async def aiter_events(session: LiveSession, keepalive: float = KEEPALIVE_SEC) -> AsyncIterator[str]:
+    """Server-Sent Events of a session until it finishes."""
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    q = session.subscribe(notify=lambda: loop.call_soon_threadsafe(ready.set))
+    try:
+        while True:
+            try:
+                update = q.get_nowait()
+            except queue.Empty:
+                ready.clear()
+                if not q.empty():
+                    continue
+                try:
+                    await asyncio.wait_for(ready.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    await database(LiveService.expire_idle)
+                continue
+            yield f"event: {update['type']}\ndata: {json.dumps(update)}\n\n"
+            if update['type'] == 'finished':
+                return
+    finally:
+        session.unsubscribe(q)
+
+
+@require_GET
+async def live_events(request: HttpRequest, measurement_id: int):
+    """Push updates of a running test to the dashboard."""
+    session, error = await database(_session_or_404, measurement_id)
+    if error:
+        return error
+    response = StreamingHttpResponse(aiter_events(session), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
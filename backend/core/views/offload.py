@@ -0,0 +1,127 @@
+"""
+Offloading for Async Views - Bounded Executors
+
+Async views (served by config/asgi.py) never block the event loop:
+- database(): ORM reads in a pool of ASYNC_DB_WORKERS threads. Unlike
+  sync_to_async's default thread-sensitive mode, requests do not queue
+  behind one shared thread; each pool thread keeps its own connection
+  (recycled per CONN_MAX_AGE), so at most ASYNC_DB_WORKERS connections
+  are open per process.
+- compute(): CPU-heavy steps (WeasyPrint layout, NumPy downsampling) in
+  a pool of ASYNC_CPU_WORKERS threads, so a long PDF render occupies one
+  slot instead of the whole process and excess work waits in the queue.
+- aiter_database(): a cursor-backed chunk generator (bulk export) run in
+  the database pool and streamed to the client one chunk at a time.
+
+Under WSGI the same views run in Django's per-request event loop.
+
+Usage:
+    window = await database(SeriesService.load, measurement_id)
+    window = await compute(SeriesService.reduce, window, 800)
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def _executor(name: str, setting: str, default: int) -> ThreadPoolExecutor:
+    """Process-wide executor, created on first use."""
+    with _lock:
+        if name not in _executors:
+            workers = getattr(settings, setting, None) or default
+            _executors[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'vo2-{name}')
+        return _executors[name]
+
+
+def _with_connection(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Call fn on a usable connection (pool threads never see request_finished)."""
+    close_old_connections()
+    return fn(*args, **kwargs)
+
+
+async def database(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a synchronous ORM call in the database pool."""
+    executor = _executor('db', 'ASYNC_DB_WORKERS', 8)
+    return await sync_to_async(_with_connection, thread_sensitive=False, executor=executor)(fn, *args, **kwargs)
+
+
+async def compute(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a CPU-heavy call in the compute pool."""
+    executor = _executor('cpu', 'ASYNC_CPU_WORKERS', os.cpu_count() or 2)
+    return await sync_to_async(fn, thread_sensitive=False, executor=executor)(*args, **kwargs)
+
+
+async def aiter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Async iterator over in-memory chunks (for StreamingHttpResponse under ASGI)."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def aiter_database(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Async iterator over a synchronous generator that reads the database.
+
+    The generator is driven by one database() call, so all its queries
+    (and an open server-side cursor) stay on one pool thread and its
+    connection. It runs at most one chunk ahead of the client; when the
+    client goes away it is closed on that thread.
+    """
+    loop = asyncio.get_running_loop()
+    handoff: asyncio.Queue = asyncio.Queue(maxsize=1)
+    stop = threading.Event()
+    end = object()
+
+    def hand_over(item) -> bool:
+        future = asyncio.run_coroutine_threadsafe(handoff.put(item), loop)
+        while not stop.is_set():
+            try:
+                future.result(timeout=1)
+                return True
+            except FutureTimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    def produce() -> None:
+        iterator = iter(chunks)
+        try:
+            for chunk in iterator:
+                if not hand_over((chunk, None)):
+                    return
+            hand_over((end, None))
+        except Exception as exc:
+            hand_over((None, exc))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def failed(task: asyncio.Future) -> None:
+        # database() itself failed (e.g. on connect): nothing will be handed over
+        if not task.cancelled() and task.exception() is not None and handoff.empty():
+            handoff.put_nowait((None, task.exception()))
+
+    producer = asyncio.ensure_future(database(produce))
+    producer.add_done_callback(failed)
+    try:
+        while True:
+            chunk, error = await handoff.get()
+            if error is not None:
+                raise error
+            if chunk is end:
+                break
+            yield chunk
+        await producer
+    finally:
+        stop.set()
+        while not handoff.empty():
+            handoff.get_nowait()
@@ -0,0 +1,70 @@
+"""
+Report API - Rendered Report of a Measurement
+
+GET /api/measurements/<id>/report/
+    ?template=default_report|detailed_report   (ReportGenerator templates)
+    &format=html|pdf
+    &compare_with=12                           second test (detailed_report)
+
+The payload is assembled in the database pool and rendered in the compute
+pool (core/views/offload.py): a PDF that takes seconds to lay out holds one
+of ASYNC_CPU_WORKERS threads, never the event loop. Rendered outputs go
+through ReportGenerator's cache.
+
+Conditional: ETag / Last-Modified over the measurement(s).
+"""
+from typing import List, Optional
+
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from core.models import Measurement
+from core.reports.generator import ReportGenerator
+from core.services.report_service import ReportService
+from core.views.caching import conditional_on_measurements
+from core.views.offload import compute, database
+
+
+def _report_ids(request: HttpRequest, measurement_id: int) -> Optional[List[int]]:
+    """Measurements the report depends on (None if compare_with is malformed)."""
+    compare_with = request.GET.get('compare_with', '')
+    if not compare_with:
+        return [measurement_id]
+    try:
+        return [measurement_id, int(compare_with)]
+    except ValueError:
+        return None
+
+
+@require_GET
+@conditional_on_measurements(_report_ids)
+async def measurement_report(request: HttpRequest, measurement_id: int) -> HttpResponse:
+    """HTML or PDF report of a measurement."""
+    template = request.GET.get('template', 'default_report')
+    output = request.GET.get('format', 'html')
+    ids = _report_ids(request, measurement_id)
+    if ids is None:
+        return JsonResponse({'error': 'compare_with must be a measurement ID'}, status=400)
+    if output not in ('html', 'pdf'):
+        return JsonResponse({'error': f"Unknown format: {output}"}, status=400)
+
+    generator = ReportGenerator()
+    if template not in generator.list_templates():
+        return JsonResponse({'error': f"Unknown template: {template}"}, status=400)
+
+    try:
+        data = await database(ReportService.build, template, measurement_id, *ids[1:])
+    except Measurement.DoesNotExist:
+        raise Http404(f"Measurement {measurement_id} not found")
+
+    if output == 'html':
+        html_content = await compute(generator.render_html, data, template)
+        return HttpResponse(html_content, content_type='text/html; charset=utf-8')
+
+    try:
+        pdf_bytes = await compute(generator.generate_pdf, data, template)
+    except ImportError as exc:
+        return JsonResponse({'error': f"PDF rendering unavailable: {exc}"}, status=501)
+    response = HttpResponse(pdf_bytes, content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename="report_{measurement_id}.pdf"'
+    return response
@@ -0,0 +1,148 @@
+"""
+Series API - Downsampled Measurement Channels
+
+GET /api/measurements/<id>/series/
+    ?channels=vo2_ml_kg_min,hr,power   channel names (SeriesService.CHANNELS)
+    &points=800                        target points per channel (chart width)
+    &start=300&end=900                 time window in seconds (zoom)
+    &method=minmax|lttb
+    &all=1                             include rows excluded from the report
+    &format=json|f32
+
+JSON response:
+    {"measurement_id", "start", "end", "method", "total", "returned",
+     "downsampled", "resolution", "time_sec": [...], "channels": {"hr": [...], ...}}
+
+Missing values are null. "resolution" is the pyramid bucket in seconds
+the window was read from (null = raw rows, see SeriesService).
+
+Binary response (format=f32, application/octet-stream), little-endian:
+    uint32      header length H
+    H bytes     UTF-8 JSON header: the JSON response without the arrays,
+                plus "columns": ["time_sec", "hr", ...]; space-padded so
+                that the columns start at a multiple of 4
+    float32[n]  one block per column, in "columns" order (n = returned)
+
+Missing values are NaN. Columns are encoded straight from the NumPy
+arrays and streamed in blocks of BINARY_CHUNK_VALUES.
+
+Conditional: ETag / Last-Modified (core/views/caching.py).
+
+Async view: the window is read in the database pool and downsampled in
+the compute pool (core/views/offload.py).
+"""
+import json
+import math
+import struct
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from core.analysis.downsample import METHODS
+from core.models import Measurement
+from core.services.series_service import SeriesService, SeriesWindow
+from core.views.caching import conditional_on_measurements
+from core.views.offload import aiter_chunks, compute, database
+
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+# float32 values per streamed block (256 KB)
+BINARY_CHUNK_VALUES = 65536
+
+
+def _float_param(request: HttpRequest, name: str) -> Optional[float]:
+    """Optional float query parameter (ValueError if malformed or not finite)."""
+    value = request.GET.get(name, '')
+    if value == '':
+        return None
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number of seconds")
+    return number
+
+
+def _to_list(values: np.ndarray) -> list:
+    """Column to JSON list (NaN -> None)."""
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def _series_header(window: SeriesWindow) -> dict:
+    """Window metadata shared by both formats."""
+    return {
+        'measurement_id': window.measurement_id,
+        'start': window.start,
+        'end': window.end,
+        'method': window.method,
+        'total': window.total,
+        'returned': len(window.time_sec),
+        'downsampled': window.downsampled,
+        'resolution': window.resolution,
+    }
+
+
+def series_to_dict(window: SeriesWindow) -> dict:
+    """JSON payload of a SeriesWindow."""
+    return {
+        **_series_header(window),
+        'time_sec': window.time_sec.tolist(),
+        'channels': {name: _to_list(column) for name, column in window.channels.items()},
+    }
+
+
+def iter_series_binary(window: SeriesWindow, chunk_values: int = BINARY_CHUNK_VALUES) -> Iterator[bytes]:
+    """Binary payload of a SeriesWindow (see module docstring), block by block."""
+    header = _series_header(window)
+    header['columns'] = ['time_sec', *window.channels]
+    encoded = json.dumps(header).encode('utf-8')
+    encoded += b' ' * (-(4 + len(encoded)) % 4)
+    yield struct.pack('<I', len(encoded)) + encoded
+
+    for column in (window.time_sec, *window.channels.values()):
+        for start in range(0, len(column), chunk_values):
+            yield column[start:start + chunk_values].astype('<f4').tobytes()
+
+
+@require_GET
+@conditional_on_measurements(lambda request, measurement_id: [measurement_id])
+async def measurement_series(request: HttpRequest, measurement_id: int) -> HttpResponse:
+    """Channels of a measurement, downsampled to the requested width."""
+    channels = [c for c in request.GET.get('channels', '').split(',') if c]
+    output = request.GET.get('format', 'json')
+    method = request.GET.get('method', 'minmax')
+    if output not in ('json', 'f32'):
+        return JsonResponse({'error': f"Unknown format: {output}"}, status=400)
+    try:
+        start, end = _float_param(request, 'start'), _float_param(request, 'end')
+        points = int(request.GET['points']) if request.GET.get('points') else None
+        if method not in METHODS:
+            raise ValueError(f"Unknown downsampling method: {method}")
+        window = await database(
+            SeriesService.load,
+            measurement_id,
+            channels=channels or None,
+            start=start,
+            end=end,
+            include_excluded=request.GET.get('all') == '1',
+            points=points,
+            method=method,
+        )
+    except Measurement.DoesNotExist:
+        raise Http404(f"Measurement {measurement_id} not found")
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    window = await compute(SeriesService.reduce, window, points, method)
+    if output == 'f32':
+        return StreamingHttpResponse(aiter_chunks(iter_series_binary(window)), content_type=BINARY_CONTENT_TYPE)
+    return JsonResponse(await compute(series_to_dict, window))
+
+
+@require_GET
+def dashboard(request: HttpRequest) -> FileResponse:
+    """Serve dashboard.html (same origin as the API)."""
+    return FileResponse(open(Path(settings.BASE_DIR) / 'dashboard.html', 'rb'), content_type='text/html')
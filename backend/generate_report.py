@@ -6,20 +6,34 @@ Usage:
     python3 generate_report.py                    # Default report
     python3 generate_report.py --template detailed_report   # Detailed report
     python3 generate_report.py --list             # List available templates
+    python3 generate_report.py --pdf              # PDF instead of HTML
+    python3 generate_report.py --data a.json --data b.json --jobs 8 --pdf
+                                                  # Batch: one report per JSON payload
+    python3 generate_report.py --measurement-id 12                  # Report from the database
+    python3 generate_report.py -t detailed_report -m 12 --compare-with 7
+    python3 generate_report.py -m 12 -m 13 -m 14 --jobs 4 --pdf     # Batch from the database
+    python3 generate_report.py -m 12 -m 13 -m 14 --bundle team.pdf --jobs 4
+                                                  # One merged PDF with table of contents
+    python3 generate_report.py -m 12 --pdf --profile --profile-out report.prof
+                                                  # Timing breakdown + cProfile dump
 """
+import os
 import sys
+import json
+import time
 import argparse
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.reports import create_sample_report
-from core.reports.generator import ReportGenerator
+from core.reports import create_sample_report, timing
+from core.reports.charts import ChartSeries, LineChart, render_chart
+from core.reports.generator import BatchJob, ReportGenerator
 
 
 def create_detailed_report_data() -> dict:
     """Create sample data for detailed report format (variant 2)."""
-    return {
+    data = {
         'client': {
             'name': 'ИмяФамилия',
             'weight': 74,
@@ -95,6 +109,28 @@ def create_detailed_report_data() -> dict:
         ],
         'conclusion': 'На основании проведённого тестирования рекомендуется развивать мышечную выносливость через работу в зоне АнП.',
     }
+    data['chart_data'] = create_comparison_charts(data)
+    return data
+
+
+def create_comparison_charts(data: dict) -> dict:
+    """Render HR, Ve and VO2 comparison charts of two test dates."""
+    charts = {}
+    for name, rows, title in (
+        ('hr', data['hr_comparison'], 'ЧСС'),
+        ('ve', data['ve_comparison'], 'Лёгочная вентиляция'),
+        ('vo2', data['vo2_comparison'], 'Потребление кислорода'),
+    ):
+        powers = [row['power'] for row in rows]
+        charts[name] = render_chart(LineChart(
+            title=title,
+            x_label='Вт',
+            series=[
+                ChartSeries(data['test']['date_1'], powers, [row[f'{name}_1'] for row in rows]),
+                ChartSeries(data['test']['date_2'], powers, [row[f'{name}_2'] for row in rows]),
+            ]
+        ))
+    return charts
 
 
 def main():
@@ -102,6 +138,18 @@ def main():
     parser.add_argument('--template', '-t', default='default_report', help='Template name')
     parser.add_argument('--list', '-l', action='store_true', help='List available templates')
     parser.add_argument('--output', '-o', default=None, help='Output filename')
+    parser.add_argument('--pdf', action='store_true', help='Generate PDF (requires WeasyPrint)')
+    parser.add_argument('--data', '-d', action='append', default=[], help='JSON payload file (repeatable, batch mode)')
+    parser.add_argument('--output-dir', default=None, help='Output directory for batch mode')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes for batch mode')
+    parser.add_argument('--measurement-id', '-m', type=int, action='append', default=[],
+                        help='Build report from the database (repeatable, batch mode)')
+    parser.add_argument('--compare-with', type=int, default=None,
+                        help='Earlier measurement for detailed_report comparisons')
+    parser.add_argument('--bundle', default=None, help='Merge -m reports into one PDF with table of contents')
+    parser.add_argument('--title', default='Командный отчёт', help='Bundle title')
+    parser.add_argument('--profile', action='store_true', help='Print per-stage timing breakdown')
+    parser.add_argument('--profile-out', default=None, help='Dump cProfile stats to file (implies --profile)')
     args = parser.parse_args()
     
     generator = ReportGenerator()
@@ -112,12 +160,58 @@ def main():
             print(f"  - {tpl}")
         return
     
+    if not (args.profile or args.profile_out):
+        run(generator, args)
+        return
+    
+    profiler = None
+    if args.profile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+    
+    started = time.perf_counter()
+    with timing.collect() as timings:
+        if profiler:
+            profiler.enable()
+        try:
+            run(generator, args)
+        finally:
+            if profiler:
+                profiler.disable()
+    wall = time.perf_counter() - started
+    
+    print(f"\n⏱  Timing breakdown (wall {wall * 1000:.1f} ms):")
+    print(timings.format(wall))
+    if profiler:
+        profiler.dump_stats(args.profile_out)
+        print(f"\ncProfile stats: {args.profile_out} (view with: python -m pstats {args.profile_out})")
+
+
+def run(generator: ReportGenerator, args) -> None:
+    """Load payloads and render single report, batch or bundle."""
+    if args.bundle:
+        generate_bundle(generator, args)
+        return
+    
+    if args.measurement_id:
+        args.data = [load_measurement_data(mid, args) for mid in args.measurement_id]
+    else:
+        args.data = [load_payload_file(path) for path in args.data]
+    
+    if len(args.data) > 1 or (args.data and args.output_dir):
+        generate_batch(generator, args)
+        return
+    
     print("=" * 60)
     print(f"VO2max Report Generator — Template: {args.template}")
     print("=" * 60)
     
     # Select data based on template
-    if args.template == 'detailed_report':
+    if args.data:
+        data = args.data[0][1]
+        print(f"\nClient: {data['client']['name']}")
+        print(f"Sport: {data['test']['sport']}")
+    elif args.template == 'detailed_report':
         data = create_detailed_report_data()
         print(f"\nClient: {data['client']['name']}")
         print(f"Sport: {data['test']['sport']}")
@@ -130,18 +224,114 @@ def main():
         print(f"Sport: {data['test']['sport']}")
         print(f"Thresholds: {len(data['thresholds'])}")
     
-    # Generate HTML
-    output_file = args.output or f"{args.template}.html"
+    # Generate HTML or PDF
+    extension = 'pdf' if args.pdf else 'html'
+    default_name = args.data[0][0] if args.data else args.template
+    output_file = args.output or f"{default_name}.{extension}"
     output_path = Path(__file__).parent / output_file
     
-    generator.generate_html_file(
-        data=data,
-        template=args.template,
-        output_path=str(output_path)
-    )
+    if args.pdf:
+        generator.generate_pdf(data=data, template=args.template, output_path=str(output_path))
+    else:
+        generator.generate_html_file(
+            data=data,
+            template=args.template,
+            output_path=str(output_path)
+        )
     
     print(f"\n✅ Report generated: {output_path}")
-    print("   Open in browser to preview")
+    if not args.pdf:
+        print("   Open in browser to preview")
+
+
+def generate_bundle(generator: ReportGenerator, args) -> None:
+    """Merge reports of -m measurements into one PDF."""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+    from core.reports.bundle import build_bundle
+    
+    if not args.measurement_id:
+        sys.exit("--bundle requires at least one --measurement-id")
+    
+    print("=" * 60)
+    print(f"VO2max Report Generator — Bundle: {len(args.measurement_id)} athletes, {args.jobs} workers")
+    print("=" * 60)
+    
+    result = build_bundle(
+        args.measurement_id, args.bundle,
+        template=args.template, workers=args.jobs, title=args.title
+    )
+    for section in result.sections:
+        part = f"part {section.part}, " if len(result.parts) > 1 else ''
+        print(f"  {part}p.{section.start_page:<4} {section.title} — {section.subtitle} ({section.pages} pp.)")
+    for failure in result.failures:
+        print(f"  ❌ {failure.output_path}: {failure.error}")
+    if result.sections:
+        print(f"\n✅ Bundle: {', '.join(result.parts)} ({result.pages} pages, {result.seconds:.2f}s)")
+    if result.failures:
+        sys.exit(1)
+
+
+def load_measurement_data(measurement_id: int, args) -> tuple:
+    """(name, payload) of a stored measurement for the selected template."""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+    from core.services.report_service import ReportService
+    
+    if args.template == 'detailed_report':
+        data = ReportService.build_detailed_context(measurement_id, compare_with=args.compare_with)
+    else:
+        data = ReportService.build_report_data(
+            measurement_id, with_charts=ReportService.uses_charts(args.template)
+        ).to_dict()
+    return f"report_{measurement_id}", data
+
+
+def load_payload_file(path: str) -> tuple:
+    """(name, payload) of a JSON payload file."""
+    return Path(path).stem, json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def generate_batch(generator: ReportGenerator, args) -> None:
+    """Render one report per payload, in parallel."""
+    extension = 'pdf' if args.pdf else 'html'
+    output_dir = Path(args.output_dir) if args.output_dir else Path(__file__).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    jobs = [
+        BatchJob(
+            data=data,
+            output_path=str(output_dir / f"{name}.{extension}"),
+            template=args.template
+        )
+        for name, data in args.data
+    ]
+    
+    print("=" * 60)
+    print(f"VO2max Report Generator — Batch: {len(jobs)} documents, {args.jobs} workers")
+    print("=" * 60)
+    
+    started = time.perf_counter()
+    results = generator.generate_batch(jobs, workers=args.jobs, pdf=args.pdf)
+    elapsed = time.perf_counter() - started
+    
+    for result in results:
+        # Spans of worker processes count towards the caller's breakdown
+        # (in-process renders recorded theirs already)
+        if not result.in_process:
+            for name, seconds in result.timings.items():
+                timing.record(name, seconds)
+        if result.ok:
+            print(f"  ✅ {result.output_path} ({result.size // 1024} KB, {result.seconds:.2f}s)")
+        else:
+            print(f"  ❌ {result.output_path} ({result.seconds:.2f}s): {result.error}")
+    
+    failed = sum(1 for r in results if not r.ok)
+    print(f"\nDone: {len(results) - failed} ok, {failed} failed in {elapsed:.2f}s")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Standalone test script for VO2max Report analysis algorithms.
+
+Tests the pure computational modules (core/analysis) without Django/database.
+Run from backend directory: python test_analysis.py
+"""
+import random
+import sys
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.analysis import TDigest
+from core.analysis.derived import column_to_list, fill_derived_channels, items_to_columns
+from core.analysis.artifacts import detect_artifacts
+from core.analysis.downsample import downsample_indices
+from core.analysis.lactate import evaluate_curve, fit_lactate_curves
+from core.analysis.names import TrigramIndex, search_key, similarity
+
+
+def test_tdigest():
+    """Test t-digest accuracy, merging and serialization."""
+    print("=" * 60)
+    print("TDigest Test (population norms)")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    values = [rng.gauss(50, 8) for _ in range(20000)]
+    exact = sorted(values)
+
+    digest = TDigest()
+    digest.update(values)
+    print(f"Values: {len(values)}, centroids: {len(digest)}")
+
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        estimate = digest.quantile(q)
+        actual = exact[int(q * len(exact))]
+        print(f"  q={q:<5} estimate={estimate:7.2f} exact={actual:7.2f}")
+        assert abs(estimate - actual) < 0.5
+
+    # Merge of halves equals digest of whole
+    left, right = TDigest(), TDigest()
+    left.update(values[:10000])
+    right.update(values[10000:])
+    merged = TDigest.merged([left, right])
+    assert merged.count == len(values)
+    assert abs(merged.quantile(0.5) - digest.quantile(0.5)) < 0.2
+
+    # Round trip through JSON-compatible dict
+    restored = TDigest.from_dict(digest.to_dict())
+    assert abs(restored.cdf(60) - digest.cdf(60)) < 1e-6
+    print(f"  cdf(60) = {restored.cdf(60):.3f}")
+
+    # Empty digest
+    assert TDigest().cdf(10) is None
+
+
+def test_derived_channels():
+    """Test vectorized derived channel filling."""
+    print()
+    print("=" * 60)
+    print("Derived Channels Test (import stage)")
+    print("=" * 60)
+
+    class Row:
+        def __init__(self, **kwargs):
+            self.__dict__.update(kwargs)
+
+    # JSON-like rows: absolute VO2, VCO2, HR, Ve; no VO2/kg
+    rows = [
+        Row(vo2_ml_min=2000.0, vco2_ml_min=1800.0, hr=140, ve=50.0),
+        Row(vo2_ml_min=3000.0, vco2_ml_min=3300.0, hr=None, ve=90.0),
+        Row(vo2_ml_min=None, vco2_ml_min=None, hr=150, ve=None),
+    ]
+    fields = ['vo2_ml_min', 'vo2_ml_kg_min', 'vco2_ml_min', 'hr', 've', 'r']
+    columns = items_to_columns(rows, fields)
+    filled = fill_derived_channels(columns, weight=50.0)
+    print(f"Filled: {sorted(filled)}")
+
+    assert {'vo2_ml_kg_min', 'r', 've_vo2', 've_vco2', 'o2_pulse'} <= filled
+    assert column_to_list(columns['vo2_ml_kg_min']) == [40.0, 60.0, None]
+    assert column_to_list(columns['r']) == [0.9, 1.1, None]
+    assert column_to_list(columns['ve_vo2']) == [25.0, 30.0, None]
+    assert column_to_list(columns['o2_pulse'])[:2] == [2000.0 / 140, None]
+    assert column_to_list(columns['hr'], as_int=True) == [140, None, 150]
+
+    # Measured values are never overwritten
+    columns = items_to_columns([Row(vo2_ml_min=2000.0, vo2_ml_kg_min=41.0)], fields)
+    fill_derived_channels(columns, weight=50.0)
+    assert columns['vo2_ml_kg_min'][0] == 41.0
+
+
+def test_lactate_fitting():
+    """Test batched lactate curve fitting and markers."""
+    print()
+    print("=" * 60)
+    print("Lactate Curve Fitting Test")
+    print("=" * 60)
+
+    # Sample from detailed report (2 ноября) and a too-short curve
+    powers = [140, 160, 180, 200, 220, 240, 260, 280]
+    lactates = [1.2, 1.5, 1.5, 2.3, 3.6, 4.6, 7.1, 9.6]
+    fits = fit_lactate_curves([(powers, lactates), ([100, 200], [1.0, 2.0])])
+
+    fit = fits[0]
+    print(f"R2={fit.r2}, 2 mmol={fit.fixed_powers[2.0]}W, "
+          f"4 mmol={fit.fixed_powers[4.0]}W, Dmax={fit.dmax_power}W")
+    assert fit.is_valid and fit.r2 > 0.98
+    assert 180 < fit.fixed_powers[2.0] < 200
+    assert 220 < fit.fixed_powers[4.0] < 240
+    assert fit.fixed_powers[2.0] < fit.dmax_power < fit.power_max
+    assert not fits[1].is_valid
+
+    # Fitted curve passes close to measured points, None outside range
+    values = evaluate_curve(fit, [200, 300])
+    assert abs(values[0] - 2.3) < 0.3 and values[1] is None
+
+    # No Dmax for a concave (saturating) or falling curve
+    concave = [4.0, 6.0, 7.4, 8.3, 8.8, 9.1]
+    others = fit_lactate_curves([
+        (powers[:6], concave),
+        (powers[:6], concave[::-1]),
+    ])
+    assert others[0].is_valid and others[0].dmax_power is None
+    assert others[1].is_valid and others[1].dmax_power is None
+
+
+def test_artifact_detection():
+    """Test vectorized artifact detection."""
+    print()
+    print("=" * 60)
+    print("Artifact Detection Test")
+    print("=" * 60)
+
+    import numpy as np
+
+    # Smooth ramp test with a cough (Ve spike), HR dropout and a gap
+    time_sec = np.arange(0, 300, 5, dtype=np.float64)
+    hr = np.linspace(100, 180, len(time_sec))
+    ve = np.linspace(20, 120, len(time_sec))
+    hr[20] = 0.0
+    ve[40] = 260.0
+    ve[50] = np.nan
+
+    result = detect_artifacts(time_sec, {'hr': hr, 've': ve})
+    flagged = np.flatnonzero(result.mask).tolist()
+    print(f"Flagged rows: {flagged}")
+    for index in flagged:
+        print(f"  t={time_sec[index]:.0f}s: {result.reasons[index]}")
+
+    assert flagged == [20, 40]
+    assert 'hr:range' in result.reasons[20]
+    assert 've:spike' in result.reasons[40]
+    assert result.reasons[0] == '' and result.count == 2
+
+    # A real step (sustained) is not an artifact
+    step = np.where(time_sec < 150, 100.0, 130.0)
+    assert detect_artifacts(time_sec, {'hr': step}).count == 0
+
+
+def test_downsampling():
+    """Test shape-preserving downsampling."""
+    print()
+    print("=" * 60)
+    print("Downsampling Test (charts)")
+    print("=" * 60)
+
+    import numpy as np
+
+    # One hour breath-by-breath HR with a single spike and a gap
+    x = np.arange(3600, dtype=np.float64)
+    y = 100 + x / 40 + np.sin(x / 60) * 5
+    y[1800] = 220.0
+    y[100:110] = np.nan
+
+    for method in ('lttb', 'minmax'):
+        index = downsample_indices(x, y, 300, method)
+        print(f"  {method}: {len(x)} -> {len(index)} points")
+        assert len(index) <= 302
+        assert index[0] == 0 and index[-1] == len(x) - 1
+        assert 1800 in index                        # spike survives
+        assert np.all(np.diff(index) > 0)
+        assert not np.isnan(y[index]).any()
+
+    # Short series are returned as is
+    assert len(downsample_indices(x[:50], y[:50], 300)) == 50
+
+    # Degenerate targets keep the end points
+    for target in (0, 1):
+        assert list(downsample_indices(x, y, target, 'lttb')) == [0, len(x) - 1]
+
+
+def test_name_search():
+    """Test name keys and the in-memory trigram index."""
+    print()
+    print("=" * 60)
+    print("Name Search Test (clients)")
+    print("=" * 60)
+
+    assert search_key('Фёдоров', 'Пётр') == 'fedorov petr'
+    assert search_key('  Petrov-Vodkin ', 'IVAN') == 'petrov vodkin ivan'
+    assert similarity(search_key('Иван Петров'), search_key('Petrov Ivan')) == 1.0
+
+    index = TrigramIndex()
+    names = {1: ('Фёдоров', 'Пётр'), 2: ('Федотов', 'Павел'), 3: ('Smith', 'John'), 4: ('Петров', 'Иван')}
+    for key_id, parts in names.items():
+        index.add(key_id, search_key(*parts))
+
+    for query, expected in (('петр федоров', 1), ('fedoro', 1), ('Федрова', 1), ('ivan petrov', 4)):
+        found = index.search(search_key(query), limit=3)
+        print(f"  {query!r}: {found}")
+        assert found and found[0][0] == expected
+
+    index.remove(1)
+    index.add(3, search_key('Фёдорова', 'Анна'))
+    assert index.search(search_key('федорова'))[0][0] == 3
+    assert index.search(search_key('smith')) == []
+    assert len(index) == 3
+
+
+if __name__ == "__main__":
+    print()
+    print("🧪 VO2max Report Analysis Test Suite")
+    print("=" * 60)
+
+    test_tdigest()
+    test_derived_channels()
+    test_lactate_fitting()
+    test_artifact_detection()
+    test_downsampling()
+    test_name_search()
+
+    print()
+    print("=" * 60)
+    print("✅ All tests completed successfully!")
+    print("=" * 60)
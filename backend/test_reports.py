@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Standalone test script for VO2max Report regeneration bookkeeping.
+
+Runs the services against a throwaway SQLite database (no PostgreSQL needed).
+Run from backend directory: python test_reports.py
+"""
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+WORK_DIR = Path(tempfile.mkdtemp(prefix='vo2max_test_reports_'))
+
+import django
+from django.conf import settings
+
+settings.DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(WORK_DIR / 'db.sqlite3')}}
+settings.GENERATED_REPORTS_DIR = WORK_DIR / 'generated_reports'
+django.setup()
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+
+call_command('migrate', run_syncdb=True, verbosity=0)
+
+from core.models import Client, GeneratedReport, Measurement, MeasurementItem, Threshold
+from core.services.generated_report_service import GeneratedReportService
+from core.services.report_service import ReportService
+
+
+def create_measurement() -> Measurement:
+    """Stepped test with aerobic / anaerobic thresholds."""
+    client = Client.objects.create(name='Иван', last_name='Петров', gender='M', birthdate=date(1990, 5, 1), weight=70)
+    measurement = Measurement.objects.create(
+        client=client, measurement_date=datetime(2024, 11, 2, 9, 0, tzinfo=timezone.utc),
+        test_type='CYCLING', start_power=100, power_step=20
+    )
+    MeasurementItem.objects.bulk_create([
+        MeasurementItem(
+            measurement=measurement, time_sec=i * 20.0, power=100 + 20 * (i // 6), rated_power=100 + 20 * (i // 6),
+            hr=100 + i, vo2_ml_min=1000 + 30 * i, ve=30 + i
+        )
+        for i in range(60)
+    ])
+    for threshold_type, power in (('AET', 180), ('ANT', 240)):
+        Threshold.objects.create(measurement=measurement, threshold_type=threshold_type, power=power, hr=150)
+    return measurement
+
+
+def test_edit_during_regeneration():
+    """An edit made while a dirty report is rebuilt keeps it dirty."""
+    print()
+    print("=" * 60)
+    print("Edit During Regeneration Test")
+    print("=" * 60)
+
+    measurement = create_measurement()
+    report = GeneratedReportService.generate(measurement.id, pdf=False)
+    assert not report.is_dirty
+
+    threshold = Threshold.objects.get(measurement=measurement, threshold_type='ANT')
+    threshold.set_manual(250)
+    report.refresh_from_db()
+    assert report.is_dirty
+
+    # Another edit lands while the (already dirty) report is being built
+    build = ReportService.build
+
+    def build_with_edit(*args, **kwargs):
+        data = build(*args, **kwargs)
+        threshold.set_manual(255)
+        return data
+
+    with mock.patch.object(ReportService, 'build', side_effect=build_with_edit):
+        summaries = GeneratedReportService.regenerate_dirty()
+    report.refresh_from_db()
+    print(f"  after edit during rebuild: ok={summaries[0]['ok']}, dirty={report.is_dirty}")
+    assert summaries[0]['ok'] and report.is_dirty
+
+    GeneratedReportService.regenerate_dirty()
+    report.refresh_from_db()
+    print(f"  after next rebuild: dirty={report.is_dirty}")
+    assert not report.is_dirty
+    assert GeneratedReport.objects.filter(is_dirty=True).count() == 0
+
+
+def test_dependencies():
+    """Reports are flagged only by the inputs their template reads."""
+    print()
+    print("=" * 60)
+    print("Report Dependencies Test")
+    print("=" * 60)
+
+    measurement = create_measurement()
+    default = GeneratedReportService.generate(measurement.id, pdf=False)
+    detailed = GeneratedReportService.generate(measurement.id, template='detailed_report', pdf=False)
+    assert not default.uses_items and detailed.uses_items
+
+    # Item edit below the peaks: only the report reading items is stale
+    item = MeasurementItem.objects.filter(measurement=measurement).order_by('time_sec').first()
+    item.ve = 31
+    item.save()
+    default.refresh_from_db()
+    detailed.refresh_from_db()
+    print(f"  item edit: default dirty={default.is_dirty}, detailed dirty={detailed.is_dirty}")
+    assert not default.is_dirty and detailed.is_dirty
+
+    # A new peak reaches the norms of every report
+    item.hr = 230
+    item.save()
+    default.refresh_from_db()
+    print(f"  peak edit: default dirty={default.is_dirty}")
+    assert default.is_dirty
+    GeneratedReportService.regenerate_dirty()
+
+    # Lactate at a threshold feeds the detailed report's lactate fits
+    threshold = Threshold.objects.get(measurement=measurement, threshold_type='AET')
+    threshold.lactate = 2.1
+    threshold.save()
+    detailed.refresh_from_db()
+    print(f"  threshold lactate edit: detailed dirty={detailed.is_dirty}")
+    assert detailed.is_dirty
+
+    # One report per (measurement, template, format) also without a comparison
+    try:
+        with transaction.atomic():
+            GeneratedReport.objects.create(measurement=measurement, template='default_report', pdf=False)
+        duplicated = True
+    except IntegrityError:
+        duplicated = False
+    print(f"  duplicate single report rejected: {not duplicated}")
+    assert not duplicated
+
+
+if __name__ == "__main__":
+    print()
+    print("🧪 VO2max Report Regeneration Test Suite")
+    print("=" * 60)
+
+    test_edit_during_regeneration()
+    test_dependencies()
+
+    print()
+    print("=" * 60)
+    print("✅ All tests completed successfully!")
+    print("=" * 60)